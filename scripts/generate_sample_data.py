@@ -11,9 +11,11 @@ Output: data/raw/MachineLearningRating_sample.txt
 
 import sys
 from pathlib import Path
+from typing import Dict, List, Optional
 
 import numpy as np
-import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 
 # Project root
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -21,11 +23,45 @@ OUTPUT_DIR = PROJECT_ROOT / "data" / "raw"
 OUTPUT_FILE = OUTPUT_DIR / "MachineLearningRating_sample.txt"
 SEED = 42
 N_ROWS = 12_000  # Enough for train/test and severity subset (TotalClaims > 0)
+SEP = "|"
+
+
+def write_delimited(
+    columns: Dict[str, np.ndarray],
+    path: Path,
+    categories: Optional[Dict[str, List[str]]] = None,
+) -> None:
+    """Write column arrays as a pipe-delimited file with an unquoted header.
+
+    Columns go straight from NumPy to disk through the multithreaded Arrow
+    CSV writer, without building a DataFrame. Columns listed in *categories*
+    hold integer codes and are only turned into strings here.
+    """
+    categories = categories or {}
+    header = SEP.join(columns)
+    table = pa.Table.from_pydict(
+        {
+            name: (
+                pa.DictionaryArray.from_arrays(values, categories[name])
+                if name in categories
+                else values
+            )
+            for name, values in columns.items()
+        }
+    )
+    with open(path, "wb") as fh:
+        fh.write((header + "\n").encode("utf-8"))
+        pacsv.write_csv(
+            table,
+            fh,
+            write_options=pacsv.WriteOptions(
+                include_header=False, delimiter=SEP, quoting_style="none"
+            ),
+        )
 
 
 def main() -> None:
-    np.random.seed(SEED)
-    rng = np.random.default_rng(SEED)
+    rng = np.random.default_rng(SEED)  # PCG64 Generator
 
     provinces = ["Gauteng", "WesternCape", "KwaZuluNatal", "EasternCape", "Limpopo"]
     postal_codes = [2001, 2002, 2003, 7001, 7002, 4001, 4002, 5001, 5002, 6001]
@@ -33,32 +69,41 @@ def main() -> None:
     vehicle_types = ["Sedan", "Hatchback", "SUV", "Truck"]
 
     n = N_ROWS
-    df = pd.DataFrame(
-        {
-            "PolicyID": np.arange(1, n + 1),
-            "Province": rng.choice(provinces, size=n),
-            "PostalCode": rng.choice(postal_codes, size=n),
-            "Gender": rng.choice(genders, size=n),
-            "Age": np.clip(rng.integers(18, 70, size=n), 18, 69),
-            "TotalPremium": np.round(
-                np.clip(600 + rng.lognormal(0, 0.6, size=n) * 400, 400, 3500), 2
-            ),
-            "TotalClaims": np.round(
-                np.where(
-                    rng.random(size=n) < 0.35,  # ~35% with claims
-                    np.clip(rng.lognormal(5, 1.2, size=n) * 20, 10, 2500),
-                    0.0,
-                ),
-                2,
-            ),
-            "VehicleType": rng.choice(vehicle_types, size=n),
-        }
-    )
+
+    # One uniform draw per row drives every categorical/integer column and the
+    # claim indicator; one normal draw per row drives both lognormal amounts.
+    u = rng.random((6, n), dtype=np.float32)
+    z = rng.standard_normal((2, n), dtype=np.float32)
+
+    # ~35% of policies have a claim; only those rows get a claim amount
+    has_claim = u[0] < 0.35
+    total_claims = np.zeros(n)
+    total_claims[has_claim] = np.clip(np.exp(5 + 1.2 * z[0, has_claim]) * 20, 10, 2500)
+    total_premium = np.clip(600 + np.exp(0.6 * z[1]) * 400, 400, 3500)
+
+    columns = {
+        "PolicyID": np.arange(1, n + 1),
+        "Province": (u[1] * len(provinces)).astype(np.int8),
+        "PostalCode": np.asarray(postal_codes, dtype=np.int32)[
+            (u[2] * len(postal_codes)).astype(np.int8)
+        ],
+        "Gender": (u[3] < 0.5).astype(np.int8),
+        "Age": (18 + u[4] * 52).astype(np.int16),
+        "TotalPremium": np.round(total_premium.astype(np.float64), 2),
+        "TotalClaims": np.round(total_claims, 2),
+        "VehicleType": (u[5] * len(vehicle_types)).astype(np.int8),
+    }
+    # String columns are stored as int8 codes into these category lists
+    categories = {
+        "Province": provinces,
+        "Gender": genders,
+        "VehicleType": vehicle_types,
+    }
 
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    df.to_csv(OUTPUT_FILE, sep="|", index=False)
-    print(f"Wrote {OUTPUT_FILE} ({len(df)} rows, {len(df.columns)} columns)")
-    n_with_claims = (df["TotalClaims"] > 0).sum()
+    write_delimited(columns, OUTPUT_FILE, categories=categories)
+    print(f"Wrote {OUTPUT_FILE} ({n} rows, {len(columns)} columns)")
+    n_with_claims = int(np.count_nonzero(columns["TotalClaims"] > 0))
     print(f"  Rows with claims (for severity): {n_with_claims}")
     return None
 
@@ -16,6 +16,8 @@ The pipeline writes ``results/decision_summary.json`` upon completion.
 import sys
 from pathlib import Path
 
+import pandas as pd
+
 # Ensure project root is on sys.path so ``src`` is importable.
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
@@ -23,7 +25,11 @@ sys.path.insert(0, str(PROJECT_ROOT))
 from loguru import logger
 
 from src.data.loaders import load_insurance_data
-from src.data.preprocessing import run_preprocessing_pipeline
+from src.data.preprocessing import (
+    prepare_features_target,
+    preprocess_features,
+    split_data,
+)
 from src.decision.justification import (
     build_decision_summary,
     save_decision_summary,
@@ -35,12 +41,54 @@ from src.models.trainer import train_classification_models, train_regression_mod
 # Constants
 # ---------------------------------------------------------------------------
 DATA_FILE = "data/raw/MachineLearningRating_v3.txt"
+CACHE_DIR = "data/cache"
+CACHE_STEM = "mlr_v3"
 RESULTS_DIR = "results"
 REGRESSION_TARGET = "TotalPremium"
 REGRESSION_METRIC = "r2"
 CLASSIFICATION_METRIC = "f1"
 
 
+def load_cached_insurance_data(data_path: Path, cache_dir: Path) -> pd.DataFrame:
+    """Load the raw dataset through a Parquet sidecar cache.
+
+    The sidecar name embeds the raw file's size and modification time, so a
+    changed raw file is re-parsed and re-cached automatically.
+
+    Args:
+        data_path: Path to the raw pipe-delimited file.
+        cache_dir: Directory holding the Parquet sidecars.
+
+    Returns:
+        Loaded DataFrame.
+
+    Raises:
+        FileNotFoundError: If *data_path* does not exist on disk.
+    """
+    if not data_path.exists():
+        raise FileNotFoundError(f"Data file not found: {data_path}")
+
+    stat = data_path.stat()
+    cache_file = cache_dir / f"{CACHE_STEM}_{stat.st_size}_{stat.st_mtime_ns}.parquet"
+    if cache_file.exists():
+        logger.info(f"Loading cached dataset from {cache_file}")
+        return pd.read_parquet(cache_file, engine="pyarrow")
+
+    df = load_insurance_data(file_path=data_path)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        for stale in cache_dir.glob(f"{CACHE_STEM}_*.parquet"):
+            stale.unlink()
+        df.to_parquet(cache_file, engine="pyarrow", compression="zstd")
+        logger.info(f"Cached dataset to {cache_file}")
+    except (ImportError, ValueError, TypeError, OSError) as exc:
+        # Mixed-type object columns cannot always be written; fall back to
+        # re-parsing the raw file next time.
+        cache_file.unlink(missing_ok=True)
+        logger.warning(f"Could not cache dataset as Parquet: {exc}")
+    return df
+
+
 def main() -> None:
     """Run the full pipeline."""
     logger.info("Pipeline execution started")
@@ -52,16 +100,19 @@ def main() -> None:
     # 1. Load production data (DVC-tracked)
     # ------------------------------------------------------------------
     data_path = PROJECT_ROOT / DATA_FILE
-    df = load_insurance_data(file_path=data_path)
+    df = load_cached_insurance_data(data_path, PROJECT_ROOT / CACHE_DIR)
     print(f"[DATA] Loaded {len(df)} rows, {len(df.columns)} columns")
 
+    # Cleaning, feature engineering and encoding do not depend on the target,
+    # so run them once and share the result between both tasks.
+    features = preprocess_features(df)
+
     # ------------------------------------------------------------------
     # 2. Regression task — predict TotalPremium
     # ------------------------------------------------------------------
     print("\n--- Regression: predict TotalPremium ---")
-    X_train, X_test, y_train, y_test = run_preprocessing_pipeline(
-        df, target_col=REGRESSION_TARGET
-    )
+    X, y = prepare_features_target(features, target_col=REGRESSION_TARGET)
+    X_train, X_test, y_train, y_test = split_data(X, y)
     reg_results = train_regression_models(X_train, y_train, X_test, y_test)
     best_reg = select_best_model(reg_results, metric=REGRESSION_METRIC)
     reg_ranking = get_model_ranking(reg_results, metric=REGRESSION_METRIC)
@@ -74,9 +125,10 @@ def main() -> None:
     # 3. Classification task — predict HasClaim (binary)
     # ------------------------------------------------------------------
     print("\n--- Classification: predict HasClaim ---")
-    X_tr_c, X_te_c, y_tr_c, y_te_c = run_preprocessing_pipeline(
-        df, target_col="TotalClaims", filter_positive=False
+    X, y = prepare_features_target(
+        features, target_col="TotalClaims", filter_positive=False
     )
+    X_tr_c, X_te_c, y_tr_c, y_te_c = split_data(X, y)
     # Binarise target for classification
     y_tr_c = (y_tr_c > 0).astype(int)
     y_te_c = (y_te_c > 0).astype(int)
@@ -0,0 +1,244 @@
+"""Fused reduction kernels for Task 3 metrics.
+
+Each kernel walks the claim and premium columns once. When Numba is
+installed the loops are JIT-compiled; otherwise equivalent NumPy code is
+used.
+
+The kernels are single-threaded on purpose. ``run_all_tests`` can fork
+worker processes (opt-in through ``parallel_tests``, which defaults to
+False and is forced off on the GPU), and Numba's threading layer is not
+fork-safe once it has started. Signatures are compiled (or loaded from
+cache) eagerly at import, so forked workers inherit machine code instead
+of each compiling it.
+The compiled kernels release the GIL, so callers may still run them for
+different groups from a thread pool.
+"""
+
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    # Only reassociation/contraction are relaxed so reductions vectorise;
+    # NaN semantics stay identical to the NumPy fallbacks.
+    @njit(
+        [
+            "UniTuple(float64, 2)(float32[::1], float32[::1])",
+            "UniTuple(float64, 2)(float64[::1], float64[::1])",
+        ],
+        fastmath={"reassoc", "contract"},
+        nogil=True,
+        cache=True,
+    )
+    def _fused_sums(total_claims, total_premium):
+        """Sum claims and premiums in a single pass (float64 accumulators)."""
+        claim_sum = 0.0
+        premium_sum = 0.0
+        for i in range(total_claims.size):
+            # Missing amounts are skipped, as in ``Series.sum()``
+            claim = total_claims[i]
+            if claim == claim:
+                claim_sum += claim
+            premium = total_premium[i]
+            if premium == premium:
+                premium_sum += premium
+        return claim_sum, premium_sum
+
+    @njit(
+        [
+            "Tuple((float64[::1], float64[::1], int64[::1], int64[::1]))"
+            "(int64[::1], float32[::1], float32[::1], int64)",
+            "Tuple((float64[::1], float64[::1], int64[::1], int64[::1]))"
+            "(int64[::1], float64[::1], float64[::1], int64)",
+        ],
+        fastmath={"reassoc", "contract"},
+        nogil=True,
+        cache=True,
+    )
+    def _group_totals(codes, total_claims, total_premium, n_groups):
+        """Per-group claim/premium sums, policy counts and claim counts."""
+        claim_sums = np.zeros(n_groups)
+        premium_sums = np.zeros(n_groups)
+        n_policies = np.zeros(n_groups, np.int64)
+        n_claims = np.zeros(n_groups, np.int64)
+        for i in range(codes.size):
+            g = codes[i]
+            if g < 0:
+                continue
+            n_policies[g] += 1
+            claim = total_claims[i]
+            # Missing amounts count as zero, as in ``groupby().sum()``
+            if claim == claim:
+                claim_sums[g] += claim
+                if claim > 0:
+                    n_claims[g] += 1
+            premium = total_premium[i]
+            if premium == premium:
+                premium_sums[g] += premium
+        return claim_sums, premium_sums, n_policies, n_claims
+
+    @njit(
+        ["UniTuple(float64, 2)(float64[::1], float64[::1])"],
+        nogil=True,
+        cache=True,
+    )
+    def _mannwhitney_asymptotic(sample_a, sample_b):
+        """Two-sided Mann-Whitney U1 and tie-corrected normal p-value."""
+        n_a = sample_a.size
+        n_b = sample_b.size
+        n = n_a + n_b
+        combined = np.concatenate((sample_a, sample_b))
+        order = np.argsort(combined, kind="mergesort")
+
+        # Walk runs of tied values, assigning each its mid-rank
+        rank_sum_a = 0.0
+        tie_term = 0.0
+        start = 0
+        while start < n:
+            value = combined[order[start]]
+            end = start + 1
+            while end < n and combined[order[end]] == value:
+                end += 1
+            ties = end - start
+            mid_rank = 0.5 * (start + 1 + end)
+            for k in range(start, end):
+                if order[k] < n_a:
+                    rank_sum_a += mid_rank
+            tie_term += float(ties) ** 3 - ties
+            start = end
+
+        u1 = rank_sum_a - n_a * (n_a + 1) / 2.0
+        u = max(u1, float(n_a) * n_b - u1)
+        sigma = math.sqrt(
+            n_a * n_b / 12.0 * ((n + 1) - tie_term / (float(n) * (n - 1)))
+        )
+        if sigma == 0.0:
+            return u1, np.nan
+        # Continuity-corrected z; two-sided p = 2 * sf(z)
+        z = (u - n_a * n_b / 2.0 - 0.5) / sigma
+        return u1, min(math.erfc(z / math.sqrt(2.0)), 1.0)
+
+else:
+
+    def _fused_sums(total_claims, total_premium):
+        """NumPy fallback for the fused claim/premium reduction."""
+        return (
+            np.nansum(total_claims, dtype=np.float64),
+            np.nansum(total_premium, dtype=np.float64),
+        )
+
+    def _group_totals(codes, total_claims, total_premium, n_groups):
+        """NumPy fallback for the per-group totals (one bincount per total)."""
+        valid = codes >= 0
+        if not valid.all():
+            codes = codes[valid]
+            total_claims = total_claims[valid]
+            total_premium = total_premium[valid]
+        total_claims = np.nan_to_num(total_claims.astype(np.float64))
+        total_premium = np.nan_to_num(total_premium.astype(np.float64))
+        return (
+            np.bincount(codes, weights=total_claims, minlength=n_groups),
+            np.bincount(codes, weights=total_premium, minlength=n_groups),
+            np.bincount(codes, minlength=n_groups),
+            np.bincount(codes[total_claims > 0], minlength=n_groups),
+        )
+
+    _mannwhitney_asymptotic = None
+
+
+def _as_float_arrays(
+    total_claims: np.ndarray, total_premium: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Coerce both columns to one contiguous float32/float64 dtype."""
+    dtype = np.result_type(total_claims, total_premium)
+    if dtype not in (np.float32, np.float64):
+        dtype = np.dtype(np.float64)
+    return (
+        np.ascontiguousarray(total_claims, dtype=dtype),
+        np.ascontiguousarray(total_premium, dtype=dtype),
+    )
+
+
+def fused_sums(
+    total_claims: np.ndarray, total_premium: np.ndarray
+) -> Tuple[float, float]:
+    """
+    Sum the claim and premium columns of one group in a single pass.
+
+    Missing amounts are skipped, as in ``Series.sum()``.
+
+    Args:
+        total_claims: TotalClaims values
+        total_premium: TotalPremium values
+
+    Returns:
+        Tuple of (claim sum, premium sum)
+    """
+    claims, premium = _as_float_arrays(total_claims, total_premium)
+    claim_sum, premium_sum = _fused_sums(claims, premium)
+    return float(claim_sum), float(premium_sum)
+
+
+def group_totals(
+    codes: np.ndarray,
+    total_claims: np.ndarray,
+    total_premium: np.ndarray,
+    n_groups: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per-group claim/premium sums and policy/claim counts in a single pass.
+
+    Rows with a negative code have no group and are skipped; missing amounts
+    count as zero.
+
+    Args:
+        codes: Group code per row, e.g. from ``pd.factorize``
+        total_claims: TotalClaims values
+        total_premium: TotalPremium values
+        n_groups: Number of groups
+
+    Returns:
+        Tuple of (claim sums, premium sums, policy counts, claim counts)
+    """
+    claims, premium = _as_float_arrays(total_claims, total_premium)
+    return _group_totals(
+        np.ascontiguousarray(codes, dtype=np.int64), claims, premium, int(n_groups)
+    )
+
+
+def mannwhitney_asymptotic(
+    sample_a: np.ndarray, sample_b: np.ndarray
+) -> Optional[Tuple[float, float]]:
+    """
+    Two-sided Mann-Whitney U test with the tie-corrected normal approximation.
+
+    Matches ``scipy.stats.mannwhitneyu(..., method="asymptotic")`` (with the
+    continuity correction) without SciPy's per-call dispatch overhead.
+
+    Args:
+        sample_a: Group A values without NaN
+        sample_b: Group B values without NaN
+
+    Returns:
+        Tuple of (U statistic of group A, p-value), or None if Numba is not
+        installed or every value is tied
+    """
+    if _mannwhitney_asymptotic is None:
+        return None
+    statistic, p_value = _mannwhitney_asymptotic(
+        np.ascontiguousarray(sample_a, dtype=np.float64),
+        np.ascontiguousarray(sample_b, dtype=np.float64),
+    )
+    if math.isnan(p_value):
+        return None
+    return statistic, p_value
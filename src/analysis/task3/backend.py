@@ -0,0 +1,93 @@
+"""Array backend selection for Task 3 metric reductions.
+
+Metric reductions run on the GPU through CuPy when it is enabled in the
+configuration, CuPy is installed and a CUDA device is visible; otherwise
+NumPy is used. Statistical tests always run on the host, so only the
+reduced values and the per-group severity arrays are transferred back.
+"""
+
+import os
+from types import ModuleType
+from typing import Any
+
+import numpy as np
+
+try:
+    import cupy
+
+    CUPY_AVAILABLE = True
+except ImportError:
+    CUPY_AVAILABLE = False
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def gpu_available() -> bool:
+    """
+    Check whether a CUDA device can be used through CuPy.
+
+    An unset ``CUDA_VISIBLE_DEVICES`` exposes every device, as it does for
+    the CUDA runtime; an empty value or ``-1`` hides them all.
+
+    Returns:
+        True if CuPy is installed, ``CUDA_VISIBLE_DEVICES`` does not hide the
+        devices and the CUDA runtime reports one
+    """
+    if not CUPY_AVAILABLE:
+        return False
+    visible = os.environ.get("CUDA_VISIBLE_DEVICES")
+    if visible is not None and visible.strip() in ("", "-1"):
+        return False
+    try:
+        return bool(cupy.cuda.is_available())
+    except Exception:
+        return False
+
+
+def get_array_module(use_gpu: bool = False) -> ModuleType:
+    """
+    Select the array module for metric reductions.
+
+    Args:
+        use_gpu: Whether GPU execution is requested
+
+    Returns:
+        ``cupy`` if requested and available, otherwise ``numpy``
+    """
+    if use_gpu and gpu_available():
+        return cupy
+    if use_gpu:
+        logger.warning("GPU requested but CuPy/CUDA unavailable; using NumPy")
+    return np
+
+
+def array_module(arr: Any) -> ModuleType:
+    """
+    Return the array module (``numpy`` or ``cupy``) that owns *arr*.
+
+    Args:
+        arr: NumPy or CuPy array
+
+    Returns:
+        Module providing the array's operations
+    """
+    if CUPY_AVAILABLE:
+        return cupy.get_array_module(arr)
+    return np
+
+
+def to_numpy(arr: Any) -> np.ndarray:
+    """
+    Copy a device array to the host (no-op for NumPy arrays).
+
+    Args:
+        arr: NumPy or CuPy array
+
+    Returns:
+        NumPy array
+    """
+    if CUPY_AVAILABLE and isinstance(arr, cupy.ndarray):
+        return cupy.asnumpy(arr)
+    return np.asarray(arr)
@@ -1,21 +1,69 @@
 """Main hypothesis testing script for Task 3."""
 
-import json
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Callable, Dict, Iterator, List, Tuple
 
 import numpy as np
+import orjson
 import pandas as pd
 
+from src.analysis.task3.backend import get_array_module
 from src.analysis.task3.metrics import MetricCalculator
 from src.analysis.task3.segmentation import DataSegmentation
 from src.analysis.task3.statistical_tests import StatisticalTester
-from src.data.loaders import DataLoader
+from src.data.fast_csv import read_pipe_mmap
+from src.data.loaders import INSURANCE_COLUMN_TYPES, DataLoader
 from src.utils.config import load_config
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Explicit column types for the Arrow reader: the shared loader types, with
+# the monetary columns kept at float64 so reported margins and severities
+# carry no float32 rounding noise
+TASK3_COLUMN_TYPES: Dict[str, Any] = {
+    **INSURANCE_COLUMN_TYPES,
+    "TotalPremium": np.float64,
+    "TotalClaims": np.float64,
+}
+
+# Maximum number of intermediate results (groups, metric series) kept in memory
+DEFAULT_CACHE_SIZE = 32
+
+# Hypothesis tests grouped into independent units of work. H2 and H3 share the
+# zip code groups, so they run together to keep the cache hit.
+HYPOTHESIS_BATCHES: List[Tuple[str, ...]] = [
+    ("test_province_risk_differences",),
+    ("test_zipcode_risk_differences", "test_zipcode_margin_differences"),
+    ("test_gender_risk_differences",),
+]
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Serialise the objects orjson does not handle natively."""
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return obj.to_dict()
+    if isinstance(obj, np.ndarray):
+        # Non-contiguous or unsupported-dtype arrays
+        return obj.tolist()
+    return str(obj)
+
+
+def _run_hypothesis_batch(
+    config_path: str, method_names: Tuple[str, ...], df: pd.DataFrame
+) -> List[Dict]:
+    """Run a batch of hypothesis tests in a worker process.
+
+    The runner holds a loguru logger bound to stderr, which cannot be pickled,
+    so each worker builds its own runner from the configuration file.
+    """
+    runner = HypothesisTestingRunner(config_path)
+    with runner._cache_scope():
+        return runner._run_batch(method_names, df)
+
 
 class HypothesisTestingRunner:
     """Run all hypothesis tests for Task 3."""
@@ -27,12 +75,26 @@ class HypothesisTestingRunner:
         Args:
             config_path: Path to configuration file
         """
+        self.config_path = config_path
         self.config = load_config(config_path)
         self.logger = logger
         self.metric_calculator = MetricCalculator()
         self.segmentation = DataSegmentation()
         self.tester = StatisticalTester()
 
+        # LRU cache for segmentation groups and per-group metrics shared
+        # between hypotheses (e.g. the zip code groups of H2 and H3); only
+        # active for the duration of one run (see ``_cache_scope``)
+        task3_config = self.config.get("analysis", {}).get("task3", {})
+        self._cache_size = task3_config.get("cache_size", DEFAULT_CACHE_SIZE)
+        self._cache: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._cache_enabled = False
+        self._parallel_tests = task3_config.get("parallel_tests", False)
+        self.xp = get_array_module(task3_config.get("use_gpu", False))
+        if self.xp is not np:
+            # CUDA contexts do not survive fork(); keep GPU runs in-process
+            self._parallel_tests = False
+
         # Setup paths
         data_path = Path(self.config["data"]["raw_path"])
         self.data_loader = DataLoader(data_path=data_path)
@@ -45,6 +107,139 @@ class HypothesisTestingRunner:
         self.reports_path.mkdir(parents=True, exist_ok=True)
         self.figures_path.mkdir(parents=True, exist_ok=True)
 
+    @contextmanager
+    def _cache_scope(self) -> Iterator[None]:
+        """
+        Enable the intermediate-result cache for one run of the tests.
+
+        Entries are keyed on object ids, so they are only valid while the
+        frame is not modified; the cache is emptied when the run ends, which
+        also releases the frames its entries keep alive.
+        """
+        self._cache.clear()
+        self._cache_enabled = True
+        try:
+            yield
+        finally:
+            self._cache_enabled = False
+            self._cache.clear()
+
+    def _cached(
+        self, key: Tuple, compute: Callable[[], Any], anchor: Any = None
+    ) -> Any:
+        """
+        Return a memoised intermediate result, computing it on a cache miss.
+
+        Outside ``_cache_scope`` nothing is stored and *compute* always runs.
+
+        Args:
+            key: Cache key
+            compute: Zero-argument callable producing the value
+            anchor: Object whose ``id()`` is part of *key*; kept alive with the
+                entry so the id cannot be reused while it is cached
+
+        Returns:
+            Cached or freshly computed value
+        """
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key][1]
+
+        value = compute()
+        if not self._cache_enabled:
+            return value
+        self._cache[key] = (anchor, value)
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return value
+
+    def _zipcode_groups(self, df: pd.DataFrame, min_samples: int = 500) -> Tuple:
+        """Create (or reuse) the zip code A/B group indices."""
+        return self._cached(
+            (id(df), "zipcode", min_samples),
+            lambda: self.segmentation.create_zipcode_groups(
+                df, min_samples=min_samples, return_indices=True
+            ),
+            anchor=df,
+        )
+
+    def _column_arrays(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """TotalClaims/TotalPremium as float64 arrays, converted once per frame."""
+        return self._cached(
+            (id(df), "columns"),
+            lambda: {
+                col: df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+                for col in ("TotalClaims", "TotalPremium")
+            },
+            anchor=df,
+        )
+
+    def _device_arrays(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Column arrays on the selected backend, uploaded once per frame."""
+        if self.xp is np:
+            return self._column_arrays(df)
+        columns = self._column_arrays(df)
+        return self._cached(
+            (id(df), "device_columns"),
+            lambda: {col: self.xp.asarray(arr) for col, arr in columns.items()},
+            anchor=df,
+        )
+
+    def _group_metrics(self, df: pd.DataFrame, idx: np.ndarray) -> Dict:
+        """Fused frequency/severity/totals for the rows *idx* of *df* (memoised)."""
+
+        def compute() -> Dict:
+            columns = self._device_arrays(df)
+            rows = idx if self.xp is np else self.xp.asarray(idx)
+            return self.metric_calculator.compute_all_from_arrays(
+                columns["TotalClaims"][rows], columns["TotalPremium"][rows]
+            )
+
+        return self._cached((id(idx), "metrics"), compute, anchor=idx)
+
+    def _test_claim_frequency(
+        self, df: pd.DataFrame, idx_a: np.ndarray, idx_b: np.ndarray
+    ) -> Dict:
+        """Chi-square test of claim frequency from per-group claim counts."""
+        metrics_a = self._group_metrics(df, idx_a)
+        metrics_b = self._group_metrics(df, idx_b)
+        return self.tester.test_proportion(
+            metrics_a["freq"].size,
+            metrics_a["severity"].size,
+            metrics_b["freq"].size,
+            metrics_b["severity"].size,
+        )
+
+    def _loss_ratio(self, df: pd.DataFrame, idx: np.ndarray) -> float:
+        """Portfolio loss ratio for a group, from the fused column totals."""
+        metrics = self._group_metrics(df, idx)
+        return metrics["claim_sum"] / max(metrics["premium_sum"], 1e-12)
+
+    def _add_loss_ratio_context(
+        self,
+        test_result: Dict,
+        df: pd.DataFrame,
+        idx_a: np.ndarray,
+        idx_b: np.ndarray,
+    ) -> None:
+        """
+        Attach group loss ratios and their relative difference to a test result.
+
+        Args:
+            test_result: Test result dictionary to update in place
+            df: DataFrame with insurance data
+            idx_a: Row indices of the first group
+            idx_b: Row indices of the second group
+        """
+        loss_ratio_a = self._loss_ratio(df, idx_a)
+        loss_ratio_b = self._loss_ratio(df, idx_b)
+        test_result["loss_ratio_a"] = loss_ratio_a
+        test_result["loss_ratio_b"] = loss_ratio_b
+        if loss_ratio_a > 0:
+            test_result["loss_ratio_diff_pct"] = (
+                (loss_ratio_b - loss_ratio_a) / loss_ratio_a
+            ) * 100
+
     def load_data(self) -> pd.DataFrame:
         """
         Load the insurance dataset.
@@ -53,9 +248,22 @@ class HypothesisTestingRunner:
             Loaded DataFrame
         """
         self.logger.info("Loading insurance dataset...")
-        df = self.data_loader.load_csv(
-            "MachineLearningRating_v3.txt", sep="|", low_memory=False
-        )
+        if self.config["data"].get("fast_loader", False):
+            # Parallel mmap reader for the full production file
+            df = read_pipe_mmap(
+                self.data_loader.data_path / "MachineLearningRating_v3.txt",
+                sep="|",
+                dtype=TASK3_COLUMN_TYPES,
+                dtype_backend="pyarrow",
+            )
+        else:
+            df = self.data_loader.load_csv(
+                "MachineLearningRating_v3.txt",
+                sep="|",
+                engine="pyarrow",
+                dtype=TASK3_COLUMN_TYPES,
+                dtype_backend="pyarrow",
+            )
         self.logger.info(f"Loaded {len(df)} rows and {len(df.columns)} columns")
         return df
 
@@ -76,8 +284,8 @@ class HypothesisTestingRunner:
         self.logger.info("=" * 80)
 
         # Create province groups
-        group_a, group_b, group_info = self.segmentation.create_province_groups(
-            df, min_samples=1000
+        idx_a, idx_b, group_info = self.segmentation.create_province_groups(
+            df, min_samples=1000, return_indices=True
         )
 
         results = {
@@ -88,30 +296,15 @@ class HypothesisTestingRunner:
 
         # Test Claim Frequency
         self.logger.info("\n--- Testing Claim Frequency ---")
-        freq_a = self.metric_calculator.calculate_claim_frequency(group_a)
-        freq_b = self.metric_calculator.calculate_claim_frequency(group_b)
-        freq_test = self.tester.test_difference(
-            freq_a, freq_b, metric_type="categorical"
-        )
+        freq_test = self._test_claim_frequency(df, idx_a, idx_b)
         # Add loss ratio for context
-        loss_ratio_a = self.metric_calculator.calculate_loss_ratio(
-            group_a, group_col=None
-        ).mean()
-        loss_ratio_b = self.metric_calculator.calculate_loss_ratio(
-            group_b, group_col=None
-        ).mean()
-        freq_test["loss_ratio_a"] = loss_ratio_a
-        freq_test["loss_ratio_b"] = loss_ratio_b
-        if not pd.isna(loss_ratio_a) and not pd.isna(loss_ratio_b) and loss_ratio_a > 0:
-            freq_test["loss_ratio_diff_pct"] = (
-                (loss_ratio_b - loss_ratio_a) / loss_ratio_a
-            ) * 100
+        self._add_loss_ratio_context(freq_test, df, idx_a, idx_b)
         results["tests"]["claim_frequency"] = freq_test
 
         # Test Claim Severity (only for policies with claims)
         self.logger.info("\n--- Testing Claim Severity ---")
-        severity_a = self.metric_calculator.calculate_claim_severity(group_a)
-        severity_b = self.metric_calculator.calculate_claim_severity(group_b)
+        severity_a = self._group_metrics(df, idx_a)["severity"]
+        severity_b = self._group_metrics(df, idx_b)["severity"]
         severity_test = self.tester.test_difference(
             severity_a, severity_b, metric_type="continuous"
         )
@@ -136,9 +329,7 @@ class HypothesisTestingRunner:
         self.logger.info("=" * 80)
 
         # Create zip code groups
-        group_a, group_b, group_info = self.segmentation.create_zipcode_groups(
-            df, min_samples=500
-        )
+        idx_a, idx_b, group_info = self._zipcode_groups(df, min_samples=500)
 
         results = {
             "hypothesis": "H₀: No risk differences between zip codes",
@@ -148,30 +339,15 @@ class HypothesisTestingRunner:
 
         # Test Claim Frequency
         self.logger.info("\n--- Testing Claim Frequency ---")
-        freq_a = self.metric_calculator.calculate_claim_frequency(group_a)
-        freq_b = self.metric_calculator.calculate_claim_frequency(group_b)
-        freq_test = self.tester.test_difference(
-            freq_a, freq_b, metric_type="categorical"
-        )
+        freq_test = self._test_claim_frequency(df, idx_a, idx_b)
         # Add loss ratio for context
-        loss_ratio_a = self.metric_calculator.calculate_loss_ratio(
-            group_a, group_col=None
-        ).mean()
-        loss_ratio_b = self.metric_calculator.calculate_loss_ratio(
-            group_b, group_col=None
-        ).mean()
-        freq_test["loss_ratio_a"] = loss_ratio_a
-        freq_test["loss_ratio_b"] = loss_ratio_b
-        if not pd.isna(loss_ratio_a) and not pd.isna(loss_ratio_b) and loss_ratio_a > 0:
-            freq_test["loss_ratio_diff_pct"] = (
-                (loss_ratio_b - loss_ratio_a) / loss_ratio_a
-            ) * 100
+        self._add_loss_ratio_context(freq_test, df, idx_a, idx_b)
         results["tests"]["claim_frequency"] = freq_test
 
         # Test Claim Severity
         self.logger.info("\n--- Testing Claim Severity ---")
-        severity_a = self.metric_calculator.calculate_claim_severity(group_a)
-        severity_b = self.metric_calculator.calculate_claim_severity(group_b)
+        severity_a = self._group_metrics(df, idx_a)["severity"]
+        severity_b = self._group_metrics(df, idx_b)["severity"]
         severity_test = self.tester.test_difference(
             severity_a, severity_b, metric_type="continuous"
         )
@@ -196,9 +372,7 @@ class HypothesisTestingRunner:
         self.logger.info("=" * 80)
 
         # Create zip code groups
-        group_a, group_b, group_info = self.segmentation.create_zipcode_groups(
-            df, min_samples=500
-        )
+        idx_a, idx_b, group_info = self._zipcode_groups(df, min_samples=500)
 
         results = {
             "hypothesis": "H₀: No significant margin difference between zip codes",
@@ -208,8 +382,10 @@ class HypothesisTestingRunner:
 
         # Test Margin
         self.logger.info("\n--- Testing Margin ---")
-        margin_a = self.metric_calculator.calculate_margin(group_a)
-        margin_b = self.metric_calculator.calculate_margin(group_b)
+        # Policy-level margin (TotalPremium - TotalClaims)
+        columns = self._column_arrays(df)
+        margin_a = columns["TotalPremium"][idx_a] - columns["TotalClaims"][idx_a]
+        margin_b = columns["TotalPremium"][idx_b] - columns["TotalClaims"][idx_b]
         margin_test = self.tester.test_difference(
             margin_a, margin_b, metric_type="continuous"
         )
@@ -234,8 +410,8 @@ class HypothesisTestingRunner:
         self.logger.info("=" * 80)
 
         # Create gender groups
-        group_a, group_b, group_info = self.segmentation.create_gender_groups(
-            df, min_samples=1000
+        idx_a, idx_b, group_info = self.segmentation.create_gender_groups(
+            df, min_samples=1000, return_indices=True
         )
 
         results = {
@@ -246,30 +422,15 @@ class HypothesisTestingRunner:
 
         # Test Claim Frequency
         self.logger.info("\n--- Testing Claim Frequency ---")
-        freq_a = self.metric_calculator.calculate_claim_frequency(group_a)
-        freq_b = self.metric_calculator.calculate_claim_frequency(group_b)
-        freq_test = self.tester.test_difference(
-            freq_a, freq_b, metric_type="categorical"
-        )
+        freq_test = self._test_claim_frequency(df, idx_a, idx_b)
         # Add loss ratio for context
-        loss_ratio_a = self.metric_calculator.calculate_loss_ratio(
-            group_a, group_col=None
-        ).mean()
-        loss_ratio_b = self.metric_calculator.calculate_loss_ratio(
-            group_b, group_col=None
-        ).mean()
-        freq_test["loss_ratio_a"] = loss_ratio_a
-        freq_test["loss_ratio_b"] = loss_ratio_b
-        if not pd.isna(loss_ratio_a) and not pd.isna(loss_ratio_b) and loss_ratio_a > 0:
-            freq_test["loss_ratio_diff_pct"] = (
-                (loss_ratio_b - loss_ratio_a) / loss_ratio_a
-            ) * 100
+        self._add_loss_ratio_context(freq_test, df, idx_a, idx_b)
         results["tests"]["claim_frequency"] = freq_test
 
         # Test Claim Severity
         self.logger.info("\n--- Testing Claim Severity ---")
-        severity_a = self.metric_calculator.calculate_claim_severity(group_a)
-        severity_b = self.metric_calculator.calculate_claim_severity(group_b)
+        severity_a = self._group_metrics(df, idx_a)["severity"]
+        severity_b = self._group_metrics(df, idx_b)["severity"]
         severity_test = self.tester.test_difference(
             severity_a, severity_b, metric_type="continuous"
         )
@@ -277,6 +438,19 @@ class HypothesisTestingRunner:
 
         return results
 
+    def _run_batch(self, method_names: Tuple[str, ...], df: pd.DataFrame) -> List[Dict]:
+        """
+        Run the named hypothesis test methods sequentially.
+
+        Args:
+            method_names: Names of ``test_*`` methods to call
+            df: DataFrame with insurance data
+
+        Returns:
+            List of test result dictionaries, in the given order
+        """
+        return [getattr(self, name)(df) for name in method_names]
+
     def run_all_tests(self) -> List[Dict]:
         """
         Run all hypothesis tests.
@@ -290,24 +464,20 @@ class HypothesisTestingRunner:
         # Load data
         df = self.load_data()
 
-        # Run all hypothesis tests
+        # Run all hypothesis tests (H1-H4, in order)
         all_results = []
-
-        # Hypothesis 1: Province risk differences
-        results_1 = self.test_province_risk_differences(df)
-        all_results.append(results_1)
-
-        # Hypothesis 2: Zip code risk differences
-        results_2 = self.test_zipcode_risk_differences(df)
-        all_results.append(results_2)
-
-        # Hypothesis 3: Zip code margin differences
-        results_3 = self.test_zipcode_margin_differences(df)
-        all_results.append(results_3)
-
-        # Hypothesis 4: Gender risk differences
-        results_4 = self.test_gender_risk_differences(df)
-        all_results.append(results_4)
+        if self._parallel_tests:
+            with ProcessPoolExecutor(max_workers=len(HYPOTHESIS_BATCHES)) as pool:
+                futures = [
+                    pool.submit(_run_hypothesis_batch, self.config_path, batch, df)
+                    for batch in HYPOTHESIS_BATCHES
+                ]
+                for future in futures:
+                    all_results.extend(future.result())
+        else:
+            with self._cache_scope():
+                for batch in HYPOTHESIS_BATCHES:
+                    all_results.extend(self._run_batch(batch, df))
 
         return all_results
 
@@ -321,28 +491,17 @@ class HypothesisTestingRunner:
         """
         output_path = self.results_path / filename
 
-        # Convert numpy types to native Python types for JSON serialization
-        def convert_to_serializable(obj):
-            """Convert numpy types to Python native types."""
-            if isinstance(obj, dict):
-                return {k: convert_to_serializable(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_to_serializable(item) for item in obj]
-            elif isinstance(obj, (pd.DataFrame, pd.Series)):
-                return obj.to_dict()
-            elif isinstance(obj, (np.integer, np.floating)):
-                return float(obj) if isinstance(obj, np.floating) else int(obj)
-            elif isinstance(obj, np.ndarray):
-                return obj.tolist()
-            elif pd.isna(obj):
-                return None
-            else:
-                return obj
-
-        serializable_results = convert_to_serializable(results)
-
-        with open(output_path, "w") as f:
-            json.dump(serializable_results, f, indent=2, default=str)
+        # orjson serialises NumPy scalars/arrays natively (NaN -> null)
+        with open(output_path, "wb") as f:
+            f.write(
+                orjson.dumps(
+                    results,
+                    default=_orjson_default,
+                    option=orjson.OPT_SERIALIZE_NUMPY
+                    | orjson.OPT_INDENT_2
+                    | orjson.OPT_NON_STR_KEYS,
+                )
+            )
 
         self.logger.info(f"Results saved to {output_path}")
 
@@ -1,25 +1,43 @@
 """Metric computation for insurance risk analysis."""
 
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
 
 import numpy as np
 import pandas as pd
 
+from src.analysis.task3._kernels import fused_sums, group_totals
+from src.analysis.task3.backend import array_module, to_numpy
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+def _safe_div(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    """Elementwise ``num / den``, NaN where *den* is zero.
+
+    float32 inputs give a float32 result; anything else gives float64.
+    """
+    out = np.full(np.shape(num), np.nan, dtype=np.result_type(num, den, np.float32))
+    return np.divide(num, den, out=out, where=den != 0)
+
+
+def _series_div(num: pd.Series, den: pd.Series) -> pd.Series:
+    """:func:`_safe_div` for two Series sharing the same index."""
+    return pd.Series(_safe_div(num.to_numpy(), den.to_numpy()), index=num.index)
+
+
 class MetricCalculator:
     """Calculate insurance risk metrics for hypothesis testing."""
 
+    __slots__ = ("logger",)
+
     def __init__(self):
         """Initialize MetricCalculator."""
         self.logger = logger
 
     def calculate_claim_frequency(
         self, df: pd.DataFrame, group_col: Optional[str] = None
-    ) -> pd.Series:
+    ) -> Union[pd.Series, np.ndarray]:
         """
         Calculate claim frequency (number of claims per policy).
 
@@ -28,24 +46,21 @@ class MetricCalculator:
             group_col: Optional column to group by
 
         Returns:
-            Series with claim frequency values
+            Series with group-level claim frequency, or a uint8 array of
+            policy-level claim indicators when no group column is given
         """
         if group_col:
             # Group-level claim frequency
-            grouped = df.groupby(group_col)
-            total_policies = grouped.size()
-            total_claims = grouped["TotalClaims"].sum()
+            sums = self._grouped_sums(df, group_col)
             # Avoid division by zero
-            claim_freq = total_claims / total_policies.replace(0, np.nan)
-            return claim_freq
+            return _series_div(sums["total_claims"], sums["n_policies"])
         else:
             # Policy-level claim frequency (binary: 0 or 1+)
-            claim_freq = (df["TotalClaims"] > 0).astype(int)
-            return claim_freq
+            return self._frequency_from_mask(df["TotalClaims"].to_numpy() > 0)
 
     def calculate_claim_severity(
         self, df: pd.DataFrame, group_col: Optional[str] = None
-    ) -> pd.Series:
+    ) -> Union[pd.Series, np.ndarray]:
         """
         Calculate claim severity (average claim amount when claims occur).
 
@@ -54,24 +69,29 @@ class MetricCalculator:
             group_col: Optional column to group by
 
         Returns:
-            Series with claim severity values
+            Series with group-level claim severity, or an array with the claim
+            amounts of policies that have claims when no group column is given
         """
         if group_col:
-            # Group-level claim severity
-            grouped = df.groupby(group_col)
-            total_claims_amount = grouped["TotalClaims"].sum()
-            num_claims = grouped.apply(
-                lambda x: (x["TotalClaims"] > 0).sum()
-            )  # Count policies with claims
-            # Average claim amount per claim
-            claim_severity = total_claims_amount / num_claims.replace(0, np.nan)
-            return claim_severity
+            # Group-level claim severity: average claim amount per claim
+            sums = self._grouped_sums(df, group_col)
+            return _series_div(sums["total_claims"], sums["n_claims"])
         else:
             # Policy-level claim severity (only for policies with claims)
-            claim_severity = df["TotalClaims"].copy()
-            # Set to NaN for policies without claims
-            claim_severity[claim_severity == 0] = np.nan
-            return claim_severity
+            total_claims = df["TotalClaims"].to_numpy()
+            return self._severity_from_mask(total_claims, total_claims > 0)
+
+    @staticmethod
+    def _frequency_from_mask(has_claim: np.ndarray) -> np.ndarray:
+        """Policy-level claim indicators from a ``TotalClaims > 0`` mask."""
+        return has_claim.astype(np.uint8)
+
+    @staticmethod
+    def _severity_from_mask(
+        total_claims: np.ndarray, has_claim: np.ndarray
+    ) -> np.ndarray:
+        """Claim amounts of the policies selected by a ``TotalClaims > 0`` mask."""
+        return total_claims[has_claim]
 
     def calculate_margin(
         self, df: pd.DataFrame, group_col: Optional[str] = None
@@ -88,15 +108,12 @@ class MetricCalculator:
         """
         if group_col:
             # Group-level margin
-            grouped = df.groupby(group_col)
-            total_premium = grouped["TotalPremium"].sum()
-            total_claims = grouped["TotalClaims"].sum()
-            margin = total_premium - total_claims
-            return margin
+            sums = self._grouped_sums(df, group_col)
+            return sums["total_premium"] - sums["total_claims"]
         else:
             # Policy-level margin
-            margin = df["TotalPremium"] - df["TotalClaims"]
-            return margin
+            margin = df["TotalPremium"].to_numpy() - df["TotalClaims"].to_numpy()
+            return pd.Series(margin, index=df.index)
 
     def calculate_loss_ratio(
         self, df: pd.DataFrame, group_col: Optional[str] = None
@@ -112,17 +129,83 @@ class MetricCalculator:
             Series with loss ratio values
         """
         if group_col:
-            # Group-level loss ratio
-            grouped = df.groupby(group_col)
-            total_premium = grouped["TotalPremium"].sum()
-            total_claims = grouped["TotalClaims"].sum()
-            # Avoid division by zero
-            loss_ratio = total_claims / total_premium.replace(0, np.nan)
-            return loss_ratio
+            # Group-level loss ratio (NaN for zero premium)
+            sums = self._grouped_sums(df, group_col)
+            return _series_div(sums["total_claims"], sums["total_premium"])
         else:
             # Policy-level loss ratio
-            loss_ratio = df["TotalClaims"] / df["TotalPremium"].replace(0, np.nan)
-            return loss_ratio
+            loss_ratio = _safe_div(
+                df["TotalClaims"].to_numpy(), df["TotalPremium"].to_numpy()
+            )
+            return pd.Series(loss_ratio, index=df.index)
+
+    def compute_all_from_arrays(
+        self, total_claims: np.ndarray, total_premium: np.ndarray
+    ) -> Dict[str, Union[np.ndarray, float]]:
+        """
+        Compute the policy-level metrics of one group in a single column scan.
+
+        NumPy arrays use the fused host kernel. CuPy arrays are reduced on the
+        device; the sums and the mask/severity arrays are copied back so the
+        statistical tests can run on the host.
+
+        Args:
+            total_claims: TotalClaims values of one group (NumPy or CuPy)
+            total_premium: TotalPremium values of one group (NumPy or CuPy)
+
+        Returns:
+            Dictionary with the claim indicator mask (``freq``), the positive
+            claim amounts (``severity``) and the claim and premium totals
+            (``claim_sum``, ``premium_sum``)
+        """
+        xp = array_module(total_claims)
+        if xp is not np:
+            mask = total_claims > 0
+            return {
+                "freq": to_numpy(mask),
+                "severity": to_numpy(total_claims[mask]),
+                "claim_sum": float(xp.nansum(total_claims, dtype=xp.float64)),
+                "premium_sum": float(xp.nansum(total_premium, dtype=xp.float64)),
+            }
+
+        mask = total_claims > 0
+        claim_sum, premium_sum = fused_sums(total_claims, total_premium)
+        return {
+            "freq": mask,
+            "severity": total_claims[mask],
+            "claim_sum": claim_sum,
+            "premium_sum": premium_sum,
+        }
+
+    def _grouped_sums(self, df: pd.DataFrame, group_col: str) -> pd.DataFrame:
+        """
+        Aggregate the per-group totals behind all group-level metrics.
+
+        Args:
+            df: DataFrame with insurance data
+            group_col: Column to group by
+
+        Returns:
+            DataFrame indexed by group with ``total_claims``, ``n_policies``,
+            ``n_claims`` and ``total_premium`` columns
+        """
+        # Rows with a missing key get code -1 and are dropped, matching groupby
+        codes, uniques = pd.factorize(df[group_col], sort=False)
+        claim_sums, premium_sums, n_policies, n_claims = group_totals(
+            codes,
+            df["TotalClaims"].to_numpy(na_value=np.nan),
+            df["TotalPremium"].to_numpy(na_value=np.nan),
+            len(uniques),
+        )
+        return pd.DataFrame(
+            {
+                "total_claims": claim_sums,
+                "n_policies": n_policies,
+                "n_claims": n_claims,
+                "total_premium": premium_sums,
+            },
+            index=pd.Index(uniques, name=group_col),
+        )
 
     def compute_all_metrics(
         self, df: pd.DataFrame, group_col: Optional[str] = None
@@ -130,6 +213,14 @@ class MetricCalculator:
         """
         Compute all metrics for a dataset.
 
+        Policy-level metrics are computed from float32 copies of TotalClaims
+        and TotalPremium, made once (the Task 3 loader reads the amounts as
+        float64, so this is a single conversion pass). float32 keeps about 7
+        significant digits, ample for currency amounts and ratios, and halves
+        the bytes moved by each later pass; margin and loss ratio are returned
+        as float32. Group-level totals are accumulated in float64 by the fused
+        kernel from the original columns.
+
         Args:
             df: DataFrame with insurance data
             group_col: Optional column to group by
@@ -137,10 +228,34 @@ class MetricCalculator:
         Returns:
             Dictionary with all computed metrics
         """
+        if group_col:
+            # One pass over the group keys; every group-level metric derives from it
+            sums = self._grouped_sums(df, group_col)
+            total_claims = sums["total_claims"]
+            total_premium = sums["total_premium"]
+            return {
+                "claim_frequency": _series_div(total_claims, sums["n_policies"]),
+                "claim_severity": _series_div(total_claims, sums["n_claims"]),
+                "margin": total_premium - total_claims,
+                "loss_ratio": _series_div(total_claims, total_premium),
+            }
+
+        # Downcast once; every policy-level metric below reads these columns
+        amounts = pd.DataFrame(
+            {
+                col: df[col].to_numpy(dtype=np.float32, na_value=np.nan)
+                for col in ("TotalClaims", "TotalPremium")
+            },
+            index=df.index,
+            copy=False,
+        )
+        # One comparison shared by frequency and severity
+        total_claims = amounts["TotalClaims"].to_numpy()
+        has_claim = total_claims > 0
         metrics = {
-            "claim_frequency": self.calculate_claim_frequency(df, group_col),
-            "claim_severity": self.calculate_claim_severity(df, group_col),
-            "margin": self.calculate_margin(df, group_col),
-            "loss_ratio": self.calculate_loss_ratio(df, group_col),
+            "claim_frequency": self._frequency_from_mask(has_claim),
+            "claim_severity": self._severity_from_mask(total_claims, has_claim),
+            "margin": self.calculate_margin(amounts),
+            "loss_ratio": self.calculate_loss_ratio(amounts),
         }
         return metrics
@@ -1,7 +1,8 @@
 """Report generation for Task 3 statistical analysis."""
 
+import io
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, Dict, List, Tuple
 
 import numpy as np
 import pandas as pd
@@ -11,9 +12,80 @@ from src.utils.logger import get_logger
 logger = get_logger(__name__)
 
 
+def _loss_ratio_sentence(
+    subject: str, group_a_name: str, loss_ratio_a, loss_ratio_b, loss_ratio_diff_pct
+) -> str:
+    """Loss ratio comparison sentence, or an empty string if it is unknown."""
+    if pd.isna(loss_ratio_diff_pct):
+        return ""
+    return (
+        f"{subject} shows {abs(loss_ratio_diff_pct):.1f}% {'higher' if loss_ratio_diff_pct > 0 else 'lower'} loss ratio than {group_a_name} "
+        f"({loss_ratio_b:.3f} vs {loss_ratio_a:.3f}). "
+    )
+
+
+# Business interpretations keyed by (hypothesis number, metric). Each template
+# takes (p_value, group_a_name, group_b_name, loss_ratio_a, loss_ratio_b,
+# loss_ratio_diff_pct), so only the matching text is ever formatted.
+_INTERPRETATION_TEMPLATES: Dict[Tuple[int, str], Callable[..., str]] = {
+    (1, "claim_frequency"): lambda p, a, b, la, lb, d: (
+        f"We reject H₀ for claim frequency across provinces (p < {p:.3f}). "
+        f"{a} and {b} show statistically significant differences "
+        f"in claim frequency. "
+        + _loss_ratio_sentence(b, a, la, lb, d)
+        + f"This suggests that regional risk factors vary by province, "
+        f"and ACIS should consider province-based premium adjustments in their pricing model."
+    ),
+    (1, "claim_severity"): lambda p, a, b, la, lb, d: (
+        f"We reject H₀ for claim severity across provinces (p < {p:.3f}). "
+        f"Claim amounts differ significantly between {a} and {b}. "
+        f"This indicates that not only do provinces differ in claim frequency, but also "
+        f"in the severity of claims when they occur. Regional pricing strategies should "
+        f"account for both frequency and severity differences."
+    ),
+    (2, "claim_frequency"): lambda p, a, b, la, lb, d: (
+        f"We reject H₀ for claim frequency between zip codes (p < {p:.3f}). "
+        f"Zip codes {a} and {b} exhibit different risk profiles. "
+        + _loss_ratio_sentence(f"Zip code {b}", a, la, lb, d)
+        + f"This granular geographic segmentation can inform more precise pricing strategies "
+        f"and risk assessment at the local level."
+    ),
+    (2, "claim_severity"): lambda p, a, b, la, lb, d: (
+        f"We reject H₀ for claim severity between zip codes (p < {p:.3f}). "
+        f"Significant differences in claim amounts between zip codes {a} and "
+        f"{b} suggest that local factors (e.g., traffic patterns, crime rates, "
+        f"infrastructure) impact claim severity. Consider zip code-level risk adjustments."
+    ),
+    (3, "margin"): lambda p, a, b, la, lb, d: (
+        f"We reject H₀ for margin differences between zip codes (p < {p:.3f}). "
+        f"Profitability (TotalPremium - TotalClaims) differs significantly between "
+        f"zip codes {a} and {b}. This indicates that some "
+        f"geographic areas are more profitable than others. ACIS should review pricing "
+        f"strategies for underperforming zip codes and consider reallocating resources "
+        f"or adjusting premiums to improve profitability."
+    ),
+    (4, "claim_frequency"): lambda p, a, b, la, lb, d: (
+        f"We reject H₀ for claim frequency between genders (p < {p:.3f}). "
+        f"Statistically significant differences exist between {a} and "
+        f"{b} in terms of claim frequency. "
+        + _loss_ratio_sentence(b, a, la, lb, d)
+        + f"However, note that gender-based pricing may be subject to regulatory restrictions. "
+        f"Consider this finding in conjunction with other risk factors and regulatory compliance requirements."
+    ),
+    (4, "claim_severity"): lambda p, a, b, la, lb, d: (
+        f"We reject H₀ for claim severity between genders (p < {p:.3f}). "
+        f"Claim amounts differ significantly between {a} and {b}. "
+        f"While this finding is statistically significant, ensure that any pricing "
+        f"decisions comply with applicable regulations regarding gender-based discrimination."
+    ),
+}
+
+
 class ReportGenerator:
     """Generate comprehensive reports for hypothesis testing results."""
 
+    __slots__ = ("logger", "output_path")
+
     def __init__(self, output_path: Path):
         """
         Initialize ReportGenerator.
@@ -35,38 +107,65 @@ class ReportGenerator:
         Returns:
             DataFrame with summary results
         """
-        rows = []
+        # Column-oriented accumulation: one list per output column
+        columns: Dict[str, List] = {
+            "Hypothesis": [],
+            "Null Hypothesis": [],
+            "Metric": [],
+            "Test Type": [],
+            "P-value": [],
+            "Reject H₀": [],
+            "Group A": [],
+            "Group B": [],
+            "N (Group A)": [],
+            "N (Group B)": [],
+        }
+        # Metric-specific statistics; only those reported by some test are
+        # kept, in order of first appearance
+        stats: Dict[str, List] = {
+            "Mean (A)": [],
+            "Mean (B)": [],
+            "Median (A)": [],
+            "Median (B)": [],
+        }
+        stat_order: List[str] = []
 
         for i, result in enumerate(results):
             hypothesis = result["hypothesis"]
             group_info = result.get("group_info", {})
 
             for test_name, test_result in result.get("tests", {}).items():
-                row = {
-                    "Hypothesis": f"H{i+1}",
-                    "Null Hypothesis": hypothesis,
-                    "Metric": test_name,
-                    "Test Type": test_result.get("test_type", "N/A"),
-                    "P-value": test_result.get("p_value", np.nan),
-                    "Reject H₀": test_result.get("reject_null", False),
-                    "Group A": group_info.get("group_a_name", "N/A"),
-                    "Group B": group_info.get("group_b_name", "N/A"),
-                    "N (Group A)": group_info.get("group_a_size", 0),
-                    "N (Group B)": group_info.get("group_b_size", 0),
-                }
+                columns["Hypothesis"].append(f"H{i+1}")
+                columns["Null Hypothesis"].append(hypothesis)
+                columns["Metric"].append(test_name)
+                columns["Test Type"].append(test_result.get("test_type", "N/A"))
+                columns["P-value"].append(test_result.get("p_value", np.nan))
+                columns["Reject H₀"].append(test_result.get("reject_null", False))
+                columns["Group A"].append(group_info.get("group_a_name", "N/A"))
+                columns["Group B"].append(group_info.get("group_b_name", "N/A"))
+                columns["N (Group A)"].append(group_info.get("group_a_size", 0))
+                columns["N (Group B)"].append(group_info.get("group_b_size", 0))
 
                 # Add metric-specific statistics
                 if "mean_a" in test_result:
-                    row["Mean (A)"] = test_result.get("mean_a", np.nan)
-                    row["Mean (B)"] = test_result.get("mean_b", np.nan)
+                    present = ("Mean (A)", "Mean (B)")
+                    values = (test_result["mean_a"], test_result.get("mean_b", np.nan))
                 elif "median_a" in test_result:
-                    row["Median (A)"] = test_result.get("median_a", np.nan)
-                    row["Median (B)"] = test_result.get("median_b", np.nan)
-
-                rows.append(row)
+                    present = ("Median (A)", "Median (B)")
+                    values = (
+                        test_result["median_a"],
+                        test_result.get("median_b", np.nan),
+                    )
+                else:
+                    present, values = (), ()
+                for col in stats:
+                    stats[col].append(
+                        values[present.index(col)] if col in present else np.nan
+                    )
+                stat_order.extend(col for col in present if col not in stat_order)
 
-        df = pd.DataFrame(rows)
-        return df
+        columns.update((col, stats[col]) for col in stat_order)
+        return pd.DataFrame(columns)
 
     def generate_markdown_report(
         self, results: List[Dict], filename: str = "task3_statistical_report.md"
@@ -81,18 +180,22 @@ class ReportGenerator:
         Returns:
             Markdown report content
         """
-        report_lines = [
-            "# Task 3: Statistical Validation of Risk Drivers",
-            "",
-            "## Executive Summary",
-            "",
-            "This report presents the results of statistical hypothesis testing to validate "
-            "key assumptions about insurance risk drivers. The analysis tests four null "
-            "hypotheses related to geographic, demographic, and profitability dimensions.",
-            "",
-            "---",
-            "",
-        ]
+        # Each section is emitted with a single write of one f-string block
+        buf = io.StringIO()
+        write = buf.write
+        write(
+            "# Task 3: Statistical Validation of Risk Drivers\n"
+            "\n"
+            "## Executive Summary\n"
+            "\n"
+            "This report presents the results of statistical hypothesis testing to "
+            "validate key assumptions about insurance risk drivers. The analysis tests "
+            "four null hypotheses related to geographic, demographic, and "
+            "profitability dimensions.\n"
+            "\n"
+            "---\n"
+            "\n"
+        )
 
         # Process each hypothesis
         for i, result in enumerate(results):
@@ -100,17 +203,17 @@ class ReportGenerator:
             group_info = result.get("group_info", {})
             tests = result.get("tests", {})
 
-            report_lines.extend(
-                [
-                    f"## Hypothesis {i+1}",
-                    "",
-                    f"**Null Hypothesis:** {hypothesis}",
-                    "",
-                    f"**Comparison Groups:**",
-                    f"- Group A: {group_info.get('group_a_name', 'N/A')} (n={group_info.get('group_a_size', 0):,})",
-                    f"- Group B: {group_info.get('group_b_name', 'N/A')} (n={group_info.get('group_b_size', 0):,})",
-                    "",
-                ]
+            write(
+                f"## Hypothesis {i+1}\n"
+                f"\n"
+                f"**Null Hypothesis:** {hypothesis}\n"
+                f"\n"
+                f"**Comparison Groups:**\n"
+                f"- Group A: {group_info.get('group_a_name', 'N/A')} "
+                f"(n={group_info.get('group_a_size', 0):,})\n"
+                f"- Group B: {group_info.get('group_b_name', 'N/A')} "
+                f"(n={group_info.get('group_b_size', 0):,})\n"
+                f"\n"
             )
 
             # Add test results
@@ -118,36 +221,35 @@ class ReportGenerator:
                 p_value = test_result.get("p_value", np.nan)
                 reject = test_result.get("reject_null", False)
                 test_type = test_result.get("test_type", "N/A")
-
-                report_lines.extend(
-                    [
-                        f"### {test_name.replace('_', ' ').title()}",
-                        "",
-                        f"- **Test Type:** {test_type}",
-                        f"- **P-value:** {p_value:.4f}",
-                        f"- **Significance Level (α):** 0.05",
-                        f"- **Conclusion:** {'**REJECT H₀**' if reject else '**FAIL TO REJECT H₀**'}",
-                        "",
-                    ]
+                conclusion = "**REJECT H₀**" if reject else "**FAIL TO REJECT H₀**"
+
+                write(
+                    f"### {test_name.replace('_', ' ').title()}\n"
+                    f"\n"
+                    f"- **Test Type:** {test_type}\n"
+                    f"- **P-value:** {p_value:.4f}\n"
+                    f"- **Significance Level (α):** 0.05\n"
+                    f"- **Conclusion:** {conclusion}\n"
+                    f"\n"
                 )
 
                 # Add metric-specific details
                 if "mean_a" in test_result:
-                    report_lines.extend(
-                        [
-                            f"- **Mean (Group A):** {test_result.get('mean_a', np.nan):.2f}",
-                            f"- **Mean (Group B):** {test_result.get('mean_b', np.nan):.2f}",
-                            f"- **Difference:** {test_result.get('mean_b', np.nan) - test_result.get('mean_a', np.nan):.2f}",
-                            "",
-                        ]
+                    mean_a = test_result.get("mean_a", np.nan)
+                    mean_b = test_result.get("mean_b", np.nan)
+                    write(
+                        f"- **Mean (Group A):** {mean_a:.2f}\n"
+                        f"- **Mean (Group B):** {mean_b:.2f}\n"
+                        f"- **Difference:** {mean_b - mean_a:.2f}\n"
+                        f"\n"
                     )
                 elif "median_a" in test_result:
-                    report_lines.extend(
-                        [
-                            f"- **Median (Group A):** {test_result.get('median_a', np.nan):.2f}",
-                            f"- **Median (Group B):** {test_result.get('median_b', np.nan):.2f}",
-                            "",
-                        ]
+                    write(
+                        f"- **Median (Group A):** "
+                        f"{test_result.get('median_a', np.nan):.2f}\n"
+                        f"- **Median (Group B):** "
+                        f"{test_result.get('median_b', np.nan):.2f}\n"
+                        f"\n"
                     )
 
                 # Business interpretation
@@ -155,26 +257,16 @@ class ReportGenerator:
                     interpretation = self._generate_business_interpretation(
                         i + 1, test_name, test_result, group_info
                     )
-                    report_lines.extend(
-                        [
-                            "**Business Interpretation:**",
-                            "",
-                            interpretation,
-                            "",
-                        ]
-                    )
+                    write(f"**Business Interpretation:**\n\n{interpretation}\n\n")
 
-            report_lines.append("---")
-            report_lines.append("")
+            write("---\n\n")
 
         # Summary table
-        report_lines.extend(
-            [
-                "## Summary Table",
-                "",
-                "| Hypothesis | Metric | P-value | Reject H₀ | Conclusion |",
-                "|------------|--------|---------|------------|------------|",
-            ]
+        write(
+            "## Summary Table\n"
+            "\n"
+            "| Hypothesis | Metric | P-value | Reject H₀ | Conclusion |\n"
+            "|------------|--------|---------|------------|------------|\n"
         )
 
         for i, result in enumerate(results):
@@ -185,19 +277,17 @@ class ReportGenerator:
                     "Significant difference" if reject else "No significant difference"
                 )
 
-                report_lines.append(
+                write(
                     f"| H{i+1} | {test_name.replace('_', ' ').title()} | "
-                    f"{p_value:.4f} | {'Yes' if reject else 'No'} | {conclusion} |"
+                    f"{p_value:.4f} | {'Yes' if reject else 'No'} | {conclusion} |\n"
                 )
 
-        report_lines.extend(["", "---", ""])
+        write("\n---\n")
 
         # Save report
-        report_content = "\n".join(report_lines)
+        report_content = buf.getvalue()
         output_file = self.output_path / filename
-
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(report_content)
+        output_file.write_text(report_content, encoding="utf-8")
 
         self.logger.info(f"Report saved to {output_file}")
 
@@ -227,77 +317,16 @@ class ReportGenerator:
         loss_ratio_b = test_result.get("loss_ratio_b", np.nan)
         loss_ratio_diff_pct = test_result.get("loss_ratio_diff_pct", np.nan)
 
-        interpretations = {
-            (1, "claim_frequency"): (
-                f"We reject H₀ for claim frequency across provinces (p < {p_value:.3f}). "
-                f"{group_a_name} and {group_b_name} show statistically significant differences "
-                f"in claim frequency. "
-                + (
-                    f"{group_b_name} shows {abs(loss_ratio_diff_pct):.1f}% {'higher' if loss_ratio_diff_pct > 0 else 'lower'} loss ratio than {group_a_name} "
-                    f"({loss_ratio_b:.3f} vs {loss_ratio_a:.3f}). "
-                    if not pd.isna(loss_ratio_diff_pct)
-                    else ""
-                )
-                + f"This suggests that regional risk factors vary by province, "
-                f"and ACIS should consider province-based premium adjustments in their pricing model."
-            ),
-            (1, "claim_severity"): (
-                f"We reject H₀ for claim severity across provinces (p < {p_value:.3f}). "
-                f"Claim amounts differ significantly between {group_a_name} and {group_b_name}. "
-                f"This indicates that not only do provinces differ in claim frequency, but also "
-                f"in the severity of claims when they occur. Regional pricing strategies should "
-                f"account for both frequency and severity differences."
-            ),
-            (2, "claim_frequency"): (
-                f"We reject H₀ for claim frequency between zip codes (p < {p_value:.3f}). "
-                f"Zip codes {group_a_name} and {group_b_name} exhibit different risk profiles. "
-                + (
-                    f"Zip code {group_b_name} shows {abs(loss_ratio_diff_pct):.1f}% {'higher' if loss_ratio_diff_pct > 0 else 'lower'} loss ratio than {group_a_name} "
-                    f"({loss_ratio_b:.3f} vs {loss_ratio_a:.3f}). "
-                    if not pd.isna(loss_ratio_diff_pct)
-                    else ""
-                )
-                + f"This granular geographic segmentation can inform more precise pricing strategies "
-                f"and risk assessment at the local level."
-            ),
-            (2, "claim_severity"): (
-                f"We reject H₀ for claim severity between zip codes (p < {p_value:.3f}). "
-                f"Significant differences in claim amounts between zip codes {group_a_name} and "
-                f"{group_b_name} suggest that local factors (e.g., traffic patterns, crime rates, "
-                f"infrastructure) impact claim severity. Consider zip code-level risk adjustments."
-            ),
-            (3, "margin"): (
-                f"We reject H₀ for margin differences between zip codes (p < {p_value:.3f}). "
-                f"Profitability (TotalPremium - TotalClaims) differs significantly between "
-                f"zip codes {group_a_name} and {group_b_name}. This indicates that some "
-                f"geographic areas are more profitable than others. ACIS should review pricing "
-                f"strategies for underperforming zip codes and consider reallocating resources "
-                f"or adjusting premiums to improve profitability."
-            ),
-            (4, "claim_frequency"): (
-                f"We reject H₀ for claim frequency between genders (p < {p_value:.3f}). "
-                f"Statistically significant differences exist between {group_a_name} and "
-                f"{group_b_name} in terms of claim frequency. "
-                + (
-                    f"{group_b_name} shows {abs(loss_ratio_diff_pct):.1f}% {'higher' if loss_ratio_diff_pct > 0 else 'lower'} loss ratio than {group_a_name} "
-                    f"({loss_ratio_b:.3f} vs {loss_ratio_a:.3f}). "
-                    if not pd.isna(loss_ratio_diff_pct)
-                    else ""
-                )
-                + f"However, note that gender-based pricing may be subject to regulatory restrictions. "
-                f"Consider this finding in conjunction with other risk factors and regulatory compliance requirements."
-            ),
-            (4, "claim_severity"): (
-                f"We reject H₀ for claim severity between genders (p < {p_value:.3f}). "
-                f"Claim amounts differ significantly between {group_a_name} and {group_b_name}. "
-                f"While this finding is statistically significant, ensure that any pricing "
-                f"decisions comply with applicable regulations regarding gender-based discrimination."
-            ),
-        }
-
-        key = (hypothesis_num, test_name)
-        if key in interpretations:
-            return interpretations[key]
+        template = _INTERPRETATION_TEMPLATES.get((hypothesis_num, test_name))
+        if template is not None:
+            return template(
+                p_value,
+                group_a_name,
+                group_b_name,
+                loss_ratio_a,
+                loss_ratio_b,
+                loss_ratio_diff_pct,
+            )
         else:
             return (
                 f"Statistically significant difference detected (p < {p_value:.3f}). "
@@ -1,6 +1,6 @@
 """Data segmentation for A/B hypothesis testing."""
 
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -9,10 +9,19 @@ from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# A/B group: DataFrame subset, or positional row indices into the source frame
+Group = Union[pd.DataFrame, np.ndarray]
+
 
 class DataSegmentation:
     """Create A/B test groups for hypothesis testing."""
 
+    # Columns the metrics and tests read from a group; DataFrame groups are
+    # projected onto these plus the segmentation column
+    REQUIRED_COLS: Tuple[str, ...] = ("TotalClaims", "TotalPremium")
+
+    __slots__ = ("logger", "random_seed")
+
     def __init__(self, random_seed: int = 42):
         """
         Initialize DataSegmentation.
@@ -24,9 +33,118 @@ class DataSegmentation:
         self.random_seed = random_seed
         np.random.seed(random_seed)
 
+    def _category_codes(self, series: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+        """
+        Map a column to integer codes in a single hashing pass.
+
+        Categorical columns already carry their codes, so nothing is hashed.
+
+        Args:
+            series: Column to encode
+
+        Returns:
+            Tuple of (codes, categories); missing values get code -1
+        """
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return series.cat.codes.to_numpy(), series.cat.categories
+        codes, uniques = pd.factorize(series, sort=False)
+        return codes, pd.Index(uniques)
+
+    def _top_two_valid_categories(
+        self,
+        codes: np.ndarray,
+        categories: pd.Index,
+        min_samples: int,
+        label: str,
+        exclude: Tuple[Any, ...] = (),
+    ) -> Tuple[Any, Any]:
+        """
+        Pick the two most frequent categories with at least *min_samples* rows.
+
+        Counts come from one ``bincount`` over the codes and the top two are
+        found with two linear scans, so no sort of all categories is needed.
+        Ties go to the category that appears first. If fewer than two
+        categories reach *min_samples*, the two largest overall are used.
+
+        Args:
+            codes: Integer codes from :meth:`_category_codes`
+            categories: Categories matching *codes*
+            min_samples: Minimum number of samples per category
+            label: Plural noun for log messages (e.g. ``"provinces"``)
+            exclude: Category values that must not be selected
+
+        Returns:
+            Tuple of (category_a, category_b), largest first
+
+        Raises:
+            ValueError: If fewer than two categories are present
+        """
+        counts = np.bincount(codes[codes >= 0], minlength=len(categories))
+        for value in exclude:
+            position = categories.get_indexer([value])[0]
+            if position >= 0:
+                counts[position] = 0
+
+        n_valid = int(np.count_nonzero(counts >= max(min_samples, 1)))
+        if n_valid < 2:
+            self.logger.warning(
+                f"Only {n_valid} {label} meet minimum sample size. "
+                f"Using all available {label}."
+            )
+
+        first = int(np.argmax(counts))
+        remaining = counts.copy()
+        remaining[first] = -1
+        second = int(np.argmax(remaining)) if len(counts) > 1 else first
+        if len(counts) < 2 or counts[second] == 0:
+            raise ValueError(f"Need at least two {label} to compare")
+        return categories[first], categories[second]
+
+    def _select_groups(
+        self,
+        df: pd.DataFrame,
+        column: str,
+        value_a: Any,
+        value_b: Any,
+        return_indices: bool = False,
+        encoded: Optional[Tuple[np.ndarray, pd.Index]] = None,
+    ) -> Tuple[Group, Group]:
+        """
+        Select the rows of *df* whose *column* equals each of two values.
+
+        The column is encoded once and both masks are integer comparisons
+        against the codes, instead of two full scans of the (often string)
+        column.
+
+        Args:
+            df: DataFrame with insurance data
+            column: Column to compare
+            value_a: Value identifying group A
+            value_b: Value identifying group B
+            return_indices: Return positional row indices instead of
+                DataFrames
+            encoded: ``(codes, categories)`` of *column* if already computed
+
+        Returns:
+            Tuple of (group_a, group_b); DataFrame groups hold only *column*
+            and :attr:`REQUIRED_COLS`
+        """
+        codes, categories = encoded or self._category_codes(df[column])
+        code_a, code_b = categories.get_indexer([value_a, value_b])
+        # A value absent from the column (-1) must not match missing rows
+        mask_a = codes == code_a if code_a >= 0 else np.zeros(len(df), dtype=bool)
+        mask_b = codes == code_b if code_b >= 0 else np.zeros(len(df), dtype=bool)
+        if return_indices:
+            return np.flatnonzero(mask_a), np.flatnonzero(mask_b)
+        cols = [column] + [
+            col for col in self.REQUIRED_COLS if col in df.columns and col != column
+        ]
+        # Boolean .loc already returns new frames; no extra copy needed
+        return df.loc[mask_a, cols], df.loc[mask_b, cols]
+
     def create_province_groups(
-        self, df: pd.DataFrame, min_samples: int = 100
-    ) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, int]]:
+        self, df: pd.DataFrame, min_samples: int = 100, return_indices: bool = False
+    ) -> Tuple[Group, Group, Dict[str, int]]:
         """
         Create A/B groups for province comparison.
 
@@ -36,45 +154,40 @@ class DataSegmentation:
         Args:
             df: DataFrame with insurance data
             min_samples: Minimum number of samples per province
+            return_indices: Return positional row indices into *df* instead of
+                DataFrames
 
         Returns:
             Tuple of (group_a_df, group_b_df, group_info)
         """
-        # Count samples per province
-        province_counts = df["Province"].value_counts()
-        valid_provinces = province_counts[province_counts >= min_samples].index.tolist()
-
-        if len(valid_provinces) < 2:
-            self.logger.warning(
-                f"Only {len(valid_provinces)} provinces meet minimum sample size. "
-                f"Using all available provinces."
-            )
-            valid_provinces = province_counts.index.tolist()[:2]
-
-        # Select two provinces with largest sample sizes
-        selected_provinces = valid_provinces[:2]
-        province_a, province_b = selected_provinces[0], selected_provinces[1]
+        # Select the two provinces with the largest sample sizes
+        encoded = self._category_codes(df["Province"])
+        province_a, province_b = self._top_two_valid_categories(
+            *encoded, min_samples, "provinces"
+        )
 
-        group_a = df[df["Province"] == province_a].copy()
-        group_b = df[df["Province"] == province_b].copy()
+        group_a, group_b = self._select_groups(
+            df, "Province", province_a, province_b, return_indices, encoded
+        )
 
+        size_a, size_b = len(group_a), len(group_b)
         group_info = {
             "group_a_name": province_a,
             "group_b_name": province_b,
-            "group_a_size": len(group_a),
-            "group_b_size": len(group_b),
+            "group_a_size": size_a,
+            "group_b_size": size_b,
         }
 
         self.logger.info(
-            f"Created province groups: {province_a} (n={len(group_a)}) vs "
-            f"{province_b} (n={len(group_b)})"
+            f"Created province groups: {province_a} (n={size_a}) vs "
+            f"{province_b} (n={size_b})"
         )
 
         return group_a, group_b, group_info
 
     def create_zipcode_groups(
-        self, df: pd.DataFrame, min_samples: int = 50
-    ) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, int]]:
+        self, df: pd.DataFrame, min_samples: int = 50, return_indices: bool = False
+    ) -> Tuple[Group, Group, Dict[str, int]]:
         """
         Create A/B groups for zip code comparison.
 
@@ -83,87 +196,74 @@ class DataSegmentation:
         Args:
             df: DataFrame with insurance data
             min_samples: Minimum number of samples per zip code
+            return_indices: Return positional row indices into *df* instead of
+                DataFrames
 
         Returns:
             Tuple of (group_a_df, group_b_df, group_info)
         """
-        # Count samples per zip code
-        zipcode_counts = df["PostalCode"].value_counts()
-        valid_zipcodes = zipcode_counts[zipcode_counts >= min_samples].index.tolist()
-
-        if len(valid_zipcodes) < 2:
-            self.logger.warning(
-                f"Only {len(valid_zipcodes)} zip codes meet minimum sample size. "
-                f"Using all available zip codes."
-            )
-            valid_zipcodes = zipcode_counts.index.tolist()[:2]
-
-        # Select two zip codes with largest sample sizes
-        selected_zipcodes = valid_zipcodes[:2]
-        zipcode_a, zipcode_b = selected_zipcodes[0], selected_zipcodes[1]
+        # Select the two zip codes with the largest sample sizes
+        encoded = self._category_codes(df["PostalCode"])
+        zipcode_a, zipcode_b = self._top_two_valid_categories(
+            *encoded, min_samples, "zip codes"
+        )
 
-        group_a = df[df["PostalCode"] == zipcode_a].copy()
-        group_b = df[df["PostalCode"] == zipcode_b].copy()
+        group_a, group_b = self._select_groups(
+            df, "PostalCode", zipcode_a, zipcode_b, return_indices, encoded
+        )
 
+        size_a, size_b = len(group_a), len(group_b)
         group_info = {
             "group_a_name": str(zipcode_a),
             "group_b_name": str(zipcode_b),
-            "group_a_size": len(group_a),
-            "group_b_size": len(group_b),
+            "group_a_size": size_a,
+            "group_b_size": size_b,
         }
 
         self.logger.info(
-            f"Created zip code groups: {zipcode_a} (n={len(group_a)}) vs "
-            f"{zipcode_b} (n={len(group_b)})"
+            f"Created zip code groups: {zipcode_a} (n={size_a}) vs "
+            f"{zipcode_b} (n={size_b})"
         )
 
         return group_a, group_b, group_info
 
     def create_gender_groups(
-        self, df: pd.DataFrame, min_samples: int = 100
-    ) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, int]]:
+        self, df: pd.DataFrame, min_samples: int = 100, return_indices: bool = False
+    ) -> Tuple[Group, Group, Dict[str, int]]:
         """
         Create A/B groups for gender comparison.
 
         Args:
             df: DataFrame with insurance data
             min_samples: Minimum number of samples per gender
+            return_indices: Return positional row indices into *df* instead of
+                DataFrames
 
         Returns:
             Tuple of (group_a_df, group_b_df, group_info)
         """
-        # Filter out 'Not specified' or missing genders
-        gender_df = df[df["Gender"].notna()].copy()
-        gender_df = gender_df[gender_df["Gender"] != "Not specified"]
-
-        # Get gender counts
-        gender_counts = gender_df["Gender"].value_counts()
-        valid_genders = gender_counts[gender_counts >= min_samples].index.tolist()
-
-        if len(valid_genders) < 2:
-            self.logger.warning(
-                f"Only {len(valid_genders)} genders meet minimum sample size. "
-                f"Using all available genders."
-            )
-            valid_genders = gender_counts.index.tolist()[:2]
-
-        # Select two genders (typically Male and Female)
-        selected_genders = valid_genders[:2]
-        gender_a, gender_b = selected_genders[0], selected_genders[1]
+        # Select two genders (typically Male and Female), ignoring missing
+        # and 'Not specified' values
+        encoded = self._category_codes(df["Gender"])
+        gender_a, gender_b = self._top_two_valid_categories(
+            *encoded, min_samples, "genders", exclude=("Not specified",)
+        )
 
-        group_a = gender_df[gender_df["Gender"] == gender_a].copy()
-        group_b = gender_df[gender_df["Gender"] == gender_b].copy()
+        group_a, group_b = self._select_groups(
+            df, "Gender", gender_a, gender_b, return_indices, encoded
+        )
 
+        size_a, size_b = len(group_a), len(group_b)
         group_info = {
             "group_a_name": gender_a,
             "group_b_name": gender_b,
-            "group_a_size": len(group_a),
-            "group_b_size": len(group_b),
+            "group_a_size": size_a,
+            "group_b_size": size_b,
         }
 
         self.logger.info(
-            f"Created gender groups: {gender_a} (n={len(group_a)}) vs "
-            f"{gender_b} (n={len(group_b)})"
+            f"Created gender groups: {gender_a} (n={size_a}) vs "
+            f"{gender_b} (n={size_b})"
         )
 
         return group_a, group_b, group_info
@@ -186,25 +286,23 @@ class DataSegmentation:
             Tuple of balanced DataFrames
         """
         size_a, size_b = len(group_a), len(group_b)
+        # A fresh generator per call keeps the result independent of call order
+        rng = np.random.default_rng(self.random_seed)
 
         if method == "undersample":
             # Undersample the larger group
             min_size = min(size_a, size_b)
             if size_a > size_b:
-                group_a = group_a.sample(n=min_size, random_state=self.random_seed)
+                group_a = group_a.take(rng.choice(size_a, min_size, replace=False))
             elif size_b > size_a:
-                group_b = group_b.sample(n=min_size, random_state=self.random_seed)
+                group_b = group_b.take(rng.choice(size_b, min_size, replace=False))
         elif method == "oversample":
             # Oversample the smaller group (with replacement)
             max_size = max(size_a, size_b)
             if size_a < size_b:
-                group_a = group_a.sample(
-                    n=max_size, replace=True, random_state=self.random_seed
-                )
+                group_a = group_a.take(rng.choice(size_a, max_size, replace=True))
             elif size_b < size_a:
-                group_b = group_b.sample(
-                    n=max_size, replace=True, random_state=self.random_seed
-                )
+                group_b = group_b.take(rng.choice(size_b, max_size, replace=True))
 
         self.logger.info(
             f"Balanced groups: Group A (n={len(group_a)}) vs Group B (n={len(group_b)})"
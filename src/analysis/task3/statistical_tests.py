@@ -1,15 +1,60 @@
 """Statistical hypothesis testing utilities."""
 
-from typing import Dict, Optional, Tuple
+from typing import Dict, Tuple, Union
 
 import numpy as np
 import pandas as pd
 from scipy import stats
 
+from src.analysis.task3._kernels import mannwhitney_asymptotic
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+ArrayLike = Union[pd.Series, np.ndarray]
+
+# Combined sample size from which Mann-Whitney uses the compiled kernel.
+# Groups of 8 or fewer stay on SciPy, which may use the exact distribution.
+MWU_KERNEL_MIN_SIZE = 1000
+
+# Above this size the D'Agostino-Pearson test is used instead of Shapiro-Wilk.
+# Its skewness/kurtosis approximations are good from a few hundred samples,
+# it runs in one pass over the data, and Shapiro-Wilk p-values become
+# unreliable beyond 5000 samples anyway.
+SHAPIRO_MAX_SAMPLES = 500
+
+
+def _drop_missing(data: ArrayLike) -> np.ndarray:
+    """Return *data* as a NumPy array with NaN values removed.
+
+    Floating-point input is upcast to float64: columns may be stored as
+    float32, but rank sums and moments over ~1M rows need double precision.
+    Series with missing values, including nullable and Arrow-backed ones
+    holding ``pd.NA``, are converted to float64 with the missing values as NaN.
+    """
+    if isinstance(data, pd.Series) and data.hasnans:
+        values = data.to_numpy(dtype=np.float64, na_value=np.nan)
+        return values[~np.isnan(values)]
+    values = np.asarray(data)
+    if values.dtype.kind not in "biu":
+        values = values.astype(np.float64, copy=False)
+        values = values[~np.isnan(values)]
+    return values
+
+
+def _binary_counts(values: np.ndarray) -> Tuple[int, int]:
+    """Return (number of values, number of ones) of a 0/1 indicator array.
+
+    Raises:
+        ValueError: If *values* contains anything other than 0 and 1
+    """
+    if values.dtype == np.bool_:
+        return values.size, int(np.count_nonzero(values))
+    ones = int(np.count_nonzero(values == 1))
+    if ones + np.count_nonzero(values == 0) != values.size:
+        raise ValueError("chi_square_test requires binary (0/1) input")
+    return values.size, ones
+
 
 class StatisticalTester:
     """Perform statistical hypothesis tests for insurance risk analysis."""
@@ -24,10 +69,13 @@ class StatisticalTester:
         self.logger = logger
         self.alpha = alpha
 
-    def check_normality(self, data: pd.Series, test: str = "shapiro") -> Dict:
+    def check_normality(self, data: ArrayLike, test: str = "shapiro") -> Dict:
         """
         Check if data follows normal distribution.
 
+        Samples larger than ``SHAPIRO_MAX_SAMPLES`` use the D'Agostino-Pearson
+        test even when Shapiro-Wilk is requested.
+
         Args:
             data: Data series to test
             test: Test to use ('shapiro' or 'normaltest')
@@ -35,19 +83,19 @@ class StatisticalTester:
         Returns:
             Dictionary with test results
         """
-        data_clean = data.dropna()
+        return self._normality_test(_drop_missing(data), test)
 
+    def _normality_test(self, data_clean: np.ndarray, test: str) -> Dict:
+        """Run the normality test on a NaN-free sample."""
         if len(data_clean) < 3:
             return {"is_normal": False, "p_value": 1.0, "test": test}
 
+        if test == "shapiro" and len(data_clean) > SHAPIRO_MAX_SAMPLES:
+            test = "normaltest"
+
         if test == "shapiro":
             # Shapiro-Wilk test (works well for small samples)
-            if len(data_clean) > 5000:
-                # Sample for large datasets
-                data_sample = data_clean.sample(n=5000, random_state=42)
-            else:
-                data_sample = data_clean
-            stat, p_value = stats.shapiro(data_sample)
+            stat, p_value = stats.shapiro(data_clean)
         else:
             # D'Agostino and Pearson's normality test
             stat, p_value = stats.normaltest(data_clean)
@@ -62,7 +110,7 @@ class StatisticalTester:
         }
 
     def t_test(
-        self, group_a: pd.Series, group_b: pd.Series, equal_var: bool = True
+        self, group_a: ArrayLike, group_b: ArrayLike, equal_var: bool = True
     ) -> Dict:
         """
         Perform independent samples t-test.
@@ -75,9 +123,14 @@ class StatisticalTester:
         Returns:
             Dictionary with test results
         """
-        group_a_clean = group_a.dropna()
-        group_b_clean = group_b.dropna()
+        return self._t_test_clean(
+            _drop_missing(group_a), _drop_missing(group_b), equal_var
+        )
 
+    def _t_test_clean(
+        self, group_a_clean: np.ndarray, group_b_clean: np.ndarray, equal_var: bool
+    ) -> Dict:
+        """Run the t-test on NaN-free samples."""
         if len(group_a_clean) < 2 or len(group_b_clean) < 2:
             self.logger.warning("Insufficient data for t-test")
             return {
@@ -89,13 +142,18 @@ class StatisticalTester:
                 "mean_b": np.nan,
             }
 
-        # Perform t-test
-        stat, p_value = stats.ttest_ind(
-            group_a_clean, group_b_clean, equal_var=equal_var
-        )
-
+        # Each group is reduced once; the t-test is computed from these
+        # moments rather than having ttest_ind recompute them
+        n_a, n_b = len(group_a_clean), len(group_b_clean)
         mean_a = group_a_clean.mean()
         mean_b = group_b_clean.mean()
+        std_a = group_a_clean.std(ddof=1)
+        std_b = group_b_clean.std(ddof=1)
+
+        # Perform t-test
+        stat, p_value = stats.ttest_ind_from_stats(
+            mean_a, std_a, n_a, mean_b, std_b, n_b, equal_var=equal_var
+        )
 
         reject_null = p_value < self.alpha
 
@@ -106,20 +164,23 @@ class StatisticalTester:
             "reject_null": reject_null,
             "mean_a": mean_a,
             "mean_b": mean_b,
-            "std_a": group_a_clean.std(),
-            "std_b": group_b_clean.std(),
-            "n_a": len(group_a_clean),
-            "n_b": len(group_b_clean),
+            "std_a": std_a,
+            "std_b": std_b,
+            "n_a": n_a,
+            "n_b": n_b,
         }
 
         self.logger.info(
-            f"T-test: p-value={p_value:.4f}, reject H0={reject_null}, "
-            f"mean_a={mean_a:.2f}, mean_b={mean_b:.2f}"
+            "T-test: p-value={:.4f}, reject H0={}, mean_a={:.2f}, mean_b={:.2f}",
+            p_value,
+            reject_null,
+            mean_a,
+            mean_b,
         )
 
         return result
 
-    def mannwhitney_u_test(self, group_a: pd.Series, group_b: pd.Series) -> Dict:
+    def mannwhitney_u_test(self, group_a: ArrayLike, group_b: ArrayLike) -> Dict:
         """
         Perform Mann-Whitney U test (non-parametric alternative to t-test).
 
@@ -130,9 +191,12 @@ class StatisticalTester:
         Returns:
             Dictionary with test results
         """
-        group_a_clean = group_a.dropna()
-        group_b_clean = group_b.dropna()
+        return self._mannwhitney_clean(_drop_missing(group_a), _drop_missing(group_b))
 
+    def _mannwhitney_clean(
+        self, group_a_clean: np.ndarray, group_b_clean: np.ndarray
+    ) -> Dict:
+        """Run the Mann-Whitney U test on NaN-free samples."""
         if len(group_a_clean) < 2 or len(group_b_clean) < 2:
             self.logger.warning("Insufficient data for Mann-Whitney U test")
             return {
@@ -144,13 +208,21 @@ class StatisticalTester:
                 "median_b": np.nan,
             }
 
-        # Perform Mann-Whitney U test
-        stat, p_value = stats.mannwhitneyu(
-            group_a_clean, group_b_clean, alternative="two-sided"
-        )
+        # Perform Mann-Whitney U test; large samples always use the normal
+        # approximation, which the compiled kernel computes directly
+        kernel_result = None
+        n_a, n_b = len(group_a_clean), len(group_b_clean)
+        if n_a + n_b > MWU_KERNEL_MIN_SIZE and min(n_a, n_b) > 8:
+            kernel_result = mannwhitney_asymptotic(group_a_clean, group_b_clean)
+        if kernel_result is not None:
+            stat, p_value = kernel_result
+        else:
+            stat, p_value = stats.mannwhitneyu(
+                group_a_clean, group_b_clean, alternative="two-sided"
+            )
 
-        median_a = group_a_clean.median()
-        median_b = group_b_clean.median()
+        median_a = np.median(group_a_clean)
+        median_b = np.median(group_b_clean)
 
         reject_null = p_value < self.alpha
 
@@ -166,13 +238,17 @@ class StatisticalTester:
         }
 
         self.logger.info(
-            f"Mann-Whitney U test: p-value={p_value:.4f}, reject H0={reject_null}, "
-            f"median_a={median_a:.2f}, median_b={median_b:.2f}"
+            "Mann-Whitney U test: p-value={:.4f}, reject H0={}, "
+            "median_a={:.2f}, median_b={:.2f}",
+            p_value,
+            reject_null,
+            median_a,
+            median_b,
         )
 
         return result
 
-    def chi_square_test(self, group_a: pd.Series, group_b: pd.Series) -> Dict:
+    def chi_square_test(self, group_a: ArrayLike, group_b: ArrayLike) -> Dict:
         """
         Perform chi-square test for categorical frequency differences.
 
@@ -182,39 +258,36 @@ class StatisticalTester:
 
         Returns:
             Dictionary with test results
+
+        Raises:
+            ValueError: If either group contains values other than 0 and 1
         """
-        # Create contingency table: rows = groups, columns = claim status (0 vs 1)
-        group_a_clean = group_a.dropna()
-        group_b_clean = group_b.dropna()
-
-        # Count claims (1) and no claims (0) for each group
-        contingency_data = {
-            "Group A": [
-                (group_a_clean == 0).sum(),  # No claims
-                (group_a_clean == 1).sum(),  # Claims
-            ],
-            "Group B": [
-                (group_b_clean == 0).sum(),  # No claims
-                (group_b_clean == 1).sum(),  # Claims
-            ],
-        }
-        contingency = pd.DataFrame(
-            contingency_data,
-            index=["No Claim", "Claim"],
-        ).T
+        n1, k1 = _binary_counts(_drop_missing(group_a))
+        n2, k2 = _binary_counts(_drop_missing(group_b))
+        return self.test_proportion(n1=n1, k1=k1, n2=n2, k2=k2)
 
-        if contingency.shape[0] < 2 or contingency.shape[1] < 2:
-            self.logger.warning("Insufficient data for chi-square test")
-            return {
-                "test_type": "chi_square",
-                "statistic": np.nan,
-                "p_value": 1.0,
-                "reject_null": False,
-            }
+    def test_proportion(self, n1: int, k1: int, n2: int, k2: int) -> Dict:
+        """
+        Perform chi-square test for a difference in claim proportions.
+
+        Works on precomputed counts, so callers only need two reductions per
+        group instead of materialising claim-indicator arrays.
+
+        Args:
+            n1: Number of policies in group A
+            k1: Number of policies with claims in group A
+            n2: Number of policies in group B
+            k2: Number of policies with claims in group B
 
-        # Check for zero frequencies in all cells
-        if (contingency == 0).all().all():
-            self.logger.warning("All contingency table cells are zero")
+        Returns:
+            Dictionary with test results
+        """
+        # Contingency table: rows = groups, columns = claim status
+        contingency = np.array([[n1 - k1, k1], [n2 - k2, k2]])
+
+        # An empty row or column leaves the expected frequencies undefined
+        if min(n1, n2) == 0 or k1 + k2 == 0 or k1 + k2 == n1 + n2:
+            self.logger.warning("Insufficient data for chi-square test")
             return {
                 "test_type": "chi_square",
                 "statistic": np.nan,
@@ -232,20 +305,24 @@ class StatisticalTester:
             "statistic": stat,
             "p_value": p_value,
             "reject_null": reject_null,
-            "contingency_table": contingency,
+            # Same column -> row mapping as ``DataFrame.to_dict()``
+            "contingency_table": {
+                "No Claim": {"Group A": n1 - k1, "Group B": n2 - k2},
+                "Claim": {"Group A": k1, "Group B": k2},
+            },
             "expected_frequencies": expected,
         }
 
         self.logger.info(
-            f"Chi-square test: p-value={p_value:.4f}, reject H0={reject_null}"
+            "Chi-square test: p-value={:.4f}, reject H0={}", p_value, reject_null
         )
 
         return result
 
     def test_difference(
         self,
-        group_a: pd.Series,
-        group_b: pd.Series,
+        group_a: ArrayLike,
+        group_b: ArrayLike,
         metric_type: str = "continuous",
         use_nonparametric: bool = False,
     ) -> Dict:
@@ -264,19 +341,22 @@ class StatisticalTester:
         if metric_type == "categorical":
             return self.chi_square_test(group_a, group_b)
         else:
+            # Drop missing values once for the normality checks and the test
+            clean_a = _drop_missing(group_a)
+            clean_b = _drop_missing(group_b)
             if use_nonparametric:
-                return self.mannwhitney_u_test(group_a, group_b)
+                return self._mannwhitney_clean(clean_a, clean_b)
             else:
                 # Check normality
-                norm_a = self.check_normality(group_a)
-                norm_b = self.check_normality(group_b)
+                norm_a = self._normality_test(clean_a, "shapiro")
+                norm_b = self._normality_test(clean_b, "shapiro")
 
                 # Use parametric test if both groups are normal
                 if norm_a["is_normal"] and norm_b["is_normal"]:
-                    return self.t_test(group_a, group_b)
+                    return self._t_test_clean(clean_a, clean_b, equal_var=True)
                 else:
                     # Use non-parametric test if data is not normal
                     self.logger.info(
                         "Data not normally distributed, using Mann-Whitney U test"
                     )
-                    return self.mannwhitney_u_test(group_a, group_b)
+                    return self._mannwhitney_clean(clean_a, clean_b)
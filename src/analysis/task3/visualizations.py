@@ -1,4 +1,10 @@
-"""Visualization utilities for Task 3 statistical analysis."""
+"""Visualization utilities for Task 3 statistical analysis.
+
+Figures are built as standalone ``matplotlib.figure.Figure`` objects rather
+than through ``pyplot``. Saving them renders with Agg directly, so headless
+runs never resolve or start a GUI backend, and no global figure state has
+to be closed afterwards.
+"""
 
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -7,6 +13,7 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import seaborn as sns
+from matplotlib.figure import Figure
 
 from src.utils.logger import get_logger
 
@@ -17,6 +24,41 @@ sns.set_style("whitegrid")
 plt.rcParams["figure.figsize"] = (12, 6)
 
 
+def _summarize(data: pd.Series) -> Dict[str, float]:
+    """
+    Summary statistics of a sample with missing values dropped once.
+
+    Works on the underlying array: ``np.median`` uses a partial sort
+    (introselect) rather than sorting the whole sample.
+
+    Args:
+        data: Sample values
+
+    Returns:
+        Dictionary with Mean, Median, Std (ddof=1), Min, Max and Count
+    """
+    values = np.asarray(data, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    n = values.size
+    if n == 0:
+        return {
+            "Mean": np.nan,
+            "Median": np.nan,
+            "Std": np.nan,
+            "Min": np.nan,
+            "Max": np.nan,
+            "Count": 0,
+        }
+    return {
+        "Mean": values.mean(),
+        "Median": np.median(values),
+        "Std": values.std(ddof=1) if n > 1 else np.nan,
+        "Min": values.min(),
+        "Max": values.max(),
+        "Count": n,
+    }
+
+
 class VisualizationGenerator:
     """Generate visualizations for hypothesis testing results."""
 
@@ -51,42 +93,43 @@ class VisualizationGenerator:
             group_b_name: Name of group B
             filename: Output filename
         """
-        fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+        fig = Figure(figsize=(14, 6))
+        axes = fig.subplots(1, 2)
+
+        # Drop missing values once for both panels
+        values_a = np.asarray(group_a_data, dtype=np.float64)
+        values_a = values_a[~np.isnan(values_a)]
+        values_b = np.asarray(group_b_data, dtype=np.float64)
+        values_b = values_b[~np.isnan(values_b)]
+        samples = [(values_a, group_a_name), (values_b, group_b_name)]
 
         # Box plot
         ax1 = axes[0]
-        data_to_plot = [group_a_data.dropna(), group_b_data.dropna()]
-        bp = ax1.boxplot(data_to_plot, labels=[group_a_name, group_b_name])
+        bp = ax1.boxplot([values_a, values_b])
+        ax1.set_xticks([1, 2], [group_a_name, group_b_name])
         ax1.set_title(f"{metric_name} Comparison (Box Plot)")
         ax1.set_ylabel(metric_name)
         ax1.grid(True, alpha=0.3)
 
-        # Histogram
+        # Histogram on bin edges shared by both groups
         ax2 = axes[1]
-        ax2.hist(
-            group_a_data.dropna(),
-            alpha=0.6,
-            label=group_a_name,
-            bins=30,
-            density=True,
-        )
-        ax2.hist(
-            group_b_data.dropna(),
-            alpha=0.6,
-            label=group_b_name,
-            bins=30,
-            density=True,
-        )
+        non_empty = [(values, name) for values, name in samples if values.size]
+        if non_empty:
+            lo = min(values.min() for values, _ in non_empty)
+            hi = max(values.max() for values, _ in non_empty)
+            edges = np.histogram_bin_edges(non_empty[0][0], bins=30, range=(lo, hi))
+            for values, name in non_empty:
+                density, _ = np.histogram(values, bins=edges, density=True)
+                ax2.stairs(density, edges, fill=True, alpha=0.6, label=name)
         ax2.set_title(f"{metric_name} Distribution Comparison")
         ax2.set_xlabel(metric_name)
         ax2.set_ylabel("Density")
         ax2.legend()
         ax2.grid(True, alpha=0.3)
 
-        plt.tight_layout()
+        fig.tight_layout()
         output_file = self.output_path / filename
-        plt.savefig(output_file, dpi=300, bbox_inches="tight")
-        plt.close()
+        fig.savefig(output_file, dpi=300, bbox_inches="tight")
 
         self.logger.info(f"Saved visualization to {output_file}")
 
@@ -103,48 +146,52 @@ class VisualizationGenerator:
             filename: Output filename
         """
         # Extract p-values and test names
-        test_names = []
-        p_values = []
-        rejections = []
-
-        for i, result in enumerate(results):
-            hypothesis_name = result["hypothesis"].split(":")[0]
-            for test_name, test_result in result["tests"].items():
-                if "p_value" in test_result:
-                    test_names.append(f"H{i+1}: {test_name}")
-                    p_values.append(test_result["p_value"])
-                    rejections.append(test_result.get("reject_null", False))
+        entries = [
+            (f"H{i+1}: {test_name}", test_result)
+            for i, result in enumerate(results)
+            for test_name, test_result in result["tests"].items()
+            if "p_value" in test_result
+        ]
+        test_names = [name for name, _ in entries]
+        p_values = np.fromiter(
+            (test_result["p_value"] for _, test_result in entries),
+            dtype=np.float64,
+            count=len(entries),
+        )
+        rejections = np.fromiter(
+            (bool(test_result.get("reject_null", False)) for _, test_result in entries),
+            dtype=np.bool_,
+            count=len(entries),
+        )
 
         # Create figure
-        fig, ax = plt.subplots(figsize=(14, 8))
+        fig = Figure(figsize=(14, 8))
+        ax = fig.subplots()
 
         # Bar plot of p-values
-        colors = ["red" if reject else "green" for reject in rejections]
+        colors = np.where(rejections, "red", "green")
         bars = ax.barh(test_names, p_values, color=colors, alpha=0.7)
 
         # Add significance line
         ax.axvline(x=0.05, color="red", linestyle="--", linewidth=2, label="α = 0.05")
 
-        # Add value labels
-        for i, (bar, p_val) in enumerate(zip(bars, p_values)):
-            ax.text(
-                p_val + 0.01,
-                i,
-                f"{p_val:.4f}",
-                va="center",
-                fontweight="bold" if rejections[i] else "normal",
-            )
+        # Add value labels in one call; rejected tests are shown in bold
+        labels = ax.bar_label(
+            bars, labels=[f"{p_val:.4f}" for p_val in p_values], padding=3
+        )
+        for label, reject in zip(labels, rejections):
+            if reject:
+                label.set_fontweight("bold")
 
         ax.set_xlabel("P-value", fontsize=12)
         ax.set_title("Hypothesis Test Results Summary", fontsize=14, fontweight="bold")
-        ax.set_xlim(0, max(p_values) * 1.2)
+        ax.set_xlim(0, p_values.max() * 1.2)
         ax.legend()
         ax.grid(True, alpha=0.3, axis="x")
 
-        plt.tight_layout()
+        fig.tight_layout()
         output_file = self.output_path / filename
-        plt.savefig(output_file, dpi=300, bbox_inches="tight")
-        plt.close()
+        fig.savefig(output_file, dpi=300, bbox_inches="tight")
 
         self.logger.info(f"Saved summary visualization to {output_file}")
 
@@ -169,23 +216,8 @@ class VisualizationGenerator:
             filename: Output filename
         """
         # Calculate summary statistics
-        stats_a = {
-            "Mean": group_a_data.mean(),
-            "Median": group_a_data.median(),
-            "Std": group_a_data.std(),
-            "Min": group_a_data.min(),
-            "Max": group_a_data.max(),
-            "Count": len(group_a_data.dropna()),
-        }
-
-        stats_b = {
-            "Mean": group_b_data.mean(),
-            "Median": group_b_data.median(),
-            "Std": group_b_data.std(),
-            "Min": group_b_data.min(),
-            "Max": group_b_data.max(),
-            "Count": len(group_b_data.dropna()),
-        }
+        stats_a = _summarize(group_a_data)
+        stats_b = _summarize(group_b_data)
 
         # Create DataFrame
         stats_df = pd.DataFrame(
@@ -196,7 +228,8 @@ class VisualizationGenerator:
         )
 
         # Create visualization
-        fig, ax = plt.subplots(figsize=(10, 6))
+        fig = Figure(figsize=(10, 6))
+        ax = fig.subplots()
         ax.axis("tight")
         ax.axis("off")
 
@@ -217,16 +250,15 @@ class VisualizationGenerator:
             table[(0, i)].set_facecolor("#4CAF50")
             table[(0, i)].set_text_props(weight="bold", color="white")
 
-        plt.title(
+        ax.set_title(
             f"{metric_name} - Summary Statistics",
             fontsize=14,
             fontweight="bold",
             pad=20,
         )
-        plt.tight_layout()
+        fig.tight_layout()
 
         output_file = self.output_path / filename
-        plt.savefig(output_file, dpi=300, bbox_inches="tight")
-        plt.close()
+        fig.savefig(output_file, dpi=300, bbox_inches="tight")
 
         self.logger.info(f"Saved statistics table to {output_file}")
@@ -1,18 +1,174 @@
 """Data preparation pipeline for Task 4 predictive modeling."""
 
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
+from scipy import sparse
+from sklearn.feature_extraction import FeatureHasher
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder, OneHotEncoder, StandardScaler
+from sklearn.preprocessing import LabelEncoder, StandardScaler
 
-from src.data.loaders import DataLoader
+try:
+    import polars as pl
+
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
+from src.analysis.task4._kernels import claim_features
+from src.data.loaders import INSURANCE_COLUMN_TYPES, DataLoader
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Columns with more levels than this are binary-coded instead of one-hot
+ONEHOT_MAX_CARDINALITY: int = 50
+# Columns with more levels than this are hashed into HASH_N_FEATURES columns
+HASHING_MIN_CARDINALITY: int = 5000
+HASH_N_FEATURES: int = 32
+# Rows parsed per chunk by load_data; bounds the rows held as Python strings
+LOAD_CHUNK_SIZE: int = 500_000
+# Right-closed age bins for AgeGroup and their labels
+AGE_BINS: np.ndarray = np.array([0, 25, 35, 45, 55, 65, 100])
+AGE_GROUP_LABELS: List[str] = ["18-25", "26-35", "36-45", "46-55", "56-65", "65+"]
+# Targets and target-derived columns, never used as model features
+TARGET_DERIVED_COLUMNS: List[str] = [
+    "TotalClaims",
+    "TotalPremium",
+    "HasClaim",
+    "LossRatio",
+    "ClaimSeverity",
+    "ProfitMargin",
+]
+# Explicit column types for the Arrow reader: the shared loader types, with
+# the monetary columns kept at float64 for modelling
+TASK4_COLUMN_TYPES: Dict[str, Any] = {
+    **INSURANCE_COLUMN_TYPES,
+    "TotalPremium": np.float64,
+    "TotalClaims": np.float64,
+}
+
+
+def _strings_to_categories(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert the object columns of *df* to categoricals in place.
+
+    Categoricals read from Arrow dictionaries list their categories in order
+    of appearance; they are sorted, as ``astype("category")`` does.
+    """
+    for col in df.select_dtypes(include=["object", "category"]).columns:
+        if df[col].dtype == "object":
+            df[col] = df[col].astype("category")
+        elif not df[col].cat.categories.is_monotonic_increasing:
+            df[col] = df[col].cat.reorder_categories(
+                df[col].cat.categories.sort_values()
+            )
+    return df
+
+
+def _concat_chunks(chunks: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate row chunks, keeping categorical columns categorical.
+
+    Each chunk has its own categories; they are unified first, since
+    ``pd.concat`` falls back to object for categoricals that differ.
+
+    Args:
+        chunks: Frames with the same columns
+
+    Returns:
+        Concatenated DataFrame with a fresh RangeIndex
+    """
+    if len(chunks) == 1:
+        return chunks[0]
+    for col in chunks[0].columns:
+        is_categorical = [
+            isinstance(chunk[col].dtype, pd.CategoricalDtype) for chunk in chunks
+        ]
+        if not any(is_categorical):
+            continue
+        # A column parsed as numbers in some chunks and strings in others is
+        # a string column, as it would be when parsed in one pass
+        for chunk, categorical in zip(chunks, is_categorical):
+            if not categorical and chunk[col].notna().any():
+                values = chunk[col]
+                chunk[col] = values.astype(str).where(values.notna()).astype("category")
+        categories = [
+            chunk[col].cat.categories
+            for chunk in chunks
+            if isinstance(chunk[col].dtype, pd.CategoricalDtype)
+        ]
+        # Sorted, as ``astype("category")`` orders them for a single frame
+        levels = categories[0].append(categories[1:]).unique().sort_values()
+        dtype = pd.CategoricalDtype(levels)
+        for chunk in chunks:
+            chunk[col] = chunk[col].astype(dtype)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def _age_groups(age: np.ndarray) -> pd.Categorical:
+    """
+    Bin ages into ``AGE_GROUP_LABELS``, as ``pd.cut(age, AGE_BINS)`` does.
+
+    Bins are closed on the right; ages outside them or missing get no group.
+
+    Args:
+        age: Age per policy
+
+    Returns:
+        Ordered categorical of age groups
+    """
+    codes = np.searchsorted(AGE_BINS, age, side="left") - 1
+    codes[(codes < 0) | (codes >= len(AGE_GROUP_LABELS))] = -1
+    return pd.Categorical.from_codes(codes, AGE_GROUP_LABELS, ordered=True)
+
+
+def _postal_code_prefix(postal_code: pd.Series) -> pd.Categorical:
+    """
+    First three characters of each postal code, as a categorical.
+
+    Only the distinct postal codes are converted to strings and sliced; rows
+    pick up their prefix through the factorized codes.
+
+    Args:
+        postal_code: PostalCode column
+
+    Returns:
+        Categorical equal to ``postal_code.astype(str).str[:3]``
+    """
+    codes, uniques = pd.factorize(postal_code, use_na_sentinel=False)
+    prefixes = pd.Categorical(pd.Index(uniques).astype(str).str[:3])
+    return pd.Categorical.from_codes(prefixes.codes[codes], prefixes.categories)
+
+
+def _string_codes(values: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """
+    Integer codes and string levels of a column, as ``values.astype(str)``.
+
+    Categorical columns reuse their codes, so only the distinct levels are
+    converted to strings; missing values become the level ``"nan"``.
+
+    Args:
+        values: Column to encode
+
+    Returns:
+        Tuple of (code per row, string level per code)
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.cat.remove_unused_categories()
+        codes = values.cat.codes.to_numpy()
+        levels = values.cat.categories.astype(str)
+    else:
+        codes, levels = pd.factorize(values.astype(str))
+        levels = pd.Index(levels)
+    if (codes < 0).any():
+        codes = np.where(codes < 0, len(levels), codes)
+        levels = levels.append(pd.Index(["nan"]))
+    return codes, levels
+
 
 class DataPreprocessor:
     """Data preprocessing pipeline for predictive modeling."""
@@ -39,27 +195,60 @@ class DataPreprocessor:
 
         # Encoders and scalers (fitted during preprocessing)
         self.label_encoders: Dict[str, LabelEncoder] = {}
-        self.onehot_encoders: Dict[str, OneHotEncoder] = {}
+        self.onehot_encoders: Dict[str, pd.Index] = {}
+        self.binary_encoders: Dict[str, pd.Index] = {}
+        self.hash_encoders: Dict[str, FeatureHasher] = {}
         self.scaler = StandardScaler()
         self.feature_names: List[str] = []
 
-    def load_data(self, filename: str = "MachineLearningRating_v3.txt") -> pd.DataFrame:
+    def load_data(
+        self,
+        filename: str = "MachineLearningRating_v3.txt",
+        chunksize: Optional[int] = LOAD_CHUNK_SIZE,
+        engine: str = "pyarrow",
+    ) -> pd.DataFrame:
         """
         Load the insurance dataset.
 
+        String columns are stored as categoricals: one code per row plus the
+        distinct levels, which the encoders below work on directly. The
+        PyArrow engine parses the file in parallel with the column types in
+        ``TASK4_COLUMN_TYPES``; its categorical columns are dictionary-encoded
+        while parsing. With the pandas engine and ``chunksize``, the file is
+        parsed in chunks that are converted as they are read, so only one
+        chunk is ever held as Python strings.
+
         Args:
             filename: Name of the data file
+            chunksize: Rows per parsed chunk for the pandas engine, or None to
+                parse in one pass
+            engine: 'pyarrow' or 'pandas'
 
         Returns:
             Loaded DataFrame
         """
         self.logger.info(f"Loading dataset: {filename}")
-        df = self.data_loader.load_csv(filename, sep="|", low_memory=False)
+        if engine == "pyarrow":
+            df = _strings_to_categories(
+                self.data_loader.load_csv(
+                    filename, sep="|", engine="pyarrow", dtype=TASK4_COLUMN_TYPES
+                )
+            )
+        elif chunksize is None:
+            df = _strings_to_categories(
+                self.data_loader.load_csv(filename, sep="|", low_memory=False)
+            )
+        else:
+            with self.data_loader.load_csv(
+                filename, sep="|", chunksize=chunksize
+            ) as reader:
+                df = _concat_chunks([_strings_to_categories(chunk) for chunk in reader])
+
         self.logger.info(f"Loaded {len(df)} rows and {len(df.columns)} columns")
         return df
 
     def handle_missing_values(
-        self, df: pd.DataFrame, strategy: str = "median"
+        self, df: pd.DataFrame, strategy: str = "median", engine: str = "pandas"
     ) -> pd.DataFrame:
         """
         Handle missing values in the dataset.
@@ -67,12 +256,13 @@ class DataPreprocessor:
         Args:
             df: Input DataFrame
             strategy: Strategy for filling missing values ('median', 'mean', 'mode', 'drop')
+            engine: 'pandas', or 'polars' to compute and fill numeric medians/means
+                with Polars (falls back to pandas if Polars is not installed)
 
         Returns:
             DataFrame with missing values handled
         """
         self.logger.info("Handling missing values...")
-        df = df.copy()
 
         # Count missing values
         missing_counts = df.isnull().sum()
@@ -80,31 +270,96 @@ class DataPreprocessor:
             self.logger.info(
                 f"Missing values found:\n{missing_counts[missing_counts > 0]}"
             )
-
-        # Handle missing values based on strategy
-        for col in df.columns:
-            if df[col].isnull().sum() > 0:
-                if strategy == "drop":
-                    df = df.dropna(subset=[col])
-                elif strategy == "median" and df[col].dtype in ["int64", "float64"]:
-                    df[col].fillna(df[col].median(), inplace=True)
-                elif strategy == "mean" and df[col].dtype in ["int64", "float64"]:
-                    df[col].fillna(df[col].mean(), inplace=True)
-                elif strategy == "mode":
-                    df[col].fillna(
-                        df[col].mode()[0] if len(df[col].mode()) > 0 else 0,
-                        inplace=True,
+        missing_cols = missing_counts.index[missing_counts > 0]
+
+        # Handle missing values based on strategy: build one fill value per
+        # column, then fill the whole frame in a single call
+        if strategy == "drop":
+            df = df.dropna(subset=missing_cols)
+        elif len(missing_cols) > 0:
+            numeric_cols = [
+                col
+                for col in missing_cols
+                if pd.api.types.is_numeric_dtype(df[col])
+                and not pd.api.types.is_bool_dtype(df[col])
+            ]
+            fill_values = {}
+            polars_filled = None
+            if engine == "polars" and strategy in ("median", "mean") and numeric_cols:
+                if POLARS_AVAILABLE:
+                    polars_filled = self._fill_numeric_polars(
+                        df[numeric_cols], strategy
                     )
+                    missing_cols = missing_cols.difference(numeric_cols, sort=False)
+                    numeric_cols = []
                 else:
-                    # For categorical or other types, use mode or 'Unknown'
-                    if df[col].dtype == "object":
-                        df[col].fillna("Unknown", inplace=True)
-                    else:
-                        df[col].fillna(0, inplace=True)
+                    self.logger.warning("Polars not available; using pandas fillna")
+
+            if strategy == "median" and numeric_cols:
+                fill_values.update(df[numeric_cols].median().to_dict())
+            elif strategy == "mean" and numeric_cols:
+                fill_values.update(df[numeric_cols].mean().to_dict())
+            elif strategy == "mode":
+                modes = df[missing_cols].mode()
+                if len(modes) > 0:
+                    fill_values.update(modes.iloc[0].dropna().to_dict())
+
+            # Columns without a fill value yet (no mode, or non-numeric for
+            # median/mean): 'Unknown' for string columns, otherwise 0
+            for col in missing_cols:
+                if col not in fill_values:
+                    use_unknown = strategy != "mode" and (
+                        isinstance(df[col].dtype, pd.CategoricalDtype)
+                        or df[col].dtype == "object"
+                    )
+                    fill_values[col] = "Unknown" if use_unknown else 0
+
+            # Categoricals only accept fill values that are categories; they
+            # are filled after the others, on the new frame from fillna
+            new_categories = {
+                col: value
+                for col, value in fill_values.items()
+                if isinstance(df[col].dtype, pd.CategoricalDtype)
+                and value not in df[col].cat.categories
+            }
+            df = df.fillna(
+                {
+                    col: value
+                    for col, value in fill_values.items()
+                    if col not in new_categories
+                }
+            )
+            for col, value in new_categories.items():
+                df[col] = df[col].cat.add_categories([value]).fillna(value)
+            if polars_filled is not None:
+                df[polars_filled.columns] = polars_filled
 
         self.logger.info("Missing values handled")
         return df
 
+    @staticmethod
+    def _fill_numeric_polars(numeric: pd.DataFrame, strategy: str) -> pd.DataFrame:
+        """
+        Fill numeric columns with their median or mean using Polars.
+
+        Args:
+            numeric: Numeric columns that contain missing values
+            strategy: 'median' or 'mean'
+
+        Returns:
+            Filled columns with the original index and NumPy-backed dtypes
+        """
+        frame = pl.from_pandas(numeric, nan_to_null=True)
+        frame = frame.with_columns(
+            [
+                pl.col(col).fill_null(getattr(pl.col(col), strategy)())
+                for col in frame.columns
+            ]
+        )
+        filled = frame.to_pandas()
+        filled.index = numeric.index
+        return filled
+
     def engineer_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Engineer new features from existing ones.
@@ -116,39 +371,33 @@ class DataPreprocessor:
             DataFrame with engineered features
         """
         self.logger.info("Engineering features...")
-        df = df.copy()
+
+        # New columns are collected and added with a single assign
+        features: Dict[str, Any] = {}
 
         # Claim-related features
         if "TotalClaims" in df.columns and "TotalPremium" in df.columns:
-            # Claim indicator (binary)
-            df["HasClaim"] = (df["TotalClaims"] > 0).astype(int)
-
-            # Loss ratio
-            df["LossRatio"] = np.where(
-                df["TotalPremium"] > 0,
-                df["TotalClaims"] / df["TotalPremium"],
-                0,
+            # Claim indicator, loss ratio (0 without premium), severity (only
+            # for policies with claims) and profit margin, in one pass
+            has_claim, loss_ratio, severity, margin = claim_features(
+                df["TotalClaims"].to_numpy(), df["TotalPremium"].to_numpy()
             )
-
-            # Claim severity (only for policies with claims)
-            df["ClaimSeverity"] = np.where(df["HasClaim"] == 1, df["TotalClaims"], 0)
-
-            # Profit margin
-            df["ProfitMargin"] = df["TotalPremium"] - df["TotalClaims"]
+            features["HasClaim"] = has_claim
+            features["LossRatio"] = loss_ratio
+            features["ClaimSeverity"] = severity
+            features["ProfitMargin"] = margin
 
         # Age-related features (if Age column exists)
         if "Age" in df.columns:
             # Age groups
-            df["AgeGroup"] = pd.cut(
-                df["Age"],
-                bins=[0, 25, 35, 45, 55, 65, 100],
-                labels=["18-25", "26-35", "36-45", "46-55", "56-65", "65+"],
-            )
+            features["AgeGroup"] = _age_groups(df["Age"].to_numpy())
 
         # Geographic features (if available)
         if "PostalCode" in df.columns:
             # Extract first few digits of postal code as region indicator
-            df["PostalCodePrefix"] = df["PostalCode"].astype(str).str[:3]
+            features["PostalCodePrefix"] = _postal_code_prefix(df["PostalCode"])
+
+        df = df.assign(**features)
 
         # Vehicle-related features (if available)
         vehicle_cols = [col for col in df.columns if "Vehicle" in col or "Auto" in col]
@@ -158,11 +407,53 @@ class DataPreprocessor:
         self.logger.info(f"Feature engineering complete. New shape: {df.shape}")
         return df
 
+    def downcast_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Store numeric feature columns in the narrowest adequate dtype.
+
+        Float features become float32 and integer features the smallest
+        signed integer type that holds their range; the claim flag becomes
+        int8. Targets and target-derived columns keep their precision.
+
+        Args:
+            df: Input DataFrame
+
+        Returns:
+            DataFrame with downcast feature columns
+        """
+        dtypes: Dict[str, Any] = {}
+        for col in self.numeric_feature_columns(df):
+            values = df[col]
+            if pd.api.types.is_float_dtype(values) and values.dtype != np.float32:
+                dtypes[col] = np.float32
+            elif pd.api.types.is_integer_dtype(values) and len(values) > 0:
+                low, high = values.min(), values.max()
+                for candidate in (np.int8, np.int16, np.int32):
+                    info = np.iinfo(candidate)
+                    if info.min <= low and high <= info.max:
+                        if np.dtype(candidate).itemsize < values.dtype.itemsize:
+                            dtypes[col] = candidate
+                        break
+        if "HasClaim" in df.columns:
+            dtypes["HasClaim"] = np.int8
+
+        if not dtypes:
+            return df
+        before = df.memory_usage(deep=False).sum()
+        df = df.astype(dtypes)
+        self.logger.info(
+            f"Downcast {len(dtypes)} columns: "
+            f"{before / 1e6:.1f} MB -> {df.memory_usage(deep=False).sum() / 1e6:.1f} MB"
+        )
+        return df
+
     def encode_categorical(
         self,
         df: pd.DataFrame,
         categorical_cols: Optional[List[str]] = None,
         encoding_method: str = "onehot",
+        sparse_onehot: bool = False,
+        n_jobs: int = 1,
     ) -> pd.DataFrame:
         """
         Encode categorical variables.
@@ -171,16 +462,30 @@ class DataPreprocessor:
             df: Input DataFrame
             categorical_cols: List of categorical column names (auto-detected if None)
             encoding_method: 'onehot' or 'label'
+            sparse_onehot: Store one-hot columns as ``Sparse[int8]`` instead of
+                dense int8 (one stored value per row instead of one per category)
+            n_jobs: Number of threads encoding columns concurrently (-1 for
+                all cores)
+
+        With 'onehot', columns with more than ``ONEHOT_MAX_CARDINALITY`` levels
+        (e.g. PostalCode) are binary-coded into ``ceil(log2(n + 1))`` bit
+        columns, and columns with more than ``HASHING_MIN_CARDINALITY`` levels
+        are hashed into ``HASH_N_FEATURES`` columns.
 
         Returns:
             DataFrame with encoded categorical variables
         """
         self.logger.info("Encoding categorical variables...")
-        df = df.copy()
 
-        # Auto-detect categorical columns if not provided
+        # Auto-detect categorical columns if not provided (string columns,
+        # stored as object or unordered categorical; ordered bins such as
+        # AgeGroup are left alone)
         if categorical_cols is None:
-            categorical_cols = df.select_dtypes(include=["object"]).columns.tolist()
+            categorical_cols = [
+                col
+                for col in df.select_dtypes(include=["object", "category"]).columns
+                if df[col].dtype == "object" or not df[col].cat.ordered
+            ]
 
         # Remove target variables from categorical encoding
         target_vars = ["TotalClaims", "TotalPremium", "HasClaim", "ClaimSeverity"]
@@ -188,133 +493,268 @@ class DataPreprocessor:
 
         self.logger.info(f"Categorical columns to encode: {categorical_cols}")
 
-        for col in categorical_cols:
-            if col not in df.columns:
-                continue
+        # Columns are encoded independently (from a thread pool with n_jobs);
+        # one-hot blocks are then joined to the frame in one concat, since
+        # inserting their columns one at a time reallocates the frame each time
+        columns = [col for col in categorical_cols if col in df.columns]
+        if n_jobs == 1:
+            results = [
+                self._encode_column(df[col], encoding_method, sparse_onehot)
+                for col in columns
+            ]
+        else:
+            results = Parallel(n_jobs=n_jobs, prefer="threads")(
+                delayed(self._encode_column)(df[col], encoding_method, sparse_onehot)
+                for col in columns
+            )
 
-            if encoding_method == "label":
-                # Label encoding
-                if col not in self.label_encoders:
-                    self.label_encoders[col] = LabelEncoder()
-                    df[col] = self.label_encoders[col].fit_transform(
-                        df[col].astype(str)
-                    )
-                else:
-                    # Handle unseen categories
-                    unique_values = set(df[col].astype(str).unique())
-                    known_values = set(self.label_encoders[col].classes_)
-                    for val in unique_values - known_values:
-                        # Add to encoder
-                        self.label_encoders[col].classes_ = np.append(
-                            self.label_encoders[col].classes_, val
-                        )
-                    df[col] = self.label_encoders[col].transform(df[col].astype(str))
-
-            elif encoding_method == "onehot":
-                # One-hot encoding with error handling
-                try:
-                    if col not in self.onehot_encoders:
-                        self.onehot_encoders[col] = OneHotEncoder(
-                            sparse_output=False, handle_unknown="ignore"
-                        )
-                        encoded = self.onehot_encoders[col].fit_transform(
-                            df[[col]].astype(str)
-                        )
-                    else:
-                        encoded = self.onehot_encoders[col].transform(
-                            df[[col]].astype(str)
-                        )
-
-                    # Create column names
-                    feature_names = [
-                        f"{col}_{cat}"
-                        for cat in self.onehot_encoders[col].categories_[0]
-                    ]
-
-                    # Ensure encoded is a numpy array and convert to float if needed
-                    if not isinstance(encoded, np.ndarray):
-                        encoded = np.array(encoded)
-                    encoded = encoded.astype(float)
-
-                    # Create DataFrame with proper index alignment
-                    encoded_df = pd.DataFrame(
-                        encoded, columns=feature_names, index=df.index
-                    )
+        onehot_cols: List[str] = []
+        onehot_blocks: List[pd.DataFrame] = []
+        # Label-encoded columns replace the originals in one assign at the end,
+        # so the input frame is never modified
+        label_columns: Dict[str, np.ndarray] = {}
+        for col, encoded in zip(columns, results):
+            if isinstance(encoded, pd.DataFrame):
+                onehot_blocks.append(encoded)
+                onehot_cols.append(col)
+            elif encoded is not None:
+                label_columns[col] = encoded
+
+        if label_columns:
+            df = df.assign(**label_columns)
+        if onehot_blocks:
+            df = pd.concat([df.drop(columns=onehot_cols), *onehot_blocks], axis=1)
 
-                    # Drop original column first
-                    df = df.drop(columns=[col], errors="ignore")
+        self.logger.info("Categorical encoding complete")
+        return df
 
-                    # Use assign method for safer concatenation (avoids numpy vstack issues)
-                    for feat_col in feature_names:
-                        df[feat_col] = encoded_df[feat_col]
+    def _encode_column(
+        self, values: pd.Series, encoding_method: str, sparse_onehot: bool
+    ) -> Union[np.ndarray, pd.DataFrame, None]:
+        """
+        Encode one categorical column.
 
-                except Exception as e:
-                    self.logger.warning(
-                        f"Error encoding column {col} with one-hot: {e}. "
-                        f"Using label encoding instead."
-                    )
-                    # Fallback to label encoding
-                    if col not in self.label_encoders:
-                        self.label_encoders[col] = LabelEncoder()
-                        df[col] = self.label_encoders[col].fit_transform(
-                            df[col].astype(str).fillna("Unknown")
-                        )
-                    else:
-                        unique_values = set(
-                            df[col].astype(str).fillna("Unknown").unique()
-                        )
-                        known_values = set(self.label_encoders[col].classes_)
-                        for val in unique_values - known_values:
-                            self.label_encoders[col].classes_ = np.append(
-                                self.label_encoders[col].classes_, val
-                            )
-                        df[col] = self.label_encoders[col].transform(
-                            df[col].astype(str).fillna("Unknown")
-                        )
+        Args:
+            values: Column to encode
+            encoding_method: 'onehot' or 'label'
+            sparse_onehot: Wrap one-hot indicators as ``Sparse[int8]`` columns
 
-        self.logger.info("Categorical encoding complete")
-        return df
+        Returns:
+            Integer labels (label encoding, or one-hot fallback), a frame of
+            encoded columns (one-hot), or None for an unknown method
+        """
+        col = values.name
+
+        # Encoders are fitted on and applied to the distinct levels only;
+        # per-row results are gathered through the integer codes
+        codes, levels = _string_codes(values)
+
+        if encoding_method == "label":
+            return self._label_encode(col, codes, levels)
+
+        if encoding_method != "onehot":
+            return None
+
+        # One-hot encoding with error handling
+        try:
+            block = self._encode_high_cardinality(col, codes, levels, values.index)
+            if block is not None:
+                return block
+
+            # The fitted state is the sorted category list; levels it has not
+            # seen get no indicator (an all-zero row)
+            if col not in self.onehot_encoders:
+                self.onehot_encoders[col] = levels.sort_values()
+            categories = self.onehot_encoders[col]
+            positions = categories.get_indexer(levels)
+            feature_names = [f"{col}_{cat}" for cat in categories]
+
+            if sparse_onehot:
+                # One stored value per row with a known level, built as CSR
+                row_positions = positions[codes]
+                known = row_positions >= 0
+                indptr = np.concatenate(([0], np.cumsum(known)))
+                encoded = sparse.csr_matrix(
+                    (
+                        np.ones(int(indptr[-1]), dtype=np.int8),
+                        row_positions[known],
+                        indptr,
+                    ),
+                    shape=(len(codes), len(categories)),
+                )
+                return pd.DataFrame.sparse.from_spmatrix(
+                    encoded, index=values.index, columns=feature_names
+                )
+
+            # Indicator row per level, gathered for every row by its code
+            table = np.zeros((len(levels), len(categories)), dtype=np.int8)
+            seen = positions >= 0
+            table[np.flatnonzero(seen), positions[seen]] = 1
+            return pd.DataFrame(
+                table[codes], columns=feature_names, index=values.index, copy=False
+            )
+
+        except Exception as e:
+            self.logger.warning(
+                f"Error encoding column {col} with one-hot: {e}. "
+                f"Using label encoding instead."
+            )
+            # Fallback to label encoding
+            return self._label_encode(col, codes, levels)
+
+    def _label_encode(
+        self, col: str, codes: np.ndarray, levels: pd.Index
+    ) -> np.ndarray:
+        """
+        Label-encode a column, fitting its encoder on first use.
+
+        Levels unseen by a fitted encoder are appended to its classes in one
+        concatenation, so existing labels keep their values.
+
+        Args:
+            col: Column name
+            codes: Level code per row, from ``_string_codes``
+            levels: String level per code
+
+        Returns:
+            Integer label per row
+        """
+        encoder = self.label_encoders.get(col)
+        if encoder is None:
+            encoder = self.label_encoders[col] = LabelEncoder().fit(levels)
+        else:
+            unseen = levels.difference(pd.Index(encoder.classes_), sort=False)
+            if len(unseen) > 0:
+                encoder.classes_ = np.concatenate(
+                    [encoder.classes_, unseen.to_numpy(dtype=encoder.classes_.dtype)]
+                )
+        return encoder.transform(levels)[codes]
+
+    def _encode_high_cardinality(
+        self, col: str, codes: np.ndarray, levels: pd.Index, index: pd.Index
+    ) -> Optional[pd.DataFrame]:
+        """
+        Binary-code or hash a high-cardinality column.
+
+        Binary codes reserve 0 for categories not seen when the column was
+        first encoded, so unseen values map to all-zero bits.
+
+        Args:
+            col: Column name
+            codes: Level code per row, from ``_string_codes``
+            levels: String level per code
+            index: Index of the encoded frame
+
+        Returns:
+            Encoded int8 columns, or None if the column should be one-hot encoded
+        """
+        if col in self.onehot_encoders:
+            return None
+        if col not in self.binary_encoders and col not in self.hash_encoders:
+            n_levels = len(levels)
+            if n_levels <= ONEHOT_MAX_CARDINALITY:
+                return None
+            if n_levels > HASHING_MIN_CARDINALITY:
+                self.hash_encoders[col] = FeatureHasher(
+                    n_features=HASH_N_FEATURES,
+                    input_type="string",
+                    alternate_sign=False,
+                )
+            else:
+                self.binary_encoders[col] = levels
+            self.logger.info(
+                f"Column {col} has {n_levels} levels; not one-hot encoding"
+            )
+
+        if col in self.hash_encoders:
+            hashed = self.hash_encoders[col].transform(levels.to_numpy()[:, None])
+            encoded = hashed.toarray().astype(np.int8)[codes]
+            names = [f"{col}_h{i}" for i in range(encoded.shape[1])]
+        else:
+            categories = self.binary_encoders[col]
+            level_codes = categories.get_indexer(levels) + 1
+            n_bits = max(int(np.ceil(np.log2(len(categories) + 1))), 1)
+            bits = (level_codes[:, None] >> np.arange(n_bits)) & 1
+            encoded = bits.astype(np.int8)[codes]
+            names = [f"{col}_b{i}" for i in range(n_bits)]
+
+        return pd.DataFrame(encoded, columns=names, index=index, copy=False)
+
+    @staticmethod
+    def to_sparse_matrix(X: pd.DataFrame) -> sparse.csr_matrix:
+        """
+        Convert features with sparse one-hot columns to a CSR matrix.
+
+        Dense columns are stacked next to the sparse blocks without densifying
+        them, so estimators that accept sparse input (sklearn linear and tree
+        models, XGBoost) can be fit without materialising the one-hot block.
+
+        Args:
+            X: Features from ``prepare_*_data`` (after ``sparse_onehot=True``)
+
+        Returns:
+            CSR matrix with the columns of ``X`` in the same order
+        """
+        is_sparse = [isinstance(dtype, pd.SparseDtype) for dtype in X.dtypes]
+        blocks = []
+        start = 0
+        # Group consecutive columns of the same kind into one block each
+        for end in range(1, len(is_sparse) + 1):
+            if end == len(is_sparse) or is_sparse[end] != is_sparse[start]:
+                part = X.iloc[:, start:end]
+                if is_sparse[start]:
+                    blocks.append(part.sparse.to_coo())
+                else:
+                    blocks.append(sparse.csr_matrix(part.to_numpy(dtype=np.float64)))
+                start = end
+        if not blocks:
+            return sparse.csr_matrix((len(X), 0))
+        return sparse.hstack(blocks, format="csr", dtype=np.float64)
+
+    def numeric_feature_columns(self, df: pd.DataFrame) -> List[str]:
+        """
+        Select the numeric feature columns shared by all three models.
+
+        Args:
+            df: Input DataFrame
+
+        Returns:
+            Numeric columns of ``df`` other than ``TARGET_DERIVED_COLUMNS``
+        """
+        feature_cols = [col for col in df.columns if col not in TARGET_DERIVED_COLUMNS]
+        return df[feature_cols].select_dtypes(include=[np.number]).columns.tolist()
 
     def prepare_severity_data(
-        self, df: pd.DataFrame
+        self, df: pd.DataFrame, numeric_features: Optional[List[str]] = None
     ) -> Tuple[pd.DataFrame, pd.Series, List[str]]:
         """
         Prepare data for claim severity modeling (only policies with claims).
 
         Args:
             df: Input DataFrame
+            numeric_features: Feature columns to use (default:
+                ``numeric_feature_columns(df)``)
 
         Returns:
             Tuple of (features, target, feature_names)
         """
         self.logger.info("Preparing data for severity modeling...")
 
-        # Filter to only policies with claims
-        severity_df = df[df["TotalClaims"] > 0].copy()
-        self.logger.info(f"Severity dataset: {len(severity_df)} policies with claims")
+        # Filter to only policies with claims, copying just the target and
+        # the numeric features out of the frame. Claims are rare, so the
+        # mask is turned into row positions once and every block is gathered
+        # by position rather than re-scanning the full-length mask.
+        claim_rows = np.flatnonzero((df["TotalClaims"] > 0).to_numpy())
+        self.logger.info(f"Severity dataset: {len(claim_rows)} policies with claims")
 
         # Target variable
-        target = severity_df["TotalClaims"].copy()
-
-        # Features (exclude target variables)
-        exclude_cols = [
-            "TotalClaims",
-            "TotalPremium",
-            "HasClaim",
-            "LossRatio",
-            "ClaimSeverity",
-            "ProfitMargin",
-        ]
-        feature_cols = [col for col in severity_df.columns if col not in exclude_cols]
+        target = df["TotalClaims"].take(claim_rows)
 
         # Select only numeric features for severity model
-        numeric_features = (
-            severity_df[feature_cols]
-            .select_dtypes(include=[np.number])
-            .columns.tolist()
-        )
+        if numeric_features is None:
+            numeric_features = self.numeric_feature_columns(df)
 
-        features = severity_df[numeric_features].copy()
+        features = df.iloc[claim_rows, df.columns.get_indexer(numeric_features)]
 
         self.logger.info(
             f"Severity model: {len(features.columns)} features, {len(features)} samples"
@@ -322,13 +762,15 @@ class DataPreprocessor:
         return features, target, numeric_features
 
     def prepare_premium_data(
-        self, df: pd.DataFrame
+        self, df: pd.DataFrame, numeric_features: Optional[List[str]] = None
     ) -> Tuple[pd.DataFrame, pd.Series, List[str]]:
         """
         Prepare data for premium optimization modeling.
 
         Args:
             df: Input DataFrame
+            numeric_features: Feature columns to use (default:
+                ``numeric_feature_columns(df)``)
 
         Returns:
             Tuple of (features, target, feature_names)
@@ -338,23 +780,11 @@ class DataPreprocessor:
         # Target variable
         target = df["TotalPremium"].copy()
 
-        # Features (exclude target variables)
-        exclude_cols = [
-            "TotalClaims",
-            "TotalPremium",
-            "HasClaim",
-            "LossRatio",
-            "ClaimSeverity",
-            "ProfitMargin",
-        ]
-        feature_cols = [col for col in df.columns if col not in exclude_cols]
-
         # Select only numeric features
-        numeric_features = (
-            df[feature_cols].select_dtypes(include=[np.number]).columns.tolist()
-        )
+        if numeric_features is None:
+            numeric_features = self.numeric_feature_columns(df)
 
-        features = df[numeric_features].copy()
+        features = df[numeric_features]
 
         self.logger.info(
             f"Premium model: {len(features.columns)} features, {len(features)} samples"
@@ -362,13 +792,15 @@ class DataPreprocessor:
         return features, target, numeric_features
 
     def prepare_claim_probability_data(
-        self, df: pd.DataFrame
+        self, df: pd.DataFrame, numeric_features: Optional[List[str]] = None
     ) -> Tuple[pd.DataFrame, pd.Series, List[str]]:
         """
         Prepare data for claim probability classification.
 
         Args:
             df: Input DataFrame
+            numeric_features: Feature columns to use (default:
+                ``numeric_feature_columns(df)``)
 
         Returns:
             Tuple of (features, target, feature_names)
@@ -381,23 +813,11 @@ class DataPreprocessor:
         else:
             target = df["HasClaim"].copy()
 
-        # Features (exclude target variables)
-        exclude_cols = [
-            "TotalClaims",
-            "TotalPremium",
-            "HasClaim",
-            "LossRatio",
-            "ClaimSeverity",
-            "ProfitMargin",
-        ]
-        feature_cols = [col for col in df.columns if col not in exclude_cols]
-
         # Select only numeric features
-        numeric_features = (
-            df[feature_cols].select_dtypes(include=[np.number]).columns.tolist()
-        )
+        if numeric_features is None:
+            numeric_features = self.numeric_feature_columns(df)
 
-        features = df[numeric_features].copy()
+        features = df[numeric_features]
 
         self.logger.info(
             f"Claim probability model: {len(features.columns)} features, {len(features)} samples"
@@ -406,8 +826,31 @@ class DataPreprocessor:
 
         return features, target, numeric_features
 
+    def split_indices(self, n_samples: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Positional train/test indices for ``n_samples`` rows.
+
+        These are the rows ``train_test_split`` selects for the same size,
+        test fraction and random state.
+
+        Args:
+            n_samples: Number of rows to split
+
+        Returns:
+            Tuple of (train indices, test indices)
+        """
+        train_idx, test_idx = train_test_split(
+            np.arange(n_samples),
+            test_size=self.test_size,
+            random_state=self.random_state,
+        )
+        return train_idx, test_idx
+
     def split_data(
-        self, X: pd.DataFrame, y: pd.Series
+        self,
+        X: pd.DataFrame,
+        y: pd.Series,
+        indices: Optional[Tuple[np.ndarray, np.ndarray]] = None,
     ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series]:
         """
         Split data into train and test sets.
@@ -415,6 +858,9 @@ class DataPreprocessor:
         Args:
             X: Features
             y: Target variable
+            indices: Train and test row positions (default:
+                ``split_indices(len(X))``); pass one pair to split datasets
+                with the same rows identically
 
         Returns:
             Tuple of (X_train, X_test, y_train, y_test)
@@ -422,22 +868,53 @@ class DataPreprocessor:
         self.logger.info(
             f"Splitting data: {1-self.test_size:.0%} train, {self.test_size:.0%} test"
         )
-        X_train, X_test, y_train, y_test = train_test_split(
-            X,
-            y,
-            test_size=self.test_size,
-            random_state=self.random_state,
-            stratify=None,
-        )
+        if indices is None:
+            indices = self.split_indices(len(X))
+        train_idx, test_idx = indices
+        X_train, X_test = X.iloc[train_idx], X.iloc[test_idx]
+        y_train, y_test = y.iloc[train_idx], y.iloc[test_idx]
         self.logger.info(f"Train: {len(X_train)} samples, Test: {len(X_test)} samples")
         return X_train, X_test, y_train, y_test
 
+    def scale_features_np(
+        self, X_train: pd.DataFrame, X_test: pd.DataFrame
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Scale features using StandardScaler, returning plain arrays.
+
+        Use this when the scaled sets go straight into a model's ``fit`` or
+        ``predict``; column names are those of ``X_train``.
+
+        Args:
+            X_train: Training features
+            X_test: Test features
+
+        Returns:
+            Tuple of (scaled_X_train, scaled_X_test) as 2-D arrays
+        """
+        self.logger.info("Scaling features...")
+        # Each set is copied out of its frame once and scaled in place;
+        # float32 is kept when every feature fits in it without loss
+        dtype = np.result_type(np.float32, *X_train.dtypes)
+        if dtype != np.float32:
+            dtype = np.dtype(np.float64)
+        self.scaler.set_params(copy=False)
+        X_train_scaled = self.scaler.fit_transform(
+            X_train.to_numpy(dtype=dtype, copy=True)
+        )
+        X_test_scaled = self.scaler.transform(X_test.to_numpy(dtype=dtype, copy=True))
+        self.logger.info("Feature scaling complete")
+        return X_train_scaled, X_test_scaled
+
     def scale_features(
         self, X_train: pd.DataFrame, X_test: pd.DataFrame
     ) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
         Scale features using StandardScaler.
 
+        Same as ``scale_features_np``, with the results wrapped back into
+        frames carrying the original columns and index.
+
         Args:
             X_train: Training features
             X_test: Test features
@@ -445,19 +922,71 @@ class DataPreprocessor:
         Returns:
             Tuple of (scaled_X_train, scaled_X_test)
         """
-        self.logger.info("Scaling features...")
-        X_train_scaled = pd.DataFrame(
-            self.scaler.fit_transform(X_train),
-            columns=X_train.columns,
-            index=X_train.index,
+        X_train_scaled, X_test_scaled = self.scale_features_np(X_train, X_test)
+        return (
+            pd.DataFrame(
+                X_train_scaled,
+                columns=X_train.columns,
+                index=X_train.index,
+                copy=False,
+            ),
+            pd.DataFrame(
+                X_test_scaled, columns=X_test.columns, index=X_test.index, copy=False
+            ),
         )
-        X_test_scaled = pd.DataFrame(
-            self.scaler.transform(X_test),
-            columns=X_test.columns,
-            index=X_test.index,
+
+    def _prepared_cache_file(
+        self, filename: str, cache_dir: Path, options: str
+    ) -> Path:
+        """
+        Path of the Parquet cache for a data file and pipeline options.
+
+        The name embeds the data file's size and modification time, so a
+        changed file is re-prepared and re-cached automatically.
+
+        Args:
+            filename: Name of the data file
+            cache_dir: Directory holding the cached frames
+            options: Tag identifying the pipeline options
+
+        Returns:
+            Cache file path (which may not exist yet)
+        """
+        source = Path(filename)
+        if not source.is_absolute() and self.data_path:
+            source = Path(self.data_path) / source
+        stat = source.stat()
+        return (
+            Path(cache_dir)
+            / f"{source.stem}_{stat.st_size}_{stat.st_mtime_ns}_{options}.parquet"
         )
-        self.logger.info("Feature scaling complete")
-        return X_train_scaled, X_test_scaled
+
+    def _write_prepared_cache(self, df: pd.DataFrame, cache_file: Path) -> None:
+        """
+        Write the prepared frame to its cache file, removing stale caches.
+
+        Args:
+            df: Prepared DataFrame
+            cache_file: Path from ``_prepared_cache_file``
+        """
+        stem, size, mtime, _ = cache_file.stem.rsplit("_", 3)
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            for stale in cache_file.parent.glob(f"{stem}_*.parquet"):
+                if not stale.name.startswith(f"{stem}_{size}_{mtime}_"):
+                    stale.unlink()
+            df.to_parquet(
+                cache_file,
+                engine="pyarrow",
+                compression="zstd",
+                row_group_size=100_000,
+            )
+            self.logger.info(f"Cached prepared data to {cache_file}")
+        except (ValueError, TypeError, OSError) as exc:
+            # Mixed-type object columns cannot be written; prepare from the
+            # data file again next time
+            cache_file.unlink(missing_ok=True)
+            self.logger.warning(f"Could not cache prepared data as Parquet: {exc}")
 
     def full_pipeline(
         self,
@@ -466,6 +995,9 @@ class DataPreprocessor:
         engineer_features: bool = True,
         encode_categorical: bool = True,
         encoding_method: str = "onehot",
+        sparse_onehot: bool = False,
+        downcast: bool = True,
+        cache_dir: Optional[Path] = None,
     ) -> Dict[str, Tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series]]:
         """
         Run full data preparation pipeline.
@@ -476,6 +1008,14 @@ class DataPreprocessor:
             engineer_features: Whether to engineer new features
             encode_categorical: Whether to encode categorical variables
             encoding_method: 'onehot' or 'label'
+            sparse_onehot: Keep one-hot columns sparse (see ``to_sparse_matrix``)
+            downcast: Store numeric features in narrower dtypes
+                (see ``downcast_features``)
+            cache_dir: Directory for a Parquet cache of the prepared frame.
+                A cache written for the same data file and options replaces
+                loading, imputation, feature engineering and encoding (the
+                encoders are then left unfitted). Not used for sparse
+                one-hot output, which Parquet cannot store.
 
         Returns:
             Dictionary with prepared datasets for each model type
@@ -484,48 +1024,90 @@ class DataPreprocessor:
         self.logger.info("Starting full data preparation pipeline")
         self.logger.info("=" * 80)
 
-        # Load data
-        df = self.load_data(filename)
-
-        # Handle missing values
-        if handle_missing:
-            df = self.handle_missing_values(df)
-
-        # Engineer features
-        if engineer_features:
-            df = self.engineer_features(df)
+        # Copy-on-write for the whole run: each stage returns a new frame
+        # without eagerly copying the columns it leaves untouched
+        with pd.option_context("mode.copy_on_write", True):
+            cache_file = None
+            sparse_frame = (
+                encode_categorical and encoding_method == "onehot" and sparse_onehot
+            )
+            if cache_dir is not None and sparse_frame:
+                # Parquet cannot store sparse columns
+                self.logger.info("Sparse one-hot columns are not cached as Parquet")
+            elif cache_dir is not None:
+                options = (
+                    f"{handle_missing:d}{engineer_features:d}{encode_categorical:d}"
+                    f"{sparse_onehot:d}{downcast:d}{encoding_method}"
+                )
+                cache_file = self._prepared_cache_file(filename, cache_dir, options)
+
+            if cache_file is not None and cache_file.exists():
+                self.logger.info(f"Loading prepared data from {cache_file}")
+                df = pd.read_parquet(cache_file, engine="pyarrow")
+            else:
+                # Load data
+                df = self.load_data(filename)
+
+                # Handle missing values
+                if handle_missing:
+                    df = self.handle_missing_values(df)
+
+                # Engineer features
+                if engineer_features:
+                    df = self.engineer_features(df)
+
+                # Narrow numeric features (one-hot columns are already int8)
+                if downcast:
+                    df = self.downcast_features(df)
+
+                # Encode categorical variables
+                if encode_categorical:
+                    df = self.encode_categorical(
+                        df, encoding_method=encoding_method, sparse_onehot=sparse_onehot
+                    )
 
-        # Encode categorical variables
-        if encode_categorical:
-            df = self.encode_categorical(df, encoding_method=encoding_method)
+                if cache_file is not None:
+                    self._write_prepared_cache(df, cache_file)
 
-        # Prepare datasets for each model
-        datasets = {}
+            # Prepare datasets for each model; all three share one numeric
+            # feature selection
+            datasets = {}
+            numeric_features = self.numeric_feature_columns(df)
 
-        # 1. Severity model
-        X_sev, y_sev, feature_names_sev = self.prepare_severity_data(df)
-        X_sev_train, X_sev_test, y_sev_train, y_sev_test = self.split_data(X_sev, y_sev)
-        datasets["severity"] = (X_sev_train, X_sev_test, y_sev_train, y_sev_test)
-        self.feature_names = feature_names_sev
+            # 1. Severity model
+            X_sev, y_sev, feature_names_sev = self.prepare_severity_data(
+                df, numeric_features=numeric_features
+            )
+            X_sev_train, X_sev_test, y_sev_train, y_sev_test = self.split_data(
+                X_sev, y_sev
+            )
+            datasets["severity"] = (X_sev_train, X_sev_test, y_sev_train, y_sev_test)
+            self.feature_names = feature_names_sev
 
-        # 2. Premium model
-        X_prem, y_prem, feature_names_prem = self.prepare_premium_data(df)
-        X_prem_train, X_prem_test, y_prem_train, y_prem_test = self.split_data(
-            X_prem, y_prem
-        )
-        datasets["premium"] = (X_prem_train, X_prem_test, y_prem_train, y_prem_test)
+            # 2. Premium model (same rows as the claim probability model, so
+            # both use one split)
+            X_prem, y_prem, feature_names_prem = self.prepare_premium_data(
+                df, numeric_features=numeric_features
+            )
+            indices = self.split_indices(len(X_prem))
+            X_prem_train, X_prem_test, y_prem_train, y_prem_test = self.split_data(
+                X_prem, y_prem, indices=indices
+            )
+            datasets["premium"] = (X_prem_train, X_prem_test, y_prem_train, y_prem_test)
 
-        # 3. Claim probability model
-        X_prob, y_prob, feature_names_prob = self.prepare_claim_probability_data(df)
-        X_prob_train, X_prob_test, y_prob_train, y_prob_test = self.split_data(
-            X_prob, y_prob
-        )
-        datasets["claim_probability"] = (
-            X_prob_train,
-            X_prob_test,
-            y_prob_train,
-            y_prob_test,
-        )
+            # 3. Claim probability model
+            X_prob, y_prob, feature_names_prob = self.prepare_claim_probability_data(
+                df, numeric_features=numeric_features
+            )
+            X_prob_train, X_prob_test, y_prob_train, y_prob_test = self.split_data(
+                X_prob, y_prob, indices=indices
+            )
+            datasets["claim_probability"] = (
+                X_prob_train,
+                X_prob_test,
+                y_prob_train,
+                y_prob_test,
+            )
 
         self.logger.info("=" * 80)
         self.logger.info("Data preparation pipeline complete")
@@ -1,10 +1,24 @@
 """Model interpretability using SHAP and LIME for Task 4."""
 
+import heapq
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
+from scipy import sparse
+from sklearn.ensemble import (
+    GradientBoostingClassifier,
+    GradientBoostingRegressor,
+    RandomForestClassifier,
+    RandomForestRegressor,
+)
+from sklearn.linear_model import LinearRegression, LogisticRegression
+from sklearn.metrics import pairwise_distances
+from sklearn.pipeline import Pipeline
+from sklearn.tree import DecisionTreeClassifier, DecisionTreeRegressor
 
 try:
     import shap
@@ -14,30 +28,461 @@ except ImportError:
     SHAP_AVAILABLE = False
 
 try:
+    import fasttreeshap
+
+    FASTTREESHAP_AVAILABLE = True
+except ImportError:
+    FASTTREESHAP_AVAILABLE = False
+
+try:
+    from lime import explanation as lime_explanation
     from lime import lime_tabular
 
     LIME_AVAILABLE = True
 except ImportError:
     LIME_AVAILABLE = False
 
+try:
+    import xgboost as xgb
+
+    XGBOOST_AVAILABLE = True
+except ImportError:
+    XGBOOST_AVAILABLE = False
+
+from src.analysis.task3.backend import gpu_available
+from src.analysis.task4._kernels import column_mean_abs
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Seed of the LIME perturbation sampler
+LIME_RANDOM_STATE = 42
+
+# SHAP explainer kind per model class; subclasses resolve through their MRO.
+# Models not listed here are explained with the model-agnostic
+# PermutationExplainer.
+_EXPLAINER_FOR: Dict[type, str] = {
+    LinearRegression: "linear",
+    LogisticRegression: "linear",
+    DecisionTreeRegressor: "tree",
+    DecisionTreeClassifier: "tree",
+    RandomForestRegressor: "tree",
+    RandomForestClassifier: "tree",
+    GradientBoostingRegressor: "tree",
+    GradientBoostingClassifier: "tree",
+}
+if XGBOOST_AVAILABLE:
+    _EXPLAINER_FOR[xgb.XGBModel] = "tree"
+
+
+def _explainer_kind(model) -> Optional[str]:
+    """
+    Look up the SHAP explainer kind for a model.
+
+    Args:
+        model: Trained model
+
+    Returns:
+        'tree', 'linear', or None if the model needs the generic explainer
+    """
+    for cls in type(model).__mro__:
+        kind = _EXPLAINER_FOR.get(cls)
+        if kind is not None:
+            return kind
+    return None
+
+
+def _quantize_shap(shap_values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Quantize SHAP values to int16 with one scale per feature.
+
+    Args:
+        shap_values: 2-D array of SHAP values (samples x features)
+
+    Returns:
+        Tuple of (int16 values, float64 scale per feature); the error is at
+        most half a step, i.e. ``max |value| / 65534`` per feature
+    """
+    shap_values = np.asarray(shap_values, dtype=np.float64)
+    scale = np.abs(shap_values).max(axis=0, initial=0.0) / np.iinfo(np.int16).max
+    # All-zero features keep a unit scale so they quantize to 0
+    scale[scale == 0] = 1.0
+    return np.rint(shap_values / scale).astype(np.int16), scale
+
+
+def dequantize_shap(quantized: np.ndarray, scale: np.ndarray) -> np.ndarray:
+    """
+    Restore SHAP values stored with ``compress_shap=True``.
+
+    Args:
+        quantized: 'shap_values_q16' from ``shap_analysis`` results
+        scale: 'shap_scale' from the same results
+
+    Returns:
+        Approximate SHAP values (float64)
+    """
+    return quantized * scale
+
+
+def _top_records(feature_importance: pd.DataFrame, n: int = 10) -> List[Dict]:
+    """
+    First ``n`` rows of a sorted feature importance frame as records.
+
+    Equivalent to ``feature_importance.head(n).to_dict("records")`` without
+    pandas' generic per-row conversion.
+
+    Args:
+        feature_importance: Frame with 'feature' and 'importance' columns
+        n: Number of records
+
+    Returns:
+        List of {'feature', 'importance'} dicts with native Python values
+    """
+    top = feature_importance.head(n)
+    return [
+        {"feature": feature, "importance": importance}
+        for feature, importance in zip(
+            top["feature"].tolist(), top["importance"].tolist()
+        )
+    ]
+
+
+if LIME_AVAILABLE:
+
+    class _BatchLimeExplainer(lime_tabular.LimeTabularExplainer):
+        """LimeTabularExplainer that explains several rows with one predict call."""
+
+        def explain_batch(
+            self,
+            rows: np.ndarray,
+            predict_fn,
+            num_features: int = 10,
+            num_samples: int = 5000,
+            labels: Tuple[int, ...] = (1,),
+            distance_metric: str = "euclidean",
+        ) -> List:
+            """
+            Explain each row, predicting all perturbations in a single call.
+
+            The neighbourhoods are drawn in the same order as successive
+            ``explain_instance`` calls, and each explanation is fitted with
+            ``self.base.explain_instance_with_data`` on its slice of the
+            batched predictions, so the explanations match
+            ``explain_instance`` for dense rows.
+
+            Args:
+                rows: 2-D array of rows to explain
+                predict_fn: Model prediction function
+                num_features: Maximum number of features per explanation
+                num_samples: Perturbations per row
+                labels: Labels to explain (classification)
+                distance_metric: Distance metric for the sample weights
+
+            Returns:
+                List of LIME explanations, one per row
+            """
+            rows = np.asarray(rows)
+            if len(rows) == 0:
+                return []
+            neighbourhoods = [
+                self._LimeTabularExplainer__data_inverse(row, num_samples)
+                for row in rows
+            ]
+            predictions = np.asarray(
+                predict_fn(np.vstack([inverse for _, inverse in neighbourhoods]))
+            )
+            return [
+                self._explain_with_predictions(
+                    row,
+                    data,
+                    predictions[i * num_samples : (i + 1) * num_samples],
+                    num_features,
+                    labels,
+                    distance_metric,
+                )
+                for i, (row, (data, _)) in enumerate(zip(rows, neighbourhoods))
+            ]
+
+        def _explain_with_predictions(
+            self,
+            row: np.ndarray,
+            data: np.ndarray,
+            yss: np.ndarray,
+            num_features: int,
+            labels: Tuple[int, ...],
+            distance_metric: str,
+        ):
+            """
+            Build the explanation of one row from its neighbourhood predictions.
+
+            Args:
+                row: Row being explained
+                data: Its neighbourhood (first row is the instance itself)
+                yss: Model predictions for the neighbourhood
+                num_features: Maximum number of features in the explanation
+                labels: Labels to explain (classification)
+                distance_metric: Distance metric for the sample weights
+
+            Returns:
+                LIME explanation
+            """
+            scaled_data = (data - self.scaler.mean_) / self.scaler.scale_
+            distances = pairwise_distances(
+                scaled_data, scaled_data[0].reshape(1, -1), metric=distance_metric
+            ).ravel()
+
+            if self.mode == "classification":
+                if yss.ndim == 1:
+                    raise NotImplementedError(
+                        "LIME does not support classifiers without probability "
+                        "scores"
+                    )
+                if yss.ndim != 2:
+                    raise ValueError(f"Model outputs arrays with {yss.ndim} dimensions")
+                if self.class_names is None:
+                    self.class_names = [str(x) for x in range(yss.shape[1])]
+            else:
+                if yss.ndim == 2 and yss.shape[1] == 1:
+                    yss = yss[:, 0]
+                if yss.ndim != 1:
+                    raise ValueError(
+                        "Model needs to output single-dimensional arrays, "
+                        f"not arrays of shape {yss.shape}"
+                    )
+                predicted_value, min_y, max_y = yss[0], yss.min(), yss.max()
+                yss = yss[:, np.newaxis]
+
+            feature_names = list(self.feature_names)
+            values = self.convert_and_round(row)
+            for i in self.categorical_features:
+                if self.discretizer is not None and i in self.discretizer.lambdas:
+                    continue
+                name = int(row[i])
+                if i in self.categorical_names:
+                    name = self.categorical_names[i][name]
+                feature_names[i] = f"{feature_names[i]}={name}"
+                values[i] = "True"
+            categorical_features = self.categorical_features
+
+            discretized_feature_names = None
+            if self.discretizer is not None:
+                categorical_features = range(data.shape[1])
+                discretized_instance = self.discretizer.discretize(row)
+                discretized_feature_names = list(feature_names)
+                for f in self.discretizer.names:
+                    discretized_feature_names[f] = self.discretizer.names[f][
+                        int(discretized_instance[f])
+                    ]
+
+            domain_mapper = lime_tabular.TableDomainMapper(
+                feature_names,
+                values,
+                scaled_data[0],
+                categorical_features=categorical_features,
+                discretized_feature_names=discretized_feature_names,
+            )
+            result = lime_explanation.Explanation(
+                domain_mapper, mode=self.mode, class_names=self.class_names
+            )
+            if self.mode == "classification":
+                result.predict_proba = yss[0]
+            else:
+                result.predicted_value = predicted_value
+                result.min_value = min_y
+                result.max_value = max_y
+                labels = (0,)
+            for label in labels:
+                (
+                    result.intercept[label],
+                    result.local_exp[label],
+                    result.score,
+                    result.local_pred,
+                ) = self.base.explain_instance_with_data(
+                    scaled_data,
+                    yss,
+                    distances,
+                    label,
+                    num_features,
+                    feature_selection=self.feature_selection,
+                )
+
+            if self.mode == "regression":
+                result.intercept[1] = result.intercept[0]
+                result.local_exp[1] = list(result.local_exp[0])
+                result.local_exp[0] = [(i, -w) for i, w in result.local_exp[1]]
+            return result
+
 
 class ModelInterpreter:
     """Interpret models using SHAP and LIME."""
 
-    def __init__(self, output_path: Optional[Path] = None):
+    def __init__(
+        self,
+        output_path: Optional[Path] = None,
+        tree_algorithm: str = "auto",
+        n_jobs: int = -1,
+        use_gpu: bool = False,
+    ):
         """
         Initialize ModelInterpreter.
 
         Args:
             output_path: Path to save interpretability results
+            tree_algorithm: FastTreeSHAP algorithm for tree models: 'v1',
+                'v2' (caches per-tree weights; faster on many samples but
+                uses more memory) or 'auto' to let FastTreeSHAP choose
+            n_jobs: Threads FastTreeSHAP uses across trees (-1 for all cores)
+            use_gpu: Explain tree models with GPUTreeSHAP when a CUDA device
+                is available (falls back to the CPU explainers otherwise)
         """
         self.output_path = output_path or Path("results/task4")
         self.output_path.mkdir(parents=True, exist_ok=True)
+        self.tree_algorithm = tree_algorithm
+        self.n_jobs = n_jobs
         self.logger = logger
+        self.use_gpu = use_gpu and gpu_available()
+        if use_gpu and not self.use_gpu:
+            self.logger.warning(
+                "GPU requested but CuPy/CUDA unavailable; using CPU SHAP"
+            )
+
+        # Fitted explainers, reused while the same model and training frame
+        # are explained again: model -> (training frame ref, explainer,
+        # method) and (id(training frame), features, mode) -> (ref, explainer)
+        self._shap_cache: "weakref.WeakKeyDictionary[Any, Tuple]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lime_cache: Dict[Tuple, Tuple[weakref.ref, Any]] = {}
+        # Preprocessed training frame per Pipeline: pipeline -> (training
+        # frame ref, transformed frame)
+        self._pipeline_cache: "weakref.WeakKeyDictionary[Any, Tuple]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _cpu_tree_explainer(self, model) -> Any:
+        """
+        Build a CPU tree explainer (FastTreeSHAP when installed).
+
+        Args:
+            model: Trained tree-based model
+
+        Returns:
+            Tree explainer
+        """
+        if FASTTREESHAP_AVAILABLE:
+            # Same values as shap.TreeExplainer, threaded over trees
+            return fasttreeshap.TreeExplainer(
+                model,
+                algorithm=self.tree_algorithm,
+                n_jobs=self.n_jobs,
+                shortcut=False,
+            )
+        return shap.TreeExplainer(model)
+
+    def _split_pipeline(
+        self,
+        pipeline: Pipeline,
+        X_train: pd.DataFrame,
+        X_test_sample: pd.DataFrame,
+        feature_names: List[str],
+    ) -> Tuple[Any, pd.DataFrame, pd.DataFrame, List[str]]:
+        """
+        Separate a Pipeline's preprocessing from its final estimator.
+
+        The explainer then works on already-preprocessed data and never
+        re-runs the preprocessing for each perturbation. The transformed
+        training frame is cached per pipeline, so the final estimator's
+        explainer is cached too.
+
+        Args:
+            pipeline: Fitted Pipeline
+            X_train: Training features
+            X_test_sample: Samples to explain
+            feature_names: List of feature names
+
+        Returns:
+            Tuple of (final estimator, transformed X_train, transformed
+            X_test_sample, transformed feature names)
+        """
+        preprocessor, estimator = pipeline[:-1], pipeline[-1]
+        try:
+            names = [str(name) for name in preprocessor.get_feature_names_out()]
+        except (AttributeError, ValueError):
+            names = None
+
+        def transform(X: pd.DataFrame) -> pd.DataFrame:
+            values = preprocessor.transform(X)
+            if sparse.issparse(values):
+                values = values.toarray()
+            return pd.DataFrame(values, columns=names, index=X.index, copy=False)
+
+        cached = self._pipeline_cache.get(pipeline)
+        if cached is not None and cached[0]() is X_train:
+            X_train_t = cached[1]
+        else:
+            X_train_t = transform(X_train)
+            self._pipeline_cache[pipeline] = (weakref.ref(X_train), X_train_t)
+        X_test_t = transform(X_test_sample)
+        if names is None:
+            names = feature_names
+        return estimator, X_train_t, X_test_t, names
+
+    def _shap_explainer(self, model, X_train: pd.DataFrame) -> Tuple[Any, str]:
+        """
+        Build the SHAP explainer for a model, or reuse the cached one.
+
+        The explainer is cached per model and reused while the same training
+        frame is passed; models are assumed not to be refitted in place.
+
+        Args:
+            model: Trained model
+            X_train: Training features
+
+        Returns:
+            Tuple of (explainer, method), method being 'gpu', 'tree',
+            'linear' or 'permutation'
+        """
+        try:
+            cached = self._shap_cache.get(model)
+        except TypeError:
+            # Unhashable or not weak-referenceable models are not cached
+            cached = None
+        if cached is not None and cached[0]() is X_train:
+            return cached[1], cached[2]
+
+        method = _explainer_kind(model)
+        explainer = None
+        if method == "tree" and self.use_gpu:
+            try:
+                explainer, method = shap.GPUTreeExplainer(model), "gpu"
+            except (AttributeError, ImportError, RuntimeError) as e:
+                self.logger.warning(f"GPUTreeExplainer failed ({e}); using CPU")
+        if method == "tree" and explainer is None:
+            explainer = self._cpu_tree_explainer(model)
+        elif method == "linear":
+            try:
+                explainer = shap.LinearExplainer(model, X_train)
+            except Exception as e:
+                self.logger.info(f"LinearExplainer failed ({e})")
+
+        if explainer is None:
+            # Model-agnostic fallback: one antithetic permutation per row
+            # costs 2 * n_features + 1 model evaluations, where
+            # KernelExplainer samples thousands of coalitions. The background
+            # rows are drawn the way the masker would draw them, but before
+            # it converts the whole training frame to an array.
+            self.logger.info("Using PermutationExplainer...")
+            background = shap.utils.sample(X_train, 100, random_state=0)
+            explainer = shap.PermutationExplainer(
+                model.predict, shap.maskers.Independent(background, max_samples=100)
+            )
+            method = "permutation"
+
+        try:
+            self._shap_cache[model] = (weakref.ref(X_train), explainer, method)
+        except TypeError:
+            pass
+        return explainer, method
 
     def shap_analysis(
         self,
@@ -48,6 +493,7 @@ class ModelInterpreter:
         model_name: str,
         task_type: str = "regression",
         max_samples: int = 100,
+        compress_shap: bool = False,
     ) -> Dict:
         """
         Perform SHAP analysis on a model.
@@ -60,6 +506,13 @@ class ModelInterpreter:
             model_name: Name of the model
             task_type: 'regression' or 'classification'
             max_samples: Maximum number of samples for SHAP (for performance)
+            compress_shap: Store the SHAP values as int16 with a per-feature
+                scale ('shap_values_q16', 'shap_scale'; see
+                ``dequantize_shap``) instead of 'shap_values'. Feature
+                importances are computed from the full-precision values.
+
+        For a ``Pipeline``, the final estimator is explained on the
+        preprocessed features (named by ``get_feature_names_out``).
 
         Returns:
             Dictionary with SHAP values and feature importance
@@ -73,34 +526,47 @@ class ModelInterpreter:
         try:
             # Limit samples for performance
             if len(X_test) > max_samples:
-                X_test_sample = X_test.sample(n=max_samples, random_state=42)
+                # Positions drawn exactly as DataFrame.sample(random_state=42)
+                # draws them, so the same rows are explained, without pandas'
+                # sampling machinery
+                positions = np.random.RandomState(42).choice(
+                    len(X_test), max_samples, replace=False
+                )
+                X_test_sample = X_test.take(positions)
             else:
                 X_test_sample = X_test
 
-            # Create SHAP explainer
-            # Use TreeExplainer for tree-based models, otherwise KernelExplainer
-            model_type = type(model).__name__.lower()
-            if (
-                "tree" in model_type
-                or "forest" in model_type
-                or "xgb" in model_type
-                or "gradient" in model_type
-            ):
-                explainer = shap.TreeExplainer(model)
-                shap_values = explainer.shap_values(X_test_sample)
-            else:
-                # For linear models, use LinearExplainer if available
+            # Explain a Pipeline's final estimator on preprocessed data
+            if isinstance(model, Pipeline) and len(model.steps) > 1:
+                model, X_train, X_test_sample, feature_names = self._split_pipeline(
+                    model, X_train, X_test_sample, feature_names
+                )
+
+            # Create (or reuse) the SHAP explainer for the model type
+            explainer, method = self._shap_explainer(model, X_train)
+            if method in ("gpu", "tree"):
+                # Tree explainers compare splits in float32 and convert their
+                # input to it; hand them a C-ordered float32 array directly
+                # (also keeps pandas out of the host-to-device copy)
+                X_explain = np.ascontiguousarray(
+                    X_test_sample.to_numpy(dtype=np.float32)
+                )
+            if method == "gpu":
                 try:
-                    explainer = shap.LinearExplainer(model, X_train)
-                    shap_values = explainer.shap_values(X_test_sample)
-                except:
-                    # Fallback to KernelExplainer (slower)
-                    self.logger.info("Using KernelExplainer (this may take a while)...")
-                    explainer = shap.KernelExplainer(
-                        model.predict,
-                        X_train.sample(n=min(100, len(X_train)), random_state=42),
-                    )
-                    shap_values = explainer.shap_values(X_test_sample)
+                    # One CUDA thread per (sample, tree) path
+                    shap_values = explainer.shap_values(X_explain)
+                except RuntimeError as e:
+                    self.logger.warning(f"GPUTreeExplainer failed ({e}); using CPU")
+                    explainer = self._cpu_tree_explainer(model)
+                    shap_values = explainer.shap_values(X_explain)
+            elif method == "tree":
+                shap_values = explainer.shap_values(X_explain)
+            elif method == "permutation":
+                shap_values = explainer(
+                    X_test_sample, max_evals=2 * X_test_sample.shape[1] + 1
+                ).values
+            else:
+                shap_values = explainer.shap_values(X_test_sample)
 
             # Handle multi-output (classification)
             if isinstance(shap_values, list):
@@ -113,20 +579,25 @@ class ModelInterpreter:
             feature_importance = pd.DataFrame(
                 {
                     "feature": feature_names[: shap_values.shape[1]],
-                    "importance": np.abs(shap_values).mean(axis=0),
+                    "importance": column_mean_abs(shap_values),
                 }
             ).sort_values("importance", ascending=False)
 
             # Get top features
-            top_features = feature_importance.head(10).to_dict("records")
+            top_features = _top_records(feature_importance)
 
             results = {
-                "shap_values": shap_values,
                 "explainer": explainer,
                 "feature_importance": feature_importance,
                 "top_features": top_features,
                 "X_test_sample": X_test_sample,
             }
+            if compress_shap:
+                quantized, scale = _quantize_shap(shap_values)
+                results["shap_values_q16"] = quantized
+                results["shap_scale"] = scale
+            else:
+                results["shap_values"] = shap_values
 
             self.logger.info(
                 f"SHAP analysis complete. Top feature: {top_features[0]['feature']}"
@@ -137,6 +608,44 @@ class ModelInterpreter:
             self.logger.error(f"Error in SHAP analysis: {e}")
             return None
 
+    def _lime_explainer(
+        self, X_train: pd.DataFrame, feature_names: List[str], mode: str
+    ) -> Any:
+        """
+        Build the LIME explainer for a training frame, or reuse the cached one.
+
+        A reused explainer is re-seeded, so every analysis draws the same
+        perturbations as a freshly built explainer would.
+
+        Args:
+            X_train: Training features
+            feature_names: List of feature names
+            mode: 'regression' or 'classification'
+
+        Returns:
+            Batched LimeTabularExplainer fitted on ``X_train``
+        """
+        key = (id(X_train), tuple(feature_names), mode)
+        cached = self._lime_cache.get(key)
+        if cached is not None and cached[0]() is X_train:
+            explainer = cached[1]
+            # The sampler, discretizer and surrogate share this RandomState
+            explainer.random_state.seed(LIME_RANDOM_STATE)
+            return explainer
+
+        explainer = _BatchLimeExplainer(
+            X_train.values,
+            feature_names=feature_names,
+            mode=mode,
+            random_state=LIME_RANDOM_STATE,
+        )
+        # Drop entries whose training frame is gone (its id may be reused)
+        self._lime_cache = {
+            k: v for k, v in self._lime_cache.items() if v[0]() is not None
+        }
+        self._lime_cache[key] = (weakref.ref(X_train), explainer)
+        return explainer
+
     def lime_analysis(
         self,
         model,
@@ -169,14 +678,9 @@ class ModelInterpreter:
         self.logger.info(f"Performing LIME analysis for {model_name}...")
 
         try:
-            # Create LIME explainer
+            # Create (or reuse) the LIME explainer
             mode = "regression" if task_type == "regression" else "classification"
-            explainer = lime_tabular.LimeTabularExplainer(
-                X_train.values,
-                feature_names=feature_names,
-                mode=mode,
-                random_state=42,
-            )
+            explainer = self._lime_explainer(X_train, feature_names, mode)
 
             # Explain a few samples
             explanations = []
@@ -184,12 +688,11 @@ class ModelInterpreter:
                 len(X_test), size=min(num_samples, len(X_test)), replace=False
             )
 
-            for idx in sample_indices:
-                explanation = explainer.explain_instance(
-                    X_test.iloc[idx].values,
-                    model.predict,
-                    num_features=10,
-                )
+            # All perturbations go through model.predict in one batch
+            batch = explainer.explain_batch(
+                X_test.iloc[sample_indices].to_numpy(), model.predict, num_features=10
+            )
+            for idx, explanation in zip(sample_indices, batch):
                 explanations.append(
                     {
                         "index": idx,
@@ -198,29 +701,27 @@ class ModelInterpreter:
                     }
                 )
 
-            # Aggregate feature importance across samples
-            all_features = {}
-            for exp in explanations:
-                for feature, importance in exp["feature_importance"]:
-                    if feature not in all_features:
-                        all_features[feature] = []
-                    all_features[feature].append(abs(importance))
-
-            # Average importance per feature
-            avg_importance = {
-                feat: np.mean(imps) for feat, imps in all_features.items()
-            }
+            # Aggregate feature importance across samples: flatten the
+            # (feature, weight) pairs once, then average |weight| per feature
+            features = [f for exp in explanations for f, _ in exp["feature_importance"]]
+            weights = [w for exp in explanations for _, w in exp["feature_importance"]]
+            avg_importance = (
+                pd.Series(weights, index=features, dtype=np.float64)
+                .abs()
+                .groupby(level=0, sort=False)
+                .mean()
+            )
             feature_importance = pd.DataFrame(
                 {
-                    "feature": list(avg_importance.keys()),
-                    "importance": list(avg_importance.values()),
+                    "feature": avg_importance.index,
+                    "importance": avg_importance.to_numpy(),
                 }
             ).sort_values("importance", ascending=False)
 
             results = {
                 "explanations": explanations,
                 "feature_importance": feature_importance,
-                "top_features": feature_importance.head(10).to_dict("records"),
+                "top_features": _top_records(feature_importance),
             }
 
             self.logger.info("LIME analysis complete")
@@ -247,58 +748,37 @@ class ModelInterpreter:
         Returns:
             List of top features with importance scores
         """
-        features_dict = {}
-
-        # Add SHAP features
-        if shap_results and "top_features" in shap_results:
-            for feat in shap_results["top_features"]:
-                feat_name = feat["feature"]
-                if feat_name not in features_dict:
-                    features_dict[feat_name] = {
-                        "shap_importance": 0,
-                        "lime_importance": 0,
-                    }
-                features_dict[feat_name]["shap_importance"] = feat["importance"]
-
-        # Add LIME features
-        if lime_results and "top_features" in lime_results:
-            for feat in lime_results["top_features"]:
-                feat_name = feat["feature"]
-                if feat_name not in features_dict:
-                    features_dict[feat_name] = {
-                        "shap_importance": 0,
-                        "lime_importance": 0,
-                    }
-                features_dict[feat_name]["lime_importance"] = feat["importance"]
-
-        # Combine and rank
+        # Feature -> [SHAP importance, LIME importance], merged in one pass
+        importances: Dict[str, List[float]] = {}
+        for results, slot in ((shap_results, 0), (lime_results, 1)):
+            if results and "top_features" in results:
+                for feat in results["top_features"]:
+                    scores = importances.setdefault(feat["feature"], [0, 0])
+                    scores[slot] = feat["importance"]
+
+        def combined(item: Tuple[str, List[float]]) -> float:
+            # Average importance if both available, otherwise the available one
+            shap_importance, lime_importance = item[1]
+            if shap_importance > 0 and lime_importance > 0:
+                return (shap_importance + lime_importance) / 2
+            if shap_importance > 0:
+                return shap_importance
+            return lime_importance
+
+        # Only the top_n entries are ordered (ties keep first-seen order,
+        # as with a stable sort)
         top_features = []
-        for feat_name, importances in features_dict.items():
-            # Average importance if both available, otherwise use available one
-            if (
-                importances["shap_importance"] > 0
-                and importances["lime_importance"] > 0
-            ):
-                avg_importance = (
-                    importances["shap_importance"] + importances["lime_importance"]
-                ) / 2
-            elif importances["shap_importance"] > 0:
-                avg_importance = importances["shap_importance"]
-            else:
-                avg_importance = importances["lime_importance"]
-
+        for item in heapq.nlargest(top_n, importances.items(), key=combined):
+            feat_name, (shap_importance, lime_importance) = item
             top_features.append(
                 {
                     "feature": feat_name,
-                    "shap_importance": importances["shap_importance"],
-                    "lime_importance": importances["lime_importance"],
-                    "combined_importance": avg_importance,
+                    "shap_importance": shap_importance,
+                    "lime_importance": lime_importance,
+                    "combined_importance": combined(item),
                 }
             )
-
-        # Sort by combined importance
-        top_features.sort(key=lambda x: x["combined_importance"], reverse=True)
-        return top_features[:top_n]
+        return top_features
 
     def interpret_model(
         self,
@@ -308,6 +788,7 @@ class ModelInterpreter:
         feature_names: List[str],
         model_name: str,
         task_type: str = "regression",
+        concurrent: bool = True,
     ) -> Dict:
         """
         Perform full interpretability analysis (SHAP + LIME).
@@ -319,6 +800,9 @@ class ModelInterpreter:
             feature_names: List of feature names
             model_name: Name of the model
             task_type: 'regression' or 'classification'
+            concurrent: Run SHAP and LIME in two threads (both spend most of
+                their time in GIL-releasing native code). Set to False for
+                models whose ``predict`` is not safe to call concurrently.
 
         Returns:
             Dictionary with all interpretability results
@@ -333,19 +817,25 @@ class ModelInterpreter:
             "top_features": [],
         }
 
-        # SHAP analysis
+        # SHAP and LIME analyses are independent (each handles its own
+        # errors), so they can overlap
+        analyses = {}
         if SHAP_AVAILABLE:
-            shap_results = self.shap_analysis(
-                model, X_train, X_test, feature_names, model_name, task_type
-            )
-            results["shap_results"] = shap_results
-
-        # LIME analysis
+            analyses["shap_results"] = self.shap_analysis
         if LIME_AVAILABLE:
-            lime_results = self.lime_analysis(
-                model, X_train, X_test, feature_names, model_name, task_type
-            )
-            results["lime_results"] = lime_results
+            analyses["lime_results"] = self.lime_analysis
+        args = (model, X_train, X_test, feature_names, model_name, task_type)
+        if concurrent and len(analyses) > 1:
+            with ThreadPoolExecutor(max_workers=len(analyses)) as pool:
+                futures = {
+                    key: pool.submit(analysis, *args)
+                    for key, analysis in analyses.items()
+                }
+                for key, future in futures.items():
+                    results[key] = future.result()
+        else:
+            for key, analysis in analyses.items():
+                results[key] = analysis(*args)
 
         # Get top features
         results["top_features"] = self.get_top_features(
@@ -58,7 +58,10 @@ class Task4Runner:
             test_size=self.test_size,
         )
         self.model_trainer = ModelTrainer(random_state=self.random_state)
-        self.interpreter = ModelInterpreter(output_path=self.task4_results_path)
+        self.interpreter = ModelInterpreter(
+            output_path=self.task4_results_path,
+            use_gpu=self.task4_config.get("use_gpu", False),
+        )
         self.report_generator = ReportGenerator(output_path=self.task4_reports_path)
 
     def run_severity_modeling(self, datasets: Dict) -> Dict:
@@ -294,7 +297,11 @@ class Task4Runner:
         )
         if use_sample:
             self.logger.info(f"Using sample dataset: {data_filename}")
-        datasets = self.data_preprocessor.full_pipeline(filename=data_filename)
+        cache_dir = self.task4_config.get("cache_dir")
+        datasets = self.data_preprocessor.full_pipeline(
+            filename=data_filename,
+            cache_dir=Path(cache_dir) if cache_dir else None,
+        )
 
         # Step 2: Model training
         self.logger.info("\n" + "=" * 80)
@@ -0,0 +1,164 @@
+"""Memory-mapped, multi-process reader for large delimited files.
+
+The production dataset (``MachineLearningRating_v3.txt``) is a single large
+pipe-delimited file. ``read_pipe_mmap`` splits it into byte ranges, moves each
+boundary forward to the next newline so no record is cut in half ("skip and
+overlap"), and parses the ranges in parallel worker processes with the PyArrow
+CSV reader. The header is parsed once and broadcast to every worker together
+with the schema inferred for the first chunk, so all chunks concatenate into a
+single consistent table.
+"""
+
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
+from src.data.loaders import (
+    arrow_column_types,
+    arrow_convert_options,
+    arrow_types_mapper,
+    text_temporal_columns,
+)
+
+# Chunks smaller than this are not worth shipping to a separate process
+MIN_CHUNK_BYTES: int = 1 << 20
+
+
+def _chunk_boundaries(
+    mm: mmap.mmap, start: int, n_chunks: int
+) -> List[Tuple[int, int]]:
+    """Split ``mm[start:]`` into byte ranges that end on line boundaries.
+
+    Args:
+        mm: Memory-mapped file.
+        start: Offset of the first data byte (just past the header line).
+        n_chunks: Desired number of chunks.
+
+    Returns:
+        List of ``(begin, end)`` offsets covering the data section.
+    """
+    size = len(mm)
+    step = max((size - start) // max(n_chunks, 1), MIN_CHUNK_BYTES)
+    bounds = []
+    pos = start
+    while pos < size:
+        end = min(pos + step, size)
+        if end < size:
+            newline = mm.find(b"\n", end)
+            end = size if newline == -1 else newline + 1
+        bounds.append((pos, end))
+        pos = end
+    return bounds
+
+
+def _parse_chunk(
+    path: str,
+    begin: int,
+    end: int,
+    sep: str,
+    column_names: List[str],
+    column_types: Dict[str, Any],
+) -> "pa.Table":
+    """Parse one byte range of the file into an Arrow table (worker entry point)."""
+    with open(path, "rb") as fh:
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            buffer = pa.py_buffer(mm[begin:end])
+    return pacsv.read_csv(
+        pa.BufferReader(buffer),
+        read_options=pacsv.ReadOptions(column_names=column_names),
+        parse_options=pacsv.ParseOptions(delimiter=sep),
+        convert_options=arrow_convert_options(column_types),
+    )
+
+
+def read_pipe_mmap(
+    path: Union[str, Path],
+    n_workers: Optional[int] = None,
+    sep: str = "|",
+    dtype: Optional[Dict[str, Any]] = None,
+    dtype_backend: Optional[str] = None,
+) -> pd.DataFrame:
+    """Load a delimited file by parsing line-aligned chunks in parallel.
+
+    Args:
+        path: Path to the delimited file (must start with a header line).
+        n_workers: Number of worker processes. Defaults to ``os.cpu_count()``.
+        sep: Column separator (default ``|``).
+        dtype: Optional mapping of column name to NumPy dtype or
+            ``"category"``.
+        dtype_backend: ``"pyarrow"`` returns ``pd.ArrowDtype`` columns.
+
+    Returns:
+        Loaded DataFrame.
+
+    Raises:
+        FileNotFoundError: If *path* does not exist.
+        ValueError: If the file is empty or the chunks cannot be combined.
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"CSV file not found: {path}")
+    if path.stat().st_size == 0:
+        raise ValueError(f"CSV file is empty: {path}")
+
+    n_workers = n_workers or os.cpu_count() or 1
+
+    with open(path, "rb") as fh:
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            header_end = mm.find(b"\n")
+            header_end = len(mm) if header_end == -1 else header_end + 1
+            header = mm[:header_end].decode("utf-8").rstrip("\r\n")
+            bounds = _chunk_boundaries(mm, header_end, n_workers)
+
+    column_names = header.split(sep)
+    column_types = arrow_column_types(dtype)
+    if not bounds:
+        return pd.DataFrame(columns=column_names)
+
+    # Parse the first chunk up front and broadcast its schema so that every
+    # worker produces identically typed columns.
+    first = _parse_chunk(str(path), *bounds[0], sep, column_names, column_types)
+    text_types = text_temporal_columns(first.schema, column_types)
+    if text_types != column_types:
+        # Date columns stay text, as pd.read_csv leaves them
+        column_types = text_types
+        first = _parse_chunk(str(path), *bounds[0], sep, column_names, column_types)
+    for field in first.schema:
+        if field.name not in column_types and not pa.types.is_null(field.type):
+            column_types[field.name] = field.type
+
+    tables = [first]
+    try:
+        if len(bounds) > 1:
+            n_procs = min(n_workers, len(bounds) - 1)
+            with ProcessPoolExecutor(max_workers=n_procs) as pool:
+                futures = [
+                    pool.submit(
+                        _parse_chunk,
+                        str(path),
+                        begin,
+                        end,
+                        sep,
+                        column_names,
+                        column_types,
+                    )
+                    for begin, end in bounds[1:]
+                ]
+                tables.extend(future.result() for future in futures)
+        # Each chunk builds its own dictionaries for categorical columns
+        table = pa.concat_tables(tables, promote_options="default")
+        table = table.unify_dictionaries()
+    except pa.ArrowInvalid as exc:
+        raise ValueError(f"Failed to combine chunks of {path}: {exc}") from exc
+
+    return table.to_pandas(
+        self_destruct=True,
+        split_blocks=True,
+        types_mapper=arrow_types_mapper(dtype_backend),
+    )
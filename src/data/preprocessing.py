@@ -41,17 +41,27 @@ def handle_missing_values(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with no missing values.
     """
-    df = df.copy()
-    for col in df.columns:
-        if df[col].isnull().sum() == 0:
-            continue
-        if df[col].dtype in ("int64", "float64"):
-            df[col] = df[col].fillna(df[col].median())
-        else:
-            mode_vals = df[col].mode()
-            fill = mode_vals.iloc[0] if len(mode_vals) > 0 else MISSING_CATEGORY_FILL
-            df[col] = df[col].fillna(fill)
-    return df
+    has_missing = df.isna().any()
+    missing_cols = has_missing.index[has_missing]
+    if len(missing_cols) == 0:
+        return df.copy()
+
+    numeric = [
+        col
+        for col in missing_cols
+        if pd.api.types.is_numeric_dtype(df[col])
+        and not pd.api.types.is_bool_dtype(df[col])
+    ]
+    other = missing_cols.difference(numeric, sort=False)
+
+    fill_values = df[numeric].median().to_dict() if numeric else {}
+    if len(other) > 0:
+        modes = df[other].mode()
+        first_mode = modes.iloc[0] if len(modes) > 0 else pd.Series(index=other)
+        for col in other:
+            mode = first_mode[col]
+            fill_values[col] = MISSING_CATEGORY_FILL if pd.isna(mode) else mode
+    return df.fillna(fill_values)
 
 
 def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
@@ -143,6 +153,23 @@ def split_data(
     return train_test_split(X, y, test_size=test_size, random_state=random_state)
 
 
+def preprocess_features(df: pd.DataFrame) -> pd.DataFrame:
+    """Target-independent preprocessing: clean -> engineer -> encode.
+
+    The result can be shared by several targets; pass it to
+    :func:`prepare_features_target` and :func:`split_data` for each one.
+
+    Args:
+        df: Raw DataFrame.
+
+    Returns:
+        Cleaned, feature-engineered and label-encoded DataFrame.
+    """
+    df = handle_missing_values(df)
+    df = engineer_features(df)
+    return encode_categoricals(df)
+
+
 def run_preprocessing_pipeline(
     df: pd.DataFrame,
     target_col: str = "TotalPremium",
@@ -162,8 +189,6 @@ def run_preprocessing_pipeline(
     Returns:
         (X_train, X_test, y_train, y_test)
     """
-    df = handle_missing_values(df)
-    df = engineer_features(df)
-    df = encode_categoricals(df)
+    df = preprocess_features(df)
     X, y = prepare_features_target(df, target_col, filter_positive)
     return split_data(X, y, test_size=test_size, random_state=random_state)
@@ -5,10 +5,12 @@ Uses the synthetic fixture CSV — never touches DVC data.
 
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest
 
-from src.data.loaders import load_insurance_data
+from src.data import fast_csv
+from src.data.loaders import INSURANCE_COLUMN_TYPES, DataLoader, load_insurance_data
 from src.data.preprocessing import (
     encode_categoricals,
     engineer_features,
@@ -35,6 +37,110 @@ class TestLoadInsuranceData:
             load_insurance_data(file_path=tmp_path / "nonexistent.csv")
 
 
+class TestDataLoader:
+    """Tests for the class-based loader."""
+
+    def test_pyarrow_engine_matches_pandas(self, sample_csv_path: Path) -> None:
+        """Arrow engine returns the same values with the requested dtypes."""
+        loader = DataLoader()
+        expected = loader.load_csv(sample_csv_path)
+        df = loader.load_csv(
+            sample_csv_path, engine="pyarrow", dtype=INSURANCE_COLUMN_TYPES
+        )
+        assert df["TotalClaims"].dtype == np.float32
+        assert df["PostalCode"].dtype == np.int32
+        assert isinstance(df["Province"].dtype, pd.CategoricalDtype)
+        pd.testing.assert_frame_equal(
+            df,
+            expected,
+            check_dtype=False,
+            check_categorical=False,
+            check_exact=False,
+            rtol=1e-6,
+        )
+
+    def test_pyarrow_dtype_backend(self, sample_csv_path: Path) -> None:
+        """Arrow dtype backend keeps columns as ``pd.ArrowDtype``."""
+        df = DataLoader().load_csv(
+            sample_csv_path,
+            engine="pyarrow",
+            dtype=INSURANCE_COLUMN_TYPES,
+            dtype_backend="pyarrow",
+        )
+        assert isinstance(df["TotalClaims"].dtype, pd.ArrowDtype)
+        assert df["TotalClaims"].to_numpy(dtype=np.float32).dtype == np.float32
+
+    def test_pyarrow_engine_blank_fields_are_missing(self, tmp_path: Path) -> None:
+        """Blank string fields load as NA and dates stay text, as with pandas."""
+        path = tmp_path / "blanks.txt"
+        path.write_text(
+            "PolicyID|Gender|Bank|TransactionMonth|TotalClaims\n"
+            "1||ABSA|2015-03-01 00:00:00|0.0\n"
+            "2|Male||2015-04-01 00:00:00|\n"
+            '3|""|FNB|2015-05-01 00:00:00|12.5\n'
+        )
+        loader = DataLoader()
+        expected = loader.load_csv(path, sep="|", dtype=INSURANCE_COLUMN_TYPES)
+        df = loader.load_csv(
+            path, sep="|", engine="pyarrow", dtype=INSURANCE_COLUMN_TYPES
+        )
+        assert df["Gender"].isna().tolist() == [True, False, True]
+        assert df["Bank"].isna().tolist() == [False, True, False]
+        assert df["TransactionMonth"].tolist() == expected["TransactionMonth"].tolist()
+        pd.testing.assert_frame_equal(df.isna(), expected.isna())
+        pd.testing.assert_frame_equal(
+            df.astype(object).where(df.notna()),
+            expected.astype(object).where(expected.notna()),
+        )
+
+    def test_pyarrow_engine_honours_other_kwargs(self, sample_csv_path: Path) -> None:
+        """Keywords the Arrow reader does not support use the pandas engine."""
+        df = DataLoader().load_csv(
+            sample_csv_path,
+            engine="pyarrow",
+            dtype=INSURANCE_COLUMN_TYPES,
+            usecols=["PolicyID", "Province", "TotalClaims"],
+            nrows=5,
+        )
+        assert df.columns.tolist() == ["PolicyID", "Province", "TotalClaims"]
+        assert len(df) == 5
+        assert df["TotalClaims"].dtype == np.float32
+        assert isinstance(df["Province"].dtype, pd.CategoricalDtype)
+
+
+class TestReadPipeMmap:
+    """Tests for the parallel mmap reader."""
+
+    def test_chunked_read_matches_single_read(
+        self, sample_csv_path: Path, tmp_path: Path, monkeypatch
+    ) -> None:
+        """Line-aligned chunks reassemble into the original frame."""
+        expected = load_insurance_data(file_path=sample_csv_path, sep=",")
+        pipe_path = tmp_path / "pipe.txt"
+        expected.to_csv(pipe_path, sep="|", index=False)
+
+        monkeypatch.setattr(fast_csv, "MIN_CHUNK_BYTES", 64)
+        df = fast_csv.read_pipe_mmap(pipe_path, n_workers=3)
+        pd.testing.assert_frame_equal(df, expected)
+
+    def test_blank_fields_are_missing(self, tmp_path: Path) -> None:
+        """Blank string fields load as NA and dates stay text."""
+        path = tmp_path / "blanks.txt"
+        path.write_text(
+            "PolicyID|Gender|TransactionMonth\n"
+            "1||2015-03-01 00:00:00\n"
+            "2|Male|2015-04-01 00:00:00\n"
+            "3|Female|\n"
+        )
+        df = fast_csv.read_pipe_mmap(path, dtype={"Gender": "category"})
+        assert df["Gender"].isna().tolist() == [True, False, False]
+        assert df["TransactionMonth"].tolist() == [
+            "2015-03-01 00:00:00",
+            "2015-04-01 00:00:00",
+            None,
+        ]
+
+
 class TestPreprocessing:
     """Tests for preprocessing functions."""
 
@@ -0,0 +1,111 @@
+"""Tests for the Task 3 statistical testing utilities.
+
+All data is generated in-memory — no file I/O, no DVC dependency.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.task3.statistical_tests import StatisticalTester
+
+
+@pytest.fixture
+def claim_samples():
+    """Two lognormal claim-amount samples rounded to cents."""
+    rng = np.random.default_rng(0)
+    group_a = np.round(rng.lognormal(5.0, 1.2, size=20_000) * 20, 2)
+    group_b = np.round(rng.lognormal(5.02, 1.2, size=18_000) * 20, 2)
+    return group_a, group_b
+
+
+class TestFloat32Precision:
+    """p-value stability under float32 input."""
+
+    @pytest.mark.parametrize("test_name", ["t_test", "mannwhitney_u_test"])
+    def test_p_value_delta(self, claim_samples, test_name: str) -> None:
+        """float32 inputs change p-values by less than 1e-6."""
+        group_a, group_b = claim_samples
+        test = getattr(StatisticalTester(), test_name)
+        p64 = test(group_a, group_b)["p_value"]
+        p32 = test(group_a.astype(np.float32), group_b.astype(np.float32))["p_value"]
+        assert abs(p64 - p32) < 1e-6
+
+
+class TestMissingValues:
+    """Missing values are dropped from NumPy, nullable and Arrow-backed input."""
+
+    @pytest.mark.parametrize("dtype", ["Float64", "double[pyarrow]"])
+    @pytest.mark.parametrize("test_name", ["t_test", "mannwhitney_u_test"])
+    def test_na_matches_nan(self, claim_samples, dtype: str, test_name: str) -> None:
+        """``pd.NA`` gives the same result as NaN in a float64 Series."""
+        group_a, group_b = claim_samples
+        with_nan = pd.Series(group_a)
+        with_nan[::7] = np.nan
+        test = getattr(StatisticalTester(), test_name)
+
+        expected = test(with_nan, group_b)
+        result = test(with_nan.astype(dtype), pd.Series(group_b, dtype=dtype))
+
+        assert result["n_a"] == with_nan.count()
+        assert result["p_value"] == pytest.approx(expected["p_value"])
+
+    @pytest.mark.parametrize("dtype", ["boolean", "bool[pyarrow]"])
+    def test_chi_square_na_indicators(self, dtype: str) -> None:
+        """Missing claim indicators are dropped before counting."""
+        group_a = pd.Series([True, None, False, True, False], dtype=dtype)
+        group_b = pd.Series([False, False, None, True, False], dtype=dtype)
+
+        result = StatisticalTester().chi_square_test(group_a, group_b)
+
+        assert result["contingency_table"] == {
+            "No Claim": {"Group A": 2, "Group B": 3},
+            "Claim": {"Group A": 2, "Group B": 1},
+        }
+
+
+class TestNormality:
+    """Normality checks used to choose between t-test and Mann-Whitney."""
+
+    def test_large_sample_uses_normaltest(self, claim_samples) -> None:
+        """Samples above the Shapiro limit are tested in full."""
+        group_a, _ = claim_samples
+        tester = StatisticalTester()
+        result = tester.check_normality(group_a)
+        assert result["test"] == "normaltest"
+        assert not result["is_normal"]
+
+    def test_sample_changed_in_place_is_retested(self, claim_samples) -> None:
+        """A sample edited in place between calls gets a fresh result."""
+        group_a, _ = claim_samples
+        tester = StatisticalTester()
+        assert not tester.check_normality(group_a)["is_normal"]
+
+        group_a[:] = np.random.default_rng(1).normal(size=group_a.size)
+        assert tester.check_normality(group_a)["is_normal"]
+
+
+class TestProportion:
+    """Chi-square test on precomputed claim counts."""
+
+    def test_matches_indicator_arrays(self) -> None:
+        """Counts give the same result as the equivalent 0/1 arrays."""
+        tester = StatisticalTester()
+        freq_a = np.array([1] * 30 + [0] * 70)
+        freq_b = np.array([1] * 45 + [0] * 55)
+        from_arrays = tester.chi_square_test(freq_a, freq_b)
+        from_counts = tester.test_proportion(100, 30, 100, 45)
+        assert from_counts["p_value"] == pytest.approx(from_arrays["p_value"])
+
+    def test_rejects_non_binary_input(self) -> None:
+        """Values other than 0/1 are an error rather than counted as no claim."""
+        with pytest.raises(ValueError, match="binary"):
+            StatisticalTester().chi_square_test(
+                np.array([0.0, 1.0, 2.5]), np.array([0, 1, 1])
+            )
+
+    def test_degenerate_table(self) -> None:
+        """No claims in either group returns the insufficient-data result."""
+        result = StatisticalTester().test_proportion(100, 0, 100, 0)
+        assert result["p_value"] == 1.0
+        assert not result["reject_null"]
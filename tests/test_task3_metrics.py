@@ -0,0 +1,74 @@
+"""Tests for the Task 3 metric calculator.
+
+All data is generated in-memory — no file I/O, no DVC dependency.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.task3.metrics import MetricCalculator
+
+
+@pytest.fixture
+def policies() -> pd.DataFrame:
+    """Policies with missing group keys, missing claims and a zero premium."""
+    rng = np.random.default_rng(0)
+    n = 2_000
+    df = pd.DataFrame(
+        {
+            "Province": rng.choice(["Gauteng", "Limpopo", "WesternCape"], size=n),
+            "TotalPremium": rng.uniform(400, 3500, size=n).astype(np.float32),
+            "TotalClaims": np.where(
+                rng.random(n) < 0.3, rng.uniform(10, 2500, size=n), 0.0
+            ).astype(np.float32),
+        }
+    )
+    df.loc[:4, "Province"] = np.nan
+    df.loc[10:14, "TotalClaims"] = np.nan
+    df.loc[20, "TotalPremium"] = 0.0
+    return df
+
+
+class TestGroupMetrics:
+    """Group-level metrics must match a plain pandas groupby."""
+
+    def test_matches_groupby(self, policies: pd.DataFrame) -> None:
+        """Frequency, severity, margin and loss ratio agree with groupby."""
+        grouped = policies.groupby("Province", sort=False)
+        claims = grouped["TotalClaims"].sum().astype(np.float64)
+        premium = grouped["TotalPremium"].sum().astype(np.float64)
+        n_claims = (policies["TotalClaims"] > 0).groupby(policies["Province"]).sum()
+        expected = {
+            "claim_frequency": claims / grouped.size(),
+            "claim_severity": claims / n_claims,
+            "margin": premium - claims,
+            "loss_ratio": claims / premium,
+        }
+
+        metrics = MetricCalculator().compute_all_metrics(policies, "Province")
+
+        for name, series in expected.items():
+            pd.testing.assert_series_equal(
+                metrics[name].sort_index(),
+                series.sort_index(),
+                check_names=False,
+                rtol=1e-5,
+            )
+
+
+class TestGroupTotals:
+    """Totals of one group skip missing amounts like ``Series.sum()``."""
+
+    def test_missing_amounts_are_skipped(self, policies: pd.DataFrame) -> None:
+        """A NaN claim or premium does not make the group totals NaN."""
+        policies.loc[30, "TotalPremium"] = np.nan
+        metrics = MetricCalculator().compute_all_from_arrays(
+            policies["TotalClaims"].to_numpy(), policies["TotalPremium"].to_numpy()
+        )
+        assert metrics["claim_sum"] == pytest.approx(
+            policies["TotalClaims"].astype(np.float64).sum()
+        )
+        assert metrics["premium_sum"] == pytest.approx(
+            policies["TotalPremium"].astype(np.float64).sum()
+        )
@@ -0,0 +1,288 @@
+"""Unit tests for the Task 4 data preparation pipeline."""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.model_selection import train_test_split
+
+from src.analysis.task4 import data_preparation
+from src.analysis.task4.data_preparation import DataPreprocessor
+
+DATA_FILE = "MachineLearningRating_v3.txt"
+
+
+@pytest.fixture
+def data_dir(tmp_path, sample_csv_path):
+    """Directory holding the sample data as a pipe-separated data file."""
+    pd.read_csv(sample_csv_path).to_csv(tmp_path / DATA_FILE, sep="|", index=False)
+    return tmp_path
+
+
+@pytest.fixture
+def categorical_frame():
+    """String columns stored as object (with a missing value) and category."""
+    return pd.DataFrame(
+        {
+            "Province": ["Gauteng", "WesternCape", None, "Gauteng", "EasternCape"],
+            "Gender": pd.Categorical(["Male", "Female", "Female", "Male", "Male"]),
+            "Age": [35, 28, 45, 52, 30],
+        }
+    )
+
+
+@pytest.fixture
+def blank_fields_dir(tmp_path):
+    """Data file with blank string fields and a date column."""
+    (tmp_path / DATA_FILE).write_text(
+        "PolicyID|TransactionMonth|Province|PostalCode|Gender|Bank|Age"
+        "|TotalPremium|TotalClaims\n"
+        "1|2015-03-01 00:00:00|Gauteng|2001||ABSA|35|100.5|0\n"
+        "2|2015-04-01 00:00:00||7001|Male||28|90|10\n"
+        "3|2015-03-01 00:00:00|Gauteng|2002|Female|FNB|45|120|0\n"
+    )
+    return tmp_path
+
+
+def _encoded(preprocessor, **load_options):
+    """Load, impute, engineer and encode the data file."""
+    df = preprocessor.load_data(**load_options)
+    df = preprocessor.handle_missing_values(df)
+    df = preprocessor.engineer_features(df)
+    return preprocessor.encode_categorical(df)
+
+
+def _assert_datasets_equal(result, expected):
+    """Assert two ``full_pipeline`` results hold the same frames and targets."""
+    assert result.keys() == expected.keys()
+    for name in expected:
+        for got, want in zip(result[name], expected[name]):
+            if isinstance(want, pd.DataFrame):
+                pd.testing.assert_frame_equal(got, want)
+            else:
+                pd.testing.assert_series_equal(got, want)
+
+
+@pytest.mark.parametrize("encoding_method", ["label", "onehot"])
+def test_parquet_cache_hit_matches_miss(data_dir, encoding_method, monkeypatch):
+    """A cached frame gives the same datasets as preparing from the data file."""
+    cache_dir = data_dir / "cache"
+    miss = DataPreprocessor(data_dir).full_pipeline(
+        encoding_method=encoding_method, cache_dir=cache_dir
+    )
+    assert len(list(cache_dir.glob("*.parquet"))) == 1
+
+    def fail_load(*args, **kwargs):
+        raise AssertionError("cache hit should not load the data file")
+
+    monkeypatch.setattr(DataPreprocessor, "load_data", fail_load)
+    hit = DataPreprocessor(data_dir).full_pipeline(
+        encoding_method=encoding_method, cache_dir=cache_dir
+    )
+
+    _assert_datasets_equal(hit, miss)
+
+
+def test_parquet_cache_skipped_for_sparse_onehot(data_dir):
+    """Sparse one-hot frames are never written to or read from the cache."""
+    cache_dir = data_dir / "cache"
+    expected = DataPreprocessor(data_dir).full_pipeline(sparse_onehot=True)
+
+    for _ in range(2):
+        result = DataPreprocessor(data_dir).full_pipeline(
+            sparse_onehot=True, cache_dir=cache_dir
+        )
+        _assert_datasets_equal(result, expected)
+
+    assert not cache_dir.exists()
+
+
+def test_parquet_cache_replaced_when_data_changes(data_dir):
+    """A changed data file is re-prepared and its stale cache removed."""
+    cache_dir = data_dir / "cache"
+    DataPreprocessor(data_dir).full_pipeline(cache_dir=cache_dir)
+    (stale,) = cache_dir.glob("*.parquet")
+
+    stat = (data_dir / DATA_FILE).stat()
+    os.utime(data_dir / DATA_FILE, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    DataPreprocessor(data_dir).full_pipeline(cache_dir=cache_dir)
+
+    (fresh,) = cache_dir.glob("*.parquet")
+    assert fresh != stale
+
+
+def test_onehot_matches_get_dummies(categorical_frame):
+    """One-hot indicators gathered by code equal ``pd.get_dummies``."""
+    result = DataPreprocessor().encode_categorical(categorical_frame)
+
+    expected = pd.concat(
+        [
+            categorical_frame[["Age"]],
+            pd.get_dummies(
+                categorical_frame[["Province", "Gender"]].astype(str), dtype=np.int8
+            ),
+        ],
+        axis=1,
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_onehot_unseen_level_is_all_zero(categorical_frame):
+    """Levels unseen by a fitted encoder get no indicator."""
+    preprocessor = DataPreprocessor()
+    preprocessor.encode_categorical(categorical_frame)
+    new = pd.DataFrame({"Province": ["Limpopo", "Gauteng"]})
+
+    result = preprocessor.encode_categorical(new)
+
+    assert result.columns.tolist() == [
+        "Province_EasternCape",
+        "Province_Gauteng",
+        "Province_None",
+        "Province_WesternCape",
+    ]
+    assert result.to_numpy().tolist() == [[0, 0, 0, 0], [0, 1, 0, 0]]
+
+
+def test_high_cardinality_columns_are_binary_coded():
+    """Columns above ``ONEHOT_MAX_CARDINALITY`` levels become bit columns."""
+    n_levels = data_preparation.ONEHOT_MAX_CARDINALITY + 10
+    values = [f"L{i:03d}" for i in range(n_levels)] * 2
+    preprocessor = DataPreprocessor()
+
+    result = preprocessor.encode_categorical(pd.DataFrame({"Code": values}))
+
+    n_bits = int(np.ceil(np.log2(n_levels + 1)))
+    assert result.columns.tolist() == [f"Code_b{i}" for i in range(n_bits)]
+    codes = result.to_numpy() @ (1 << np.arange(n_bits))
+    levels = preprocessor.binary_encoders["Code"]
+    # Code 0 is reserved for levels unseen when the encoder was fitted
+    assert levels[codes - 1].tolist() == values
+
+    unseen = preprocessor.encode_categorical(pd.DataFrame({"Code": ["other"]}))
+    assert unseen.to_numpy().tolist() == [[0] * n_bits]
+
+
+def test_very_high_cardinality_columns_are_hashed(monkeypatch):
+    """Columns above ``HASHING_MIN_CARDINALITY`` levels are feature-hashed."""
+    monkeypatch.setattr(data_preparation, "ONEHOT_MAX_CARDINALITY", 2)
+    monkeypatch.setattr(data_preparation, "HASHING_MIN_CARDINALITY", 5)
+    values = pd.Series([f"L{i}" for i in range(8)] * 3, name="Code")
+
+    result = DataPreprocessor().encode_categorical(values.to_frame())
+
+    hasher = FeatureHasher(
+        n_features=data_preparation.HASH_N_FEATURES,
+        input_type="string",
+        alternate_sign=False,
+    )
+    expected = hasher.transform(values.to_numpy()[:, None]).toarray()
+    assert result.columns.tolist() == [
+        f"Code_h{i}" for i in range(data_preparation.HASH_N_FEATURES)
+    ]
+    np.testing.assert_array_equal(result.to_numpy(), expected)
+
+
+def test_sparse_onehot_matches_dense(categorical_frame):
+    """Sparse one-hot columns hold the dense indicators and convert to CSR."""
+    dense = DataPreprocessor().encode_categorical(categorical_frame)
+    result = DataPreprocessor().encode_categorical(
+        categorical_frame, sparse_onehot=True
+    )
+
+    assert all(
+        isinstance(result[col].dtype, pd.SparseDtype)
+        for col in dense.columns
+        if col != "Age"
+    )
+    pd.testing.assert_frame_equal(result.astype(dense.dtypes.to_dict()), dense)
+
+    matrix = DataPreprocessor.to_sparse_matrix(result)
+    assert matrix.format == "csr"
+    np.testing.assert_array_equal(matrix.toarray(), dense.to_numpy(dtype=float))
+
+
+def test_label_encoder_grows_its_classes():
+    """Unseen levels are appended to the classes; known labels are kept."""
+    preprocessor = DataPreprocessor()
+    first = preprocessor.encode_categorical(
+        pd.DataFrame({"Gender": ["Male", "Female", "Male"]}), encoding_method="label"
+    )
+    second = preprocessor.encode_categorical(
+        pd.DataFrame({"Gender": ["Other", "Female", "Male"]}), encoding_method="label"
+    )
+
+    assert first["Gender"].tolist() == [1, 0, 1]
+    assert second["Gender"].tolist() == [2, 0, 1]
+    assert preprocessor.label_encoders["Gender"].classes_.tolist() == [
+        "Female",
+        "Male",
+        "Other",
+    ]
+
+
+def test_split_matches_train_test_split():
+    """Shared split indices select the rows ``train_test_split`` selects."""
+    X = pd.DataFrame({"a": np.arange(20.0)}, index=np.arange(100, 120))
+    y = pd.Series(np.arange(20), index=X.index)
+    preprocessor = DataPreprocessor(random_state=7, test_size=0.25)
+
+    train_idx, test_idx = preprocessor.split_indices(len(X))
+    result = preprocessor.split_data(X, y, indices=(train_idx, test_idx))
+
+    expected = train_test_split(X, y, test_size=0.25, random_state=7)
+    for got, want in zip(result, expected):
+        pd.testing.assert_index_equal(got.index, want.index)
+    assert preprocessor.split_data(X, y)[0].index.equals(expected[0].index)
+
+
+def test_full_pipeline_matches_reference(data_dir, sample_csv_path):
+    """The prepared datasets hold the values of a plain pandas preparation."""
+    raw = pd.read_csv(sample_csv_path)
+    features = pd.concat(
+        [
+            raw[["PolicyID", "PostalCode", "Age"]],
+            pd.get_dummies(raw[["Province", "Gender", "VehicleType"]]),
+            pd.get_dummies(raw["PostalCode"].astype(str).str[:3]).add_prefix(
+                "PostalCodePrefix_"
+            ),
+        ],
+        axis=1,
+    )
+    has_claim = raw["TotalClaims"] > 0
+    targets = {
+        "severity": (features[has_claim], raw["TotalClaims"][has_claim]),
+        "premium": (features, raw["TotalPremium"]),
+        "claim_probability": (features, has_claim.astype(int).rename("HasClaim")),
+    }
+
+    datasets = DataPreprocessor(data_dir).full_pipeline()
+
+    for name, (X, y) in targets.items():
+        expected = train_test_split(X, y, test_size=0.3, random_state=42)
+        for got, want in zip(datasets[name], expected):
+            if isinstance(want, pd.DataFrame):
+                pd.testing.assert_frame_equal(got, want, check_dtype=False)
+            else:
+                pd.testing.assert_series_equal(got, want, check_dtype=False)
+
+
+@pytest.mark.parametrize("chunksize", [None, 2])
+def test_arrow_engine_matches_pandas_engine(blank_fields_dir, chunksize):
+    """Blank strings become 'Unknown' and dates are encoded with either engine."""
+    result = _encoded(DataPreprocessor(blank_fields_dir), engine="pyarrow")
+    expected = _encoded(
+        DataPreprocessor(blank_fields_dir), engine="pandas", chunksize=chunksize
+    )
+
+    for col in (
+        "Province_Unknown",
+        "Gender_Unknown",
+        "Bank_Unknown",
+        "TransactionMonth_2015-03-01 00:00:00",
+    ):
+        assert col in result.columns
+    assert "Gender_" not in result.columns
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
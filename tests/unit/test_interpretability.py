@@ -0,0 +1,136 @@
+"""Unit tests for Task 4 model interpretability.
+
+Written against the pinned ``lime==0.2.0.1``; skipped when lime is missing.
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression, LogisticRegression
+
+lime_tabular = pytest.importorskip("lime.lime_tabular")
+
+from src.analysis.task3 import backend  # noqa: E402
+from src.analysis.task4.interpretability import (  # noqa: E402
+    ModelInterpreter,
+    _BatchLimeExplainer,
+)
+
+
+@pytest.fixture
+def training_data():
+    """Six numeric features with a linear target."""
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 6))
+    y = X @ np.arange(6) + rng.normal(size=300)
+    return X, y
+
+
+def _explainers(X, mode, **kwargs):
+    """A batched and a stock explainer with the same seed."""
+    options = dict(feature_names=list("abcdef"), mode=mode, random_state=42)
+    options.update(kwargs)
+    return (
+        _BatchLimeExplainer(X, **options),
+        lime_tabular.LimeTabularExplainer(X, **options),
+    )
+
+
+@pytest.mark.parametrize("discretize_continuous", [True, False])
+def test_batch_matches_explain_instance_regression(
+    training_data, discretize_continuous
+):
+    """Batched explanations equal per-row ``explain_instance`` results."""
+    X, y = training_data
+    model = LinearRegression().fit(X, y)
+    batched, stock = _explainers(
+        X, "regression", discretize_continuous=discretize_continuous
+    )
+
+    calls = []
+
+    def predict(rows):
+        calls.append(len(rows))
+        return model.predict(rows)
+
+    result = batched.explain_batch(X[:4], predict, num_features=4, num_samples=500)
+    expected = [
+        stock.explain_instance(row, model.predict, num_features=4, num_samples=500)
+        for row in X[:4]
+    ]
+
+    assert calls == [4 * 500]
+    for got, want in zip(result, expected):
+        assert got.as_list() == want.as_list()
+        assert got.intercept == want.intercept
+        assert got.predicted_value == want.predicted_value
+
+
+def test_batch_matches_explain_instance_classification(training_data):
+    """Probability outputs give the same explanations as ``explain_instance``."""
+    X, y = training_data
+    model = LogisticRegression().fit(X, y > y.mean())
+    batched, stock = _explainers(X, "classification")
+
+    result = batched.explain_batch(
+        X[:3], model.predict_proba, num_features=4, num_samples=500
+    )
+    expected = [
+        stock.explain_instance(
+            row, model.predict_proba, num_features=4, num_samples=500
+        )
+        for row in X[:3]
+    ]
+
+    for got, want in zip(result, expected):
+        assert got.as_list(label=1) == want.as_list(label=1)
+
+
+def test_batch_empty(training_data):
+    """No rows to explain gives no explanations and no predict call."""
+    X, y = training_data
+    model = LinearRegression().fit(X, y)
+    batched, _ = _explainers(X, "regression")
+
+    assert batched.explain_batch(X[:0], model.predict) == []
+
+
+def test_cached_lime_explainer_is_reseeded(training_data, tmp_path):
+    """A reused LIME explainer draws the same perturbations as a new one."""
+    X, y = training_data
+    X_train = pd.DataFrame(X, columns=list("abcdef"))
+    model = LinearRegression().fit(X, y)
+    interpreter = ModelInterpreter(output_path=tmp_path)
+
+    runs = []
+    for _ in range(2):
+        explainer = interpreter._lime_explainer(X_train, list("abcdef"), "regression")
+        runs.append(
+            explainer.explain_batch(
+                X[:2], model.predict, num_features=4, num_samples=200
+            )
+        )
+
+    assert [e.as_list() for e in runs[0]] == [e.as_list() for e in runs[1]]
+
+
+@pytest.mark.parametrize(
+    "visible_devices, expected", [(None, True), ("0", True), ("-1", False)]
+)
+def test_gpu_requested_with_visible_devices(
+    tmp_path, monkeypatch, visible_devices, expected
+):
+    """An unset ``CUDA_VISIBLE_DEVICES`` leaves the device to the CUDA runtime."""
+    fake_cupy = SimpleNamespace(cuda=SimpleNamespace(is_available=lambda: True))
+    monkeypatch.setattr(backend, "CUPY_AVAILABLE", True)
+    monkeypatch.setattr(backend, "cupy", fake_cupy, raising=False)
+    if visible_devices is None:
+        monkeypatch.delenv("CUDA_VISIBLE_DEVICES", raising=False)
+    else:
+        monkeypatch.setenv("CUDA_VISIBLE_DEVICES", visible_devices)
+
+    interpreter = ModelInterpreter(output_path=tmp_path, use_gpu=True)
+
+    assert interpreter.use_gpu is expected